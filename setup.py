@@ -0,0 +1,18 @@
+"""Optional mypyc build of the packet translation hot path.
+
+Set MESHCORE_MYPYC=1 when building (with mypy installed) to compile
+translate.py into a C extension; otherwise this is a plain setuptools
+build driven entirely by pyproject.toml.
+"""
+
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get("MESHCORE_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    ext_modules = mypycify(["src/meshcore/adapters/meshtastic/translate.py"])
+
+setup(ext_modules=ext_modules)
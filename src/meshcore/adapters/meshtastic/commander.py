@@ -2,26 +2,35 @@
 
 import asyncio
 import logging
-from typing import Optional
-
-import meshtastic.serial_interface
-import meshtastic.tcp_interface
+from typing import TYPE_CHECKING, Optional
 
 from meshcore.application.ports import CommandResult, MeshCommandPort
 
+if TYPE_CHECKING:
+    import meshtastic.serial_interface
+    import meshtastic.tcp_interface
+
 logger = logging.getLogger(__name__)
 
 
 class MeshtasticCommander(MeshCommandPort):
     """Send commands through Meshtastic serial interface"""
 
+    __slots__ = ("_device", "_interface")
+
     def __init__(self, device: Optional[str] = None):
         self._device = device
-        self._interface: Optional[meshtastic.serial_interface.SerialInterface] = None
+        self._interface: Optional[
+            "meshtastic.serial_interface.SerialInterface"
+        ] = None
 
     def _ensure_connected(self) -> None:
         """Ensure we have an active connection"""
         if self._interface is None:
+            # Imported on first use so the web UI's mock commander doesn't
+            # load the meshtastic library
+            import meshtastic.serial_interface
+
             self._interface = meshtastic.serial_interface.SerialInterface(
                 devPath=self._device
             )
@@ -119,16 +128,20 @@ class MeshtasticCommander(MeshCommandPort):
 class MeshtasticTcpCommander(MeshCommandPort):
     """Send commands through Meshtastic TCP interface"""
 
+    __slots__ = ("_host", "_interface")
+
     def __init__(
         self,
         host: str,
-        interface: Optional[meshtastic.tcp_interface.TCPInterface] = None,
+        interface: Optional["meshtastic.tcp_interface.TCPInterface"] = None,
     ) -> None:
         self._host = host
         self._interface = interface  # may be pre-created and shared with source
 
     def _ensure_connected(self) -> None:
         if self._interface is None:
+            import meshtastic.tcp_interface
+
             self._interface = meshtastic.tcp_interface.TCPInterface(
                 hostname=self._host
             )
@@ -212,6 +225,11 @@ class MeshtasticTcpCommander(MeshCommandPort):
 class MockCommander(MeshCommandPort):
     """Mock commander for testing without hardware"""
 
+    __slots__ = ("_simulated_delay",)
+
+    def __init__(self, simulated_delay: float = 0.0) -> None:
+        self._simulated_delay = simulated_delay
+
     async def send_text(
         self,
         text: str,
@@ -220,8 +238,10 @@ class MockCommander(MeshCommandPort):
     ) -> CommandResult:
         """Mock send text"""
         dest = destination or "broadcast"
-        logger.info(f"[MOCK] Sending to {dest}: {text}")
-        await asyncio.sleep(0.1)  # Simulate network delay
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"[MOCK] Sending to {dest}: {text}")
+        if self._simulated_delay > 0:
+            await asyncio.sleep(self._simulated_delay)  # Simulate network delay
         return CommandResult(
             success=True,
             message=f"Message sent to {dest}",
@@ -236,8 +256,10 @@ class MockCommander(MeshCommandPort):
     ) -> CommandResult:
         """Mock send position"""
         dest = destination or "broadcast"
-        logger.info(f"[MOCK] Sending position to {dest}: {latitude}, {longitude}")
-        await asyncio.sleep(0.1)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"[MOCK] Sending position to {dest}: {latitude}, {longitude}")
+        if self._simulated_delay > 0:
+            await asyncio.sleep(self._simulated_delay)
         return CommandResult(
             success=True,
             message=f"Position sent to {dest}",
@@ -2,11 +2,16 @@
 
 import asyncio
 import random
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional, AsyncIterator
 
 from meshcore.application.ports import EventSource
-from meshcore.domain.models import EventId, NodeId, MeshEvent
+from meshcore.domain.models import MeshEvent
+
+_EVENT_TYPES = ("telemetry", "position", "text")
+_EVENT_CUM_WEIGHTS = (0.5, 0.8, 1.0)
+_BATCH = 4096
 
 
 class MockMeshtasticEventSource(EventSource):
@@ -23,6 +28,7 @@ class MockMeshtasticEventSource(EventSource):
             "node-charlie",
         ]
         self.interval = interval
+        self._picks: list[tuple[str, str]] = []
 
     async def events(self) -> AsyncIterator[MeshEvent]:
         """Async iterator of MeshEvents from the mock source"""
@@ -34,18 +40,23 @@ class MockMeshtasticEventSource(EventSource):
         """Fake jitter"""
         return max(0.2, random.gauss(self.interval, 0.5))
 
+    def _next_pick(self) -> tuple[str, str]:
+        """Next (node, event type) pair, drawn in batches"""
+        if not self._picks:
+            nodes = random.choices(self.node_ids, k=_BATCH)
+            types = random.choices(
+                _EVENT_TYPES, cum_weights=_EVENT_CUM_WEIGHTS, k=_BATCH
+            )
+            self._picks = list(zip(nodes, types))
+        return self._picks.pop()
+
     def _generate_event(self) -> MeshEvent:
         """Generate a mock event"""
-        node = random.choice(self.node_ids)
-        event_type = random.choices(
-            ["telemetry", "position", "text"],
-            weights=[0.5, 0.3, 0.2],
-        )[0]
+        node, event_type = self._next_pick()
         payload = self._payload_for(event_type)
-        now = datetime.now(timezone.utc)
+        now = datetime.fromtimestamp(time.time(), timezone.utc)
         return MeshEvent(
-            event_id=EventId(),
-            node_id=NodeId(value=node),
+            node_id=node,
             event_type=event_type,
             timestamp=now - timedelta(seconds=random.uniform(0, 3)),
             ingested_at=now,
@@ -14,30 +14,42 @@ from .translate import translate_packet, translate_node_update
 
 logger = logging.getLogger(__name__)
 
+# What to do when the consumer falls behind and the queue is full.
+_OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
 
 class MeshtasticSource(EventSource):
     """Serial device path"""
 
-    def __init__(self, device: Optional[str] = None) -> None:
+    # pypubsub holds its listeners by weak reference
+    __slots__ = (
+        "_device", "_interface", "_overflow", "_queue", "_loop", "dropped",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        device: Optional[str] = None,
+        max_queue: int = 1024,
+        overflow: str = "drop_oldest",
+    ) -> None:
         self._device = device
         self._interface: Optional[
             meshtastic.serial_interface.SerialInterface
         ] = None
-        self._queue: asyncio.Queue = asyncio.Queue()
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self._overflow = overflow
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.dropped = 0
 
     # The meshtastic library publishes to handler-specific sub-topics
-    # (e.g. "meshtastic.receive.text") for all known port types.
-    # The generic "meshtastic.receive" topic is only used as a fallback
-    # for UNKNOWN_APP packets, so we must subscribe to each sub-topic.
-    _PACKET_TOPICS = (
-        "meshtastic.receive",           # UNKNOWN_APP fallback
-        "meshtastic.receive.text",      # TEXT_MESSAGE_APP
-        "meshtastic.receive.position",  # POSITION_APP
-        "meshtastic.receive.user",      # NODEINFO_APP
-        "meshtastic.receive.telemetry", # TELEMETRY_APP
-        "meshtastic.receive.routing",   # ROUTING_APP (ACK)
-    )
+    # (e.g. "meshtastic.receive.text"), and pypubsub hands every message
+    # to the listeners of its parent topics too. Subscribing to the parent
+    # alone sees each packet once; subscribing to the sub-topics as well
+    # would deliver it twice.
+    _PACKET_TOPICS = ("meshtastic.receive",)
 
     async def _connect(self) -> None:
         self._loop = asyncio.get_running_loop()
@@ -48,17 +60,40 @@ class MeshtasticSource(EventSource):
             devPath=self._device
         )
 
+    @property
+    def queue_depth(self) -> int:
+        """Number of events waiting to be consumed"""
+        return self._queue.qsize()
+
+    def _enqueue(self, event: MeshEvent) -> None:
+        """Put an event on the queue, applying the overflow policy when full.
+
+        Runs on the event loop thread (scheduled via call_soon_threadsafe).
+        """
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self._overflow == "drop_oldest":
+                self._queue.get_nowait()
+                self._queue.put_nowait(event)
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(
+                    f"Event queue full ({self._queue.maxsize}), "
+                    f"{self.dropped} event(s) dropped ({self._overflow})"
+                )
+
     def _on_receive(self, packet, interface=None) -> None:
         """Called from meshtastic's publishing thread — must be thread-safe."""
         event = translate_packet(packet)
         if event:
-            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+            self._loop.call_soon_threadsafe(self._enqueue, event)
 
     def _on_node_updated(self, node, interface=None) -> None:
         """Called when node DB is updated (initial sync + periodic)."""
         event = translate_node_update(node)
         if event:
-            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+            self._loop.call_soon_threadsafe(self._enqueue, event)
 
     async def events(self) -> AsyncIterator[MeshEvent]:
         """Async iterator of MeshEvents from Meshtastic device"""
@@ -1,21 +1,93 @@
 """Meshtastic packet translation with complete payload decoding"""
 
 import logging
-from collections import defaultdict
+import time
 from datetime import datetime, timezone
 from typing import Optional, Any
 
-from meshcore.domain.models import EventId, NodeId, MeshEvent
+from meshcore.domain.models import MeshEvent
 
 logger = logging.getLogger(__name__)
 
-# Port name to event type mapping (meshtastic library uses string portnum)
-_event_type_from_port: defaultdict[str, str] = defaultdict(lambda: "unknown")
-_event_type_from_port["TEXT_MESSAGE_APP"] = "text"
-_event_type_from_port["TELEMETRY_APP"] = "telemetry"
-_event_type_from_port["POSITION_APP"] = "position"
-_event_type_from_port["NODEINFO_APP"] = "node_info"
-_event_type_from_port["ROUTING_APP"] = "ack"
+_UTC = timezone.utc
+
+# Port to event type mapping. The meshtastic library uses the string
+# portnum name, but raw packets carry the PortNum enum value
+_EVENT_TYPE: dict[int | str, str] = {
+    "TEXT_MESSAGE_APP": "text",
+    "POSITION_APP": "position",
+    "NODEINFO_APP": "node_info",
+    "ROUTING_APP": "ack",
+    "TELEMETRY_APP": "telemetry",
+    1: "text",
+    3: "position",
+    4: "node_info",
+    5: "ack",
+    67: "telemetry",
+}
+
+# Source key to payload key renames for each decoded section
+_DEVICE_KEYS = (
+    ("batteryLevel", "battery_level"),
+    ("voltage", "voltage"),
+    ("channelUtilization", "channel_utilization"),
+    ("airUtilTx", "air_util_tx"),
+)
+_ENVIRONMENT_KEYS = (
+    ("temperature", "temperature"),
+    ("relativeHumidity", "humidity"),
+    ("barometricPressure", "pressure"),
+)
+_POWER_KEYS = (
+    ("ch1Voltage", "ch1_voltage"),
+    ("ch1Current", "ch1_current"),
+)
+_POSITION_KEYS = (
+    ("altitude", "altitude"),
+    ("groundSpeed", "speed"),
+    ("groundTrack", "heading"),
+    ("satsInView", "satellites"),
+)
+_USER_KEYS = (
+    ("id", "node_id"),
+    ("longName", "long_name"),
+    ("shortName", "short_name"),
+    ("macaddr", "mac_address"),
+    ("hwModel", "hardware_model"),
+)
+_LEGACY_TELEMETRY_KEYS = (
+    "battery_level", "voltage", "temperature", "channelUtilization"
+)
+_JSON_TYPES = (dict, list, tuple, bytes, str, int, float, bool, type(None))
+
+
+def _raw(value: Any) -> Any:
+    """JSON-safe copy of an undecoded packet section.
+
+    Bytes become hex and objects that aren't plain JSON values (such as the
+    protobuf messages the meshtastic library attaches under "raw") are
+    dropped, instead of repr()-ing the whole structure into one string.
+    """
+    if isinstance(value, dict):
+        return {
+            str(k): _raw(v) for k, v in value.items()
+            if isinstance(v, _JSON_TYPES)
+        }
+    if isinstance(value, (list, tuple)):
+        return [_raw(v) for v in value if isinstance(v, _JSON_TYPES)]
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+def _rename(src: dict, keys: tuple[tuple[str, str], ...]) -> dict[str, Any]:
+    """Copy the keys present in src under their payload names"""
+    return {dst: src[key] for key, dst in keys if key in src}
+
+
+def _utcnow() -> datetime:
+    """Current UTC time, cheaper than datetime.now(tz) per packet"""
+    return datetime.fromtimestamp(time.time(), _UTC)
 
 
 def translate_node_update(node: dict) -> Optional[MeshEvent]:
@@ -28,25 +100,15 @@ def translate_node_update(node: dict) -> Optional[MeshEvent]:
     user = node.get("user", {})
     if not user:
         return None
-    payload: dict[str, Any] = {}
-    if "longName" in user:
-        payload["long_name"] = user["longName"]
-    if "shortName" in user:
-        payload["short_name"] = user["shortName"]
-    if "id" in user:
-        payload["node_id"] = user["id"]
-    if "hwModel" in user:
-        payload["hardware_model"] = user["hwModel"]
-    if "macaddr" in user:
-        payload["mac_address"] = user["macaddr"]
+    payload = _rename(user, _USER_KEYS)
     if not payload:
         return None
+    now = _utcnow()
     return MeshEvent(
-        event_id=EventId(),
-        node_id=NodeId(value=str(node.get("num", ""))),
+        node_id=str(node.get("num", "")),
         event_type="node_info",
-        timestamp=datetime.now(timezone.utc),
-        ingested_at=datetime.now(timezone.utc),
+        timestamp=now,
+        ingested_at=now,
         payload=payload,
         provenance={
             "source": "meshtastic",
@@ -62,17 +124,17 @@ def translate_packet(packet: dict) -> Optional[MeshEvent]:
     if not decoded:
         return None
     portnum = decoded.get("portnum", "")
-    event_type = _event_type_from_port[portnum]
+    event_type = _EVENT_TYPE.get(portnum, "unknown")
     payload = _decode_payload(portnum, decoded)
     if not payload:
         logger.debug(f"Skipping event with empty payload from port {portnum}")
         return None
+    now = _utcnow()
     return MeshEvent(
-        event_id=EventId(),
-        node_id=NodeId(value=str(packet.get("from", ""))),
+        node_id=str(packet.get("from", "")),
         event_type=event_type,
-        timestamp=_packet_timestamp(packet),
-        ingested_at=datetime.now(timezone.utc),
+        timestamp=_packet_timestamp(packet, now),
+        ingested_at=now,
         payload=payload,
         provenance={
             "source": "meshtastic",
@@ -84,12 +146,12 @@ def translate_packet(packet: dict) -> Optional[MeshEvent]:
     )
 
 
-def _packet_timestamp(packet: dict) -> datetime:
-    """Extract timestamp from packet or use current time"""
+def _packet_timestamp(packet: dict, now: datetime) -> datetime:
+    """Extract timestamp from packet or fall back to the ingest time"""
     ts = packet.get("rxTime")
     if ts:
-        return datetime.fromtimestamp(ts, tz=timezone.utc)
-    return datetime.now(timezone.utc)
+        return datetime.fromtimestamp(ts, tz=_UTC)
+    return now
 
 
 def _compute_hops_away(packet: dict) -> int | None:
@@ -101,35 +163,34 @@ def _compute_hops_away(packet: dict) -> int | None:
     return None
 
 
-def _decode_payload(portnum: str, decoded: dict) -> dict[str, Any]:
-    """Decode payload based on port name with proper type handling"""
-    if portnum == "TEXT_MESSAGE_APP":
-        text = decoded.get("text")
-        if text:
-            return {"text": text}
-        payload_bytes = decoded.get("payload", b"")
-        if isinstance(payload_bytes, bytes):
-            try:
-                return {"text": payload_bytes.decode("utf-8")}
-            except Exception as e:
-                logger.warning(f"Failed to decode text payload: {e}")
-                return {"raw": payload_bytes.hex()}
-        elif isinstance(payload_bytes, str):
-            return {"text": payload_bytes}
-        return {}
-    elif portnum == "TELEMETRY_APP":
-        return _decode_telemetry(decoded)
-    elif portnum == "POSITION_APP":
-        return _decode_position(decoded)
-    elif portnum == "NODEINFO_APP":
-        return _decode_node_info(decoded)
-    elif portnum == "ROUTING_APP":
-        return _decode_routing(decoded)
-    else:
-        payload_bytes = decoded.get("payload", b"")
-        if isinstance(payload_bytes, bytes):
+def _decode_payload(portnum: int | str, decoded: dict) -> dict[str, Any]:
+    """Decode payload based on port with proper type handling"""
+    return _DECODERS.get(portnum, _decode_raw)(decoded)
+
+
+def _decode_text(decoded: dict) -> dict[str, Any]:
+    """Decode a text message, falling back to the raw payload bytes"""
+    text = decoded.get("text")
+    if text:
+        return {"text": text}
+    payload_bytes = decoded.get("payload", b"")
+    if isinstance(payload_bytes, bytes):
+        try:
+            return {"text": payload_bytes.decode("utf-8")}
+        except Exception as e:
+            logger.warning(f"Failed to decode text payload: {e}")
             return {"raw": payload_bytes.hex()}
-        return {}
+    elif isinstance(payload_bytes, str):
+        return {"text": payload_bytes}
+    return {}
+
+
+def _decode_raw(decoded: dict) -> dict[str, Any]:
+    """Keep the payload bytes of a port we don't decode"""
+    payload_bytes = decoded.get("payload", b"")
+    if isinstance(payload_bytes, bytes):
+        return {"raw": payload_bytes.hex()}
+    return {}
 
 
 def _decode_telemetry(decoded: dict) -> dict[str, Any]:
@@ -139,39 +200,21 @@ def _decode_telemetry(decoded: dict) -> dict[str, Any]:
     telem_data = decoded.get("telemetry", decoded)
     device_metrics = telem_data.get("deviceMetrics", telem_data.get("device", {}))
     if device_metrics:
-        if "batteryLevel" in device_metrics:
-            telemetry["battery_level"] = device_metrics["batteryLevel"]
-        if "voltage" in device_metrics:
-            telemetry["voltage"] = device_metrics["voltage"]
-        if "channelUtilization" in device_metrics:
-            telemetry["channel_utilization"] = (
-                device_metrics["channelUtilization"]
-            )
-        if "airUtilTx" in device_metrics:
-            telemetry["air_util_tx"] = device_metrics["airUtilTx"]
+        telemetry.update(_rename(device_metrics, _DEVICE_KEYS))
     env_metrics = telem_data.get(
         "environmentMetrics", telem_data.get("environment", {})
     )
     if env_metrics:
-        if "temperature" in env_metrics:
-            telemetry["temperature"] = env_metrics["temperature"]
-        if "relativeHumidity" in env_metrics:
-            telemetry["humidity"] = env_metrics["relativeHumidity"]
-        if "barometricPressure" in env_metrics:
-            telemetry["pressure"] = env_metrics["barometricPressure"]
+        telemetry.update(_rename(env_metrics, _ENVIRONMENT_KEYS))
     power_metrics = telem_data.get("powerMetrics", telem_data.get("power", {}))
     if power_metrics:
-        if "ch1Voltage" in power_metrics:
-            telemetry["ch1_voltage"] = power_metrics["ch1Voltage"]
-        if "ch1Current" in power_metrics:
-            telemetry["ch1_current"] = power_metrics["ch1Current"]
+        telemetry.update(_rename(power_metrics, _POWER_KEYS))
     if not telemetry:
-        for key in [
-            "battery_level", "voltage", "temperature", "channelUtilization"
-        ]:
-            if key in decoded:
-                telemetry[key] = decoded[key]
-    return telemetry if telemetry else {"raw": str(decoded)}
+        telemetry = {
+            key: decoded[key] for key in _LEGACY_TELEMETRY_KEYS
+            if key in decoded
+        }
+    return telemetry if telemetry else {"raw": _raw(decoded)}
 
 
 def _decode_position(decoded: dict) -> dict[str, Any]:
@@ -179,19 +222,17 @@ def _decode_position(decoded: dict) -> dict[str, Any]:
     position = {}
     pos_data: dict = decoded.get("position", decoded)
     if "latitude" in pos_data or "latitudeI" in pos_data:
-        lat = pos_data.get("latitude") or pos_data.get("latitudeI", 0) / 1e7
-        lon = pos_data.get("longitude") or pos_data.get("longitudeI", 0) / 1e7
-        position["latitude"] = lat
-        position["longitude"] = lon
-        if "altitude" in pos_data:
-            position["altitude"] = pos_data["altitude"]
-        if "groundSpeed" in pos_data:
-            position["speed"] = pos_data["groundSpeed"]
-        if "groundTrack" in pos_data:
-            position["heading"] = pos_data["groundTrack"]
-        if "satsInView" in pos_data:
-            position["satellites"] = pos_data["satsInView"]
-    return position if position else {"raw": str(decoded)}
+        # Prefer the float fields; a 0.0 coordinate is valid, not missing
+        if "latitude" in pos_data:
+            position["latitude"] = pos_data["latitude"]
+        else:
+            position["latitude"] = pos_data["latitudeI"] * 1e-7
+        if "longitude" in pos_data:
+            position["longitude"] = pos_data["longitude"]
+        else:
+            position["longitude"] = pos_data.get("longitudeI", 0) * 1e-7
+        position.update(_rename(pos_data, _POSITION_KEYS))
+    return position if position else {"raw": _raw(decoded)}
 
 
 def _decode_routing(decoded: dict) -> dict[str, Any]:
@@ -212,17 +253,20 @@ def _decode_routing(decoded: dict) -> dict[str, Any]:
 
 def _decode_node_info(decoded: dict) -> dict[str, Any]:
     """Decode node info from Meshtastic packet"""
-    node_info = {}
-    user = decoded.get("user", {})
-    if user:
-        if "id" in user:
-            node_info["node_id"] = user["id"]
-        if "longName" in user:
-            node_info["long_name"] = user["longName"]
-        if "shortName" in user:
-            node_info["short_name"] = user["shortName"]
-        if "macaddr" in user:
-            node_info["mac_address"] = user["macaddr"]
-        if "hwModel" in user:
-            node_info["hardware_model"] = user["hwModel"]
-    return node_info if node_info else {"raw": str(decoded)}
+    node_info = _rename(decoded.get("user", {}), _USER_KEYS)
+    return node_info if node_info else {"raw": _raw(decoded)}
+
+
+# Port to decoder dispatch, keyed like _EVENT_TYPE on both portnum forms
+_DECODERS = {
+    "TEXT_MESSAGE_APP": _decode_text,
+    "POSITION_APP": _decode_position,
+    "NODEINFO_APP": _decode_node_info,
+    "ROUTING_APP": _decode_routing,
+    "TELEMETRY_APP": _decode_telemetry,
+    1: _decode_text,
+    3: _decode_position,
+    4: _decode_node_info,
+    5: _decode_routing,
+    67: _decode_telemetry,
+}
@@ -1,11 +1,87 @@
 """Pub/sub layer for the application"""
 
+import asyncio
+import sys
+from typing import BinaryIO
+
 from meshcore.domain.models import MeshEvent
 
 
 class LoggingPublisher:
-    """Publisher that logs events"""
+    """Publisher that logs events, buffering writes to the console"""
+
+    def __init__(
+        self,
+        stream: BinaryIO | None = None,
+        flush_every: int = 64,
+        flush_interval: float = 0.25,
+    ) -> None:
+        self._stream = stream or sys.stdout.buffer
+        self._flush_every = flush_every
+        self._flush_interval = flush_interval
+        self._buffer = bytearray()
+        self._pending = 0
+        self._flusher: asyncio.Task | None = None
+        # One write at a time, so overlapping flushes keep lines in order
+        self._write_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        self._start_flusher()
+        return self
+
+    async def __aexit__(self, *args):
+        """Async context manager exit"""
+        await self.close()
+
+    def _start_flusher(self) -> None:
+        """Start the periodic flush task if it is not already running"""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        """Flush whatever has accumulated every flush_interval seconds"""
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self.flush()
 
     async def publish(self, event: MeshEvent) -> None:
         """Publish the event by logging it to console"""
-        print(event.model_dump_json())
+        self._start_flusher()
+        self._buffer += event.json_bytes()
+        self._buffer += b"\n"
+        self._pending += 1
+        if self._pending >= self._flush_every:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write buffered lines without blocking the event loop"""
+        if not self._buffer:
+            return
+        async with self._write_lock:
+            # Taken under the lock, so a flush that waited writes whatever
+            # arrived during the previous write, after it
+            if not self._buffer:
+                return
+            chunk = bytes(self._buffer)
+            self._buffer.clear()
+            self._pending = 0
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, chunk
+            )
+
+    def _write(self, chunk: bytes) -> None:
+        """Blocking write of one chunk (runs in a worker thread)"""
+        self._stream.write(chunk)
+        self._stream.flush()
+
+    async def close(self) -> None:
+        """Stop the flush task and write out anything still buffered"""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
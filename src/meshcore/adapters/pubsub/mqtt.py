@@ -2,17 +2,139 @@
 
 import asyncio
 import logging
+from functools import lru_cache
 
 import paho.mqtt.client as mqtt
 
+from meshcore.application.correlation import current_event
 from meshcore.domain.models import MeshEvent
 
 logger = logging.getLogger(__name__)
 
+# Which event to drop when the outbox is full, e.g. while the broker is down
+_OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+
+class _SharedClient:
+    """One paho client and network thread shared by publishers of a broker
+
+    Connecting happens here under one lock, so when the connection drops
+    only the first publisher to notice reconnects; the others wait for it
+    and then find the client connected.
+    """
+
+    __slots__ = (
+        "client", "publishers", "connected", "_host", "_port", "_lock",
+        "_loop", "_connected_event",
+    )
+
+    def __init__(self, host: str, port: int, client_id: str) -> None:
+        self.client = mqtt.Client(client_id=client_id, protocol=mqtt.MQTTv311)
+        self.publishers: list["MqttEventPublisher"] = []
+        self.connected = False
+        self._host = host
+        self._port = port
+        self._lock = asyncio.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._connected_event = asyncio.Event()
+        self.client.on_connect = self._on_connect
+        self.client.on_disconnect = self._on_disconnect
+
+    def _on_connect(self, client, userdata, flags, rc):
+        """Fan the connect callback out to every publisher on this client"""
+        self.connected = rc == 0
+        if self.connected and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._connected_event.set)
+        for publisher in list(self.publishers):
+            publisher._on_connect(client, userdata, flags, rc)
+
+    def _on_disconnect(self, client, userdata, rc):
+        """Fan the disconnect callback out to every publisher on this client"""
+        self.connected = False
+        for publisher in list(self.publishers):
+            publisher._on_disconnect(client, userdata, rc)
+
+    async def connect(self, max_retries: int, retry_delay: float) -> None:
+        """Connect with exponential backoff, unless already connected"""
+        async with self._lock:
+            if self.connected:
+                # Someone else brought the client up while we waited
+                return
+            self._loop = asyncio.get_running_loop()
+            for attempt in range(max_retries):
+                try:
+                    logger.info(
+                        f"Attempting MQTT connection (attempt {attempt + 1}/"
+                        f"{max_retries})"
+                    )
+                    self._connected_event.clear()
+                    await asyncio.to_thread(
+                        self.client.connect, self._host, self._port,
+                        keepalive=60
+                    )
+                    self.client.loop_start()
+                    try:
+                        await asyncio.wait_for(
+                            self._connected_event.wait(), timeout=1.0
+                        )
+                    except asyncio.TimeoutError:
+                        logger.warning("MQTT connection timeout")
+                    else:
+                        return
+                except Exception as e:
+                    logger.error(f"MQTT connection attempt failed: {e}")
+                if attempt < max_retries - 1:
+                    logger.info(f"Retrying in {retry_delay:.1f}s...")
+                    await asyncio.sleep(retry_delay)
+                    retry_delay = min(retry_delay * 2, 30)  # Cap at 30 s
+            raise ConnectionError(
+                f"Failed to connect to MQTT broker after {max_retries} "
+                "attempts"
+            )
+
+
+# Publishers to the same broker endpoint under the same client ID reuse one
+# client, and so one paho network thread, instead of each starting their
+# own (a broker would drop one of two connections sharing an ID anyway)
+_shared_clients: dict[tuple[str, int, str], _SharedClient] = {}
+
+
+def _acquire_client(
+    publisher: "MqttEventPublisher", host: str, port: int, client_id: str
+) -> _SharedClient:
+    """Register publisher on the shared client for host:port and client_id"""
+    shared = _shared_clients.get((host, port, client_id))
+    if shared is None:
+        shared = _SharedClient(host, port, client_id)
+        _shared_clients[(host, port, client_id)] = shared
+    shared.publishers.append(publisher)
+    return shared
+
+
+def _release_client(
+    publisher: "MqttEventPublisher", host: str, port: int, client_id: str
+) -> bool:
+    """Unregister publisher; True if it was the client's last user"""
+    shared = _shared_clients.get((host, port, client_id))
+    if shared is None or publisher not in shared.publishers:
+        return True
+    shared.publishers.remove(publisher)
+    if shared.publishers:
+        return False
+    del _shared_clients[(host, port, client_id)]
+    return True
+
 
 class MqttEventPublisher:
     """MQTT event publisher with automatic reconnection"""
 
+    __slots__ = (
+        "_host", "_port", "_client_id", "_topic", "_topic_all",
+        "_topics_for", "_client", "_connected", "_max_retries",
+        "_initial_retry_delay", "_batch_size", "_outbox", "_overflow",
+        "_worker", "_shared", "dropped",
+    )
+
     def __init__(
         self,
         host: str = "localhost",
@@ -21,27 +143,36 @@ class MqttEventPublisher:
         client_id: str = "meshcore",
         max_retries: int = 5,
         initial_retry_delay: float = 1.0,
+        batch_size: int = 64,
+        max_outbox: int = 1024,
+        overflow: str = "drop_oldest",
     ) -> None:
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
         self._host = host
         self._port = port
+        self._client_id = client_id
         self._topic = topic
-        self._client = mqtt.Client(
-            client_id=client_id, protocol=mqtt.MQTTv311
-        )
+        self._topic_all = f"{topic}/all"
+        self._topics_for = lru_cache(maxsize=4096)(self._build_topics)
+        self._shared = _acquire_client(self, host, port, client_id)
+        self._client = self._shared.client
         self._connected = False
         self._max_retries = max_retries
         self._initial_retry_delay = initial_retry_delay
-        self._retry_count = 0
-        self._lock = asyncio.Lock()
-        self._client.on_connect = self._on_connect
-        self._client.on_disconnect = self._on_disconnect
+        self._batch_size = batch_size
+        self._outbox: asyncio.Queue[MeshEvent] = asyncio.Queue(
+            maxsize=max_outbox
+        )
+        self._overflow = overflow
+        self._worker: asyncio.Task | None = None
+        self.dropped = 0
         logger.info(f"MQTT publisher initialized for {host}:{port}")
 
     def _on_connect(self, client, userdata, flags, rc):
         """Callback when connection is established"""
         if rc == 0:
             self._connected = True
-            self._retry_count = 0
             logger.info(f"MQTT connected to {self._host}:{self._port}")
         else:
             logger.error(f"MQTT connection failed with code {rc}")
@@ -62,78 +193,169 @@ class MqttEventPublisher:
         await self.close()
 
     async def _connect(self) -> None:
-        """Connect with exponential backoff retry logic"""
-        retry_delay = self._initial_retry_delay
-        for attempt in range(self._max_retries):
-            try:
-                logger.info(
-                    f"Attempting MQTT connection (attempt {attempt + 1}/"
-                    f"{self._max_retries})"
-                )
-                await asyncio.to_thread(
-                    self._client.connect, self._host, self._port, keepalive=60
-                )
-                self._client.loop_start()
-                for _ in range(10):
-                    await asyncio.sleep(0.1)
-                    if self._connected:
-                        return
-                logger.warning("MQTT connection timeout")
-            except Exception as e:
-                logger.error(f"MQTT connection attempt failed: {e}")
-            if attempt < self._max_retries - 1:
-                logger.info(f"Retrying in {retry_delay:.1f}s...")
-                await asyncio.sleep(retry_delay)
-                retry_delay = min(retry_delay * 2, 30)  # Cap at 30 seconds
-        raise ConnectionError(
-            f"Failed to connect to MQTT broker after {self._max_retries} "
-            "attempts"
+        """Connect the shared client, or wait for whoever is connecting it"""
+        await self._shared.connect(
+            self._max_retries, self._initial_retry_delay
         )
+        self._connected = True
+        self._start_worker()
+
+    def _start_worker(self) -> None:
+        """Start the outbox consumer if it is not already running"""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._drain_outbox())
 
     async def close(self) -> None:
-        """Gracefully close the connection"""
+        """Flush pending events and gracefully close the connection"""
+        if self._worker is not None:
+            if self._connected:
+                await self._outbox.join()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        last_user = _release_client(
+            self, self._host, self._port, self._client_id
+        )
         if self._connected:
-            self._client.loop_stop()
-            await asyncio.to_thread(self._client.disconnect)
+            if last_user:
+                self._client.loop_stop()
+                await asyncio.to_thread(self._client.disconnect)
             self._connected = False
             logger.info("MQTT publisher closed")
 
     async def _ensure_connected(self) -> None:
         """Ensure we have an active connection, reconnect if needed"""
-        if not self._connected:
-            logger.warning("MQTT not connected, attempting reconnection...")
-            await self._connect()
+        if self._connected:
+            return
+        logger.warning("MQTT not connected, attempting reconnection...")
+        await self._connect()
 
     async def publish(self, event: MeshEvent) -> None:
-        """Publish event to MQTT with automatic reconnection"""
-        async with self._lock:
-            await self._ensure_connected()
-            payload = event.model_dump_json()
-            topics = [
-                f"{self._topic}/all",
-                f"{self._topic}/type/{event.event_type}",
-                f"{self._topic}/node/{event.node_id.value}",
-                f"{self._topic}/node/{event.node_id.value}/type/"
-                f"{event.event_type}",
-            ]
-            correlation_id = str(event.event_id.value)
-            for topic in topics:
+        """Queue event for publishing; returns without waiting on the broker
+
+        The outbox holds at most max_outbox events. When the broker falls
+        behind or is unreachable, the overflow policy picks which event is
+        dropped rather than buffering without limit.
+        """
+        self._start_worker()
+        try:
+            self._outbox.put_nowait(event)
+        except asyncio.QueueFull:
+            if self._overflow == "drop_oldest":
+                self._outbox.get_nowait()
+                self._outbox.task_done()
+                self._outbox.put_nowait(event)
+            self._count_dropped(1, f"outbox full ({self._overflow})")
+
+    def _count_dropped(self, count: int, reason: str) -> None:
+        """Add to the dropped counter, warning on the first and every 1000th"""
+        before = self.dropped
+        self.dropped += count
+        if before == 0 or self.dropped // 1000 > before // 1000:
+            logger.warning(
+                f"MQTT {reason}, {self.dropped} event(s) dropped so far"
+            )
+
+    def _build_topics(
+        self, node_id: str, event_type: str
+    ) -> tuple[str, str, str, str]:
+        """Topics an event with this node and type is fanned out to"""
+        return (
+            self._topic_all,
+            f"{self._topic}/type/{event_type}",
+            f"{self._topic}/node/{node_id}",
+            f"{self._topic}/node/{node_id}/type/{event_type}",
+        )
+
+    async def _drain_outbox(self) -> None:
+        """Publish queued events in batches straight into paho's queue"""
+        while True:
+            batch = [await self._outbox.get()]
+            while len(batch) < self._batch_size:
                 try:
-                    result = await asyncio.to_thread(
-                        self._client.publish, topic, payload, qos=1
-                    )
-                    if result.rc != mqtt.MQTT_ERR_SUCCESS:
-                        logger.error(
-                            f"MQTT publish failed for {topic}: {result.rc}",
-                            extra={"correlation_id": correlation_id}
-                        )
-                except Exception as e:
+                    batch.append(self._outbox.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self._ensure_connected()
+                messages = []
+                for event in batch:
+                    payload = event.json_bytes()
+                    for topic in self._topics_for(
+                        event.node_id, event.event_type
+                    ):
+                        messages.append((topic, payload, event))
+                self._publish_batch(messages)
+            except Exception as e:
+                logger.error(
+                    f"Failed to publish batch of {len(batch)} event(s): {e}"
+                )
+                self._count_dropped(len(batch), "publish failed")
+            finally:
+                for _ in batch:
+                    self._outbox.task_done()
+
+    def _publish_batch(
+        self, messages: list[tuple[str, bytes, MeshEvent]]
+    ) -> None:
+        """Hand a batch to paho; publish() only enqueues for its loop thread"""
+        # The outbox worker doesn't inherit the service's context, so each
+        # message sets the event its records correlate with
+        for topic, payload, event in messages:
+            token = current_event.set(event)
+            try:
+                result = self._client.publish(topic, payload, qos=1)
+                if result.rc != mqtt.MQTT_ERR_SUCCESS:
                     logger.error(
-                        f"Exception publishing to {topic}: {e}",
-                        extra={"correlation_id": correlation_id}
+                        f"MQTT publish failed for {topic}: {result.rc}"
                     )
-            logger.debug(
-                f"Published event {event.event_type} from "
-                f"{event.node_id.value}",
-                extra={"correlation_id": correlation_id}
-            )
+            except Exception as e:
+                logger.error(f"Exception publishing to {topic}: {e}")
+            finally:
+                current_event.reset(token)
+        logger.debug("Published batch of %d message(s)", len(messages))
+
+
+class MqttPublisherPool:
+    """Spread events over several MQTT connections to one broker
+
+    Each member publisher gets its own client ID, so its own connection
+    and paho network thread. Events are sharded by node rather than
+    round-robin, so one node's events stay in order on every topic.
+    """
+
+    __slots__ = ("_publishers",)
+
+    def __init__(
+        self, size: int = 4, client_id: str = "meshcore", **kwargs
+    ) -> None:
+        self._publishers = [
+            MqttEventPublisher(client_id=f"{client_id}-{i}", **kwargs)
+            for i in range(max(1, size))
+        ]
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        await asyncio.gather(*(p.__aenter__() for p in self._publishers))
+        return self
+
+    async def __aexit__(self, *args):
+        """Async context manager exit"""
+        await self.close()
+
+    async def publish(self, event: MeshEvent) -> None:
+        """Queue event on the publisher that owns its node"""
+        publishers = self._publishers
+        await publishers[hash(event.node_id) % len(publishers)].publish(event)
+
+    async def close(self) -> None:
+        """Flush and close every member; one failure doesn't stop the rest"""
+        results = await asyncio.gather(
+            *(p.close() for p in self._publishers), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error closing pooled MQTT publisher: {result}")
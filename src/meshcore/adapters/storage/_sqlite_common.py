@@ -0,0 +1,141 @@
+"""Connection, reader-pool and encoding helpers shared by the SQLite stores"""
+
+import queue
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Optional, Sequence, TypeVar
+from uuid import uuid4
+
+T = TypeVar("T")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+# Rows copied per step of a schema migration, so memory stays flat
+MIGRATE_CHUNK = 1000
+# Batches up to this size go in as one multi-row VALUES statement, which
+# SQLite steps through with less per-row overhead than executemany
+_MULTI_ROW_MAX = 64
+
+
+def to_micros(dt: datetime) -> int:
+    """Epoch microseconds for a datetime; naive values are taken as local"""
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def from_micros(micros: int) -> datetime:
+    """UTC datetime for epoch microseconds"""
+    # Positional (days, seconds, microseconds) skips keyword parsing, which
+    # is most of the cost of this per-row call
+    return _EPOCH + timedelta(0, 0, micros)
+
+
+def multi_row_sql(sql: str, row: str) -> tuple[str, ...]:
+    """sql with its VALUES row repeated n times, at index n"""
+    return ("",) + tuple(
+        sql.replace(row, ", ".join([row] * n), 1)
+        for n in range(1, _MULTI_ROW_MAX + 1)
+    )
+
+
+def execute_rows(
+    conn: sqlite3.Connection,
+    sql: str,
+    batched_sql: tuple[str, ...],
+    rows: Sequence[tuple],
+) -> None:
+    """Run sql for every row, as a single statement if the batch is small
+
+    batched_sql is the multi_row_sql tuple built from sql.
+    """
+    if len(rows) < len(batched_sql):
+        conn.execute(
+            batched_sql[len(rows)], [value for row in rows for value in row]
+        )
+    else:
+        conn.executemany(sql, rows)
+
+
+def memory_uri(path: str, in_memory: bool) -> Optional[str]:
+    """Shared-cache URI for an in-memory database, or None for a file.
+
+    A bare ":memory:" is private to one connection, so it (and in_memory)
+    becomes a uniquely named shared-cache database the reader pool can see.
+    """
+    if in_memory or path == ":memory:":
+        return f"file:meshcore-{uuid4().hex}?mode=memory&cache=shared"
+    if path.startswith("file:") and (
+        path.startswith("file::memory:") or "mode=memory" in path
+    ):
+        return path
+    return None
+
+
+def open_reader(
+    path: str,
+    row_factory: Optional[Callable] = None,
+    memory: bool = False,
+) -> sqlite3.Connection:
+    """Open a read-only connection to a WAL or in-memory database"""
+    uri = path if memory else f"{Path(path).absolute().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.row_factory = row_factory
+    conn.execute("PRAGMA query_only=1;")
+    conn.execute("PRAGMA busy_timeout=5000;")
+    conn.execute("PRAGMA cache_size=-65536;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    if memory:
+        # Shared-cache readers would otherwise take table locks that
+        # make the writer fail with SQLITE_LOCKED mid-replay
+        conn.execute("PRAGMA read_uncommitted=1;")
+    else:
+        conn.execute("PRAGMA mmap_size=268435456;")
+    return conn
+
+
+def open_readers(
+    path: str,
+    count: int,
+    row_factory: Optional[Callable] = None,
+    memory: bool = False,
+) -> "queue.SimpleQueue[sqlite3.Connection]":
+    """Open a pool of read-only connections to a WAL or in-memory database"""
+    pool: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+    for _ in range(count):
+        pool.put(open_reader(path, row_factory, memory))
+    return pool
+
+
+def close_readers(pool: "queue.SimpleQueue[sqlite3.Connection]") -> None:
+    """Close every connection currently parked in a reader pool"""
+    while True:
+        try:
+            pool.get_nowait().close()
+        except queue.Empty:
+            return
+
+
+def read_with(
+    pool: "queue.SimpleQueue[sqlite3.Connection]",
+    fn: Callable[[sqlite3.Connection], T],
+) -> T:
+    """Run fn on a checked-out reader (blocks a worker thread, not the loop)"""
+    conn = pool.get()
+    try:
+        return fn(conn)
+    finally:
+        pool.put(conn)
+
+
+def read_nowait(
+    pool: "queue.SimpleQueue[sqlite3.Connection]",
+    fn: Callable[[sqlite3.Connection], T],
+) -> T:
+    """Run fn on an idle reader in the calling thread, else queue.Empty"""
+    conn = pool.get_nowait()
+    try:
+        return fn(conn)
+    finally:
+        pool.put(conn)
@@ -1,7 +1,8 @@
 """Storage for artifacts"""
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Optional, Sequence
 from uuid import UUID
 
 from meshcore.domain.models import MeshEvent
@@ -11,8 +12,12 @@ class InMemoryEventStore:
     """In-memory event storage implementing EventStore protocol"""
 
     def __init__(self) -> None:
+        # Kept sorted by timestamp; _timestamps mirrors _events as epoch
+        # seconds so replay can bisect instead of scanning
         self._events: list[MeshEvent] = []
-        self._event_ids: set[UUID] = set()
+        self._timestamps: list[float] = []
+        # Raw 128-bit ints hash faster and are smaller than UUID objects
+        self._event_ids: set[int] = set()
 
     async def append(self, event: MeshEvent) -> bool:
         """Append event to store
@@ -20,30 +25,42 @@ class InMemoryEventStore:
         Returns:
             True if event was inserted, False if duplicate
         """
-        event_id = event.event_id.value
+        event_id = event.event_id.int
         if event_id in self._event_ids:
             return False
 
-        self._events.append(event)
+        ts = event.timestamp.timestamp()
+        if not self._timestamps or ts >= self._timestamps[-1]:
+            self._events.append(event)
+            self._timestamps.append(ts)
+        else:
+            index = bisect_right(self._timestamps, ts)
+            self._events.insert(index, event)
+            self._timestamps.insert(index, ts)
         self._event_ids.add(event_id)
         return True
 
+    async def append_many(self, events: Sequence[MeshEvent]) -> list[bool]:
+        """Append several events, one inserted/duplicate flag per event"""
+        return [await self.append(event) for event in events]
+
     async def replay(
         self,
         since: Optional[datetime],
         until: Optional[datetime],
     ) -> AsyncIterator[MeshEvent]:
-        """Replay events with optional time filtering"""
-        for event in self._events:
-            if since and event.timestamp < since:
-                continue
-            if until and event.timestamp > until:
-                continue
+        """Replay events in timestamp order with optional time filtering"""
+        lo = bisect_left(self._timestamps, since.timestamp()) if since else 0
+        hi = (
+            bisect_right(self._timestamps, until.timestamp())
+            if until else len(self._events)
+        )
+        for event in self._events[lo:hi]:
             yield event
 
     async def event_exists(self, event_id: UUID) -> bool:
         """Check if event already exists"""
-        return event_id in self._event_ids
+        return event_id.int in self._event_ids
 
     async def close(self) -> None:
         """Close the store (no-op for in-memory store)"""
@@ -1,24 +1,322 @@
 """SQLite3 storage adapter with proper async safety"""
 
 import asyncio
-import json
 import logging
+import queue
 import sqlite3
 from datetime import datetime
-from typing import AsyncIterator, Optional
+from typing import AsyncIterator, Callable, Optional, Sequence, TypeVar
 from uuid import UUID
 
-from meshcore.domain.models import MeshEvent, EventId, NodeId
+import orjson
+
+from meshcore.domain.models import MeshEvent
+from ._sqlite_common import (
+    MIGRATE_CHUNK,
+    close_readers,
+    execute_rows,
+    from_micros,
+    memory_uri,
+    multi_row_sql,
+    open_reader,
+    open_readers,
+    read_nowait,
+    read_with,
+    to_micros,
+)
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+_REPLAY_CHUNK = 1000
+# Explicit select list so rows can be unpacked positionally in _row_to_event
+_EVENT_COLUMNS = "id, node_id, event_type, timestamp, ingested_at, data_json"
+# Columns of the pre-data_json schema, read once when migrating
+_LEGACY_COLUMNS = (
+    "id, node_id, event_type, timestamp, ingested_at, "
+    "payload_json, provenance_json"
+)
+
+# SQL is built once at import so every call passes the same string object
+# and hits the connection's prepared-statement cache
+_INSERT_COLUMNS = """
+    events (
+        id,
+        node_id,
+        event_type,
+        timestamp,
+        ingested_at,
+        data_json
+    ) VALUES (?, ?, ?, ?, ?, ?)
+"""
+_INSERT_SQL = "INSERT INTO" + _INSERT_COLUMNS
+_INSERT_OR_IGNORE_SQL = "INSERT OR IGNORE INTO" + _INSERT_COLUMNS
+_EVENT_EXISTS_SQL = "SELECT 1 FROM events WHERE id = ? LIMIT 1"
+
+_INSERT_MANY_SQL = multi_row_sql(_INSERT_SQL, "(?, ?, ?, ?, ?, ?)")
+
+
+def _filtered_sql(
+    base: str, filters: tuple[str, ...], order: str
+) -> dict[tuple[bool, ...], str]:
+    """Every combination of optional AND filters, keyed by which are set"""
+    variants = {}
+    for mask in range(1 << len(filters)):
+        flags = tuple(bool(mask & (1 << i)) for i in range(len(filters)))
+        clauses = "".join(f for f, on in zip(filters, flags) if on)
+        variants[flags] = base + clauses + order
+    return variants
+
+
+# Keyed by (since is set, until is set)
+_REPLAY_SQL = _filtered_sql(
+    f"SELECT {_EVENT_COLUMNS} FROM events WHERE 1=1",
+    (" AND timestamp >= ?", " AND timestamp <= ?"),
+    " ORDER BY timestamp ASC",
+)
+# Keyed by (since is set, node_id is set)
+_QUERY_BY_TYPE_SQL = _filtered_sql(
+    f"SELECT {_EVENT_COLUMNS} FROM events WHERE event_type = ?",
+    (" AND timestamp >= ?", " AND node_id = ?"),
+    " ORDER BY timestamp DESC LIMIT ?",
+)
+# Keyed by (since is set,); answered from idx_events_type_node_ts alone
+_COUNT_BY_TYPE_SQL = _filtered_sql(
+    "SELECT COUNT(*) FROM events WHERE event_type = ?",
+    (" AND timestamp >= ?",),
+    "",
+)
+# Keyed by (since is set,); grouped straight off idx_events_type_node_ts
+_TOP_NODES_BY_TYPE_SQL = _filtered_sql(
+    "SELECT node_id, COUNT(*) AS n FROM events WHERE event_type = ?",
+    (" AND timestamp >= ?",),
+    " GROUP BY node_id ORDER BY n DESC, node_id LIMIT ?",
+)
+# Keyed by (since is set,); IN lets both nodes' index ranges feed one sort
+_CONVERSATION_SQL = _filtered_sql(
+    f"SELECT {_EVENT_COLUMNS} FROM events "
+    "WHERE event_type = 'text' AND node_id IN (?, ?)",
+    (" AND timestamp >= ?",),
+    " ORDER BY timestamp DESC LIMIT ?",
+)
+_TELEMETRY_SERIES_SQL = f"""
+    SELECT {_EVENT_COLUMNS} FROM events
+    WHERE event_type = 'telemetry'
+    AND node_id = ?
+    AND timestamp >= ?
+    ORDER BY timestamp ASC
+    LIMIT ?
+"""
+# Only (timestamp, value) pairs leave SQLite; JSON booleans read as 1 and 0
+_METRIC_SERIES_SQL = """
+    SELECT timestamp, value FROM (
+        SELECT timestamp, json_extract(data_json, ?) AS value FROM events
+        WHERE event_type = 'telemetry'
+        AND node_id = ?
+        AND timestamp >= ?
+    )
+    WHERE typeof(value) IN ('integer', 'real')
+    ORDER BY timestamp ASC
+    LIMIT ?
+"""
+_ALL_METRIC_SERIES_SQL = """
+    SELECT e.timestamp, j.key, j.value FROM (
+        SELECT timestamp, data_json FROM events
+        WHERE event_type = 'telemetry'
+        AND node_id = ?
+        AND timestamp >= ?
+        ORDER BY timestamp ASC
+        LIMIT ?
+    ) e, json_each(e.data_json, '$.p') j
+    WHERE j.type IN ('integer', 'real', 'true', 'false')
+    ORDER BY e.timestamp ASC
+"""
+# One pass over the node's telemetry extracts the metric; the latest value
+# is read back off the same CTE
+_TELEMETRY_STATS_SQL = """
+    WITH v AS (
+        SELECT timestamp, json_extract(data_json, ?) AS value FROM events
+        WHERE event_type = 'telemetry'
+        AND node_id = ?
+        AND timestamp >= ?
+    )
+    SELECT MIN(value), MAX(value), AVG(value), COUNT(value), (
+        SELECT value FROM v
+        WHERE typeof(value) IN ('integer', 'real')
+        ORDER BY timestamp DESC
+        LIMIT 1
+    )
+    FROM v
+    WHERE typeof(value) IN ('integer', 'real')
+"""
+_SEARCH_MESSAGES_SQL = f"""
+    SELECT {_EVENT_COLUMNS} FROM events_fts f
+    JOIN events e ON e.id = f.event_id
+    WHERE events_fts MATCH ?
+    ORDER BY e.timestamp DESC
+    LIMIT ?
+"""
+
+
+def _ensure_text_index(cur: sqlite3.Cursor) -> None:
+    """Create the FTS5 index over text message bodies and its triggers"""
+    has_fts = cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='events_fts'"
+    ).fetchone()
+    cur.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING "
+        "fts5(event_id UNINDEXED, body, tokenize='unicode61')"
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events
+        WHEN new.event_type = 'text'
+        BEGIN
+            INSERT INTO events_fts (event_id, body)
+            VALUES (new.id, json_extract(new.data_json, '$.p.text'));
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events
+        WHEN old.event_type = 'text'
+        BEGIN
+            DELETE FROM events_fts WHERE event_id = old.id;
+        END
+        """
+    )
+    cur.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS events_fts_update
+        AFTER UPDATE OF event_type, data_json ON events
+        BEGIN
+            DELETE FROM events_fts WHERE event_id = old.id;
+            INSERT INTO events_fts (event_id, body)
+            SELECT new.id, json_extract(new.data_json, '$.p.text')
+            WHERE new.event_type = 'text';
+        END
+        """
+    )
+    if not has_fts:
+        # Backfill messages stored before the index existed
+        cur.execute(
+            "INSERT INTO events_fts (event_id, body) "
+            "SELECT id, json_extract(data_json, '$.p.text') FROM events "
+            "WHERE event_type = 'text'"
+        )
+
+
+def _metric_path(metric: str) -> str:
+    """JSON path to a payload key; quoted so dots in it aren't nesting"""
+    return '$.p."' + metric + '"'
+
+
+def _fts_query(search_term: str) -> str:
+    """Quote a user search term as an FTS5 phrase, prefix-matching its end"""
+    return '"' + search_term.replace('"', '""') + '"*'
+
+
+def _event_row(event: MeshEvent) -> tuple:
+    """Column values for an events row, in _INSERT_COLUMNS order"""
+    return (
+        event.event_id.bytes,
+        event.node_id,
+        event.event_type,
+        to_micros(event.timestamp),
+        to_micros(event.ingested_at),
+        # One document per row so reads parse JSON once, not twice; the
+        # parts are the event's cached encodes, shared with the publishers
+        b"".join((
+            b'{"p":', event.payload_bytes(),
+            b',"pv":', event.provenance_bytes(), b"}",
+        )).decode(),
+    )
+
+
+def _row_to_event(row: tuple) -> MeshEvent:
+    """Build a MeshEvent from an events row selected with _EVENT_COLUMNS"""
+    event_id, node_id, event_type, ts, ingested, data_json = row
+    data = orjson.loads(data_json)
+    return MeshEvent(
+        event_id=UUID(bytes=event_id),
+        node_id=node_id,
+        event_type=event_type,
+        timestamp=from_micros(ts),
+        ingested_at=from_micros(ingested),
+        payload=data["p"],
+        provenance=data["pv"],
+    )
+
+
+def _fetch_events(cur: sqlite3.Cursor) -> list[MeshEvent]:
+    """Fetch and decode the next replay chunk, off the event loop"""
+    return list(map(_row_to_event, cur.fetchmany(_REPLAY_CHUNK)))
+
+
+def _legacy_id(value: str | bytes) -> bytes:
+    """16-byte event ID from a TEXT (36-char UUID) or BLOB column value"""
+    return value if isinstance(value, bytes) else UUID(value).bytes
+
+
+def _legacy_micros(value: str | int) -> int:
+    """Epoch micros from an ISO-8601 TEXT or INTEGER column value"""
+    if isinstance(value, int):
+        return value
+    return to_micros(datetime.fromisoformat(value))
+
+
+def _migrate_legacy_events(cur: sqlite3.Cursor) -> None:
+    """Copy events_legacy (separate payload/provenance JSON, and possibly
+    TEXT ids or ISO timestamps) into events.
+
+    Rows already in events are skipped, so a copy cut short by an older,
+    non-transactional migration picks up where it stopped.
+    """
+    logger.info("Migrating events to the combined data_json schema")
+    # A second cursor streams the old rows while cur writes the new ones
+    legacy = cur.connection.execute(
+        f"SELECT {_LEGACY_COLUMNS} FROM events_legacy"
+    )
+    while rows := legacy.fetchmany(MIGRATE_CHUNK):
+        cur.executemany(
+            _INSERT_OR_IGNORE_SQL,
+            (
+                (
+                    _legacy_id(row[0]),
+                    *row[1:3],
+                    _legacy_micros(row[3]),
+                    _legacy_micros(row[4]),
+                    # Both columns already hold JSON text; splice, don't
+                    # reparse
+                    '{"p":' + row[5] + ',"pv":' + row[6] + "}",
+                )
+                for row in rows
+            ),
+        )
+    legacy.close()
+    cur.execute("DROP TABLE events_legacy")
+    # The text index points at the old ids; _ensure_text_index rebuilds it
+    cur.execute("DROP TABLE IF EXISTS events_fts")
+
 
 class SqliteEventStore:
     """SQLite3 event store with thread-safe async operations"""
 
-    def __init__(self, path: str = "events.db") -> None:
-        self._path = path
+    def __init__(
+        self,
+        path: str = "events.db",
+        readers: int = 4,
+        in_memory: bool = False,
+    ) -> None:
+        uri = memory_uri(path, in_memory)
+        self._path = uri or path
+        self._memory = uri is not None
+        self._reader_count = readers
+        # One writer behind _lock; reads check out a WAL reader instead
         self._conn: Optional[sqlite3.Connection] = None
+        self._readers: Optional[queue.SimpleQueue[sqlite3.Connection]] = None
         self._lock: Optional[asyncio.Lock] = None
         self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
         self._closed = False
@@ -46,50 +344,120 @@ class SqliteEventStore:
     async def _connect(self) -> None:
         """Connect to database and initialize schema"""
 
-        def _init():
-            conn = sqlite3.connect(self._path, check_same_thread=False)
-            conn.row_factory = sqlite3.Row
+        def _setup(conn: sqlite3.Connection) -> sqlite3.Connection:
             cur = conn.cursor()
-            cur.execute("PRAGMA journal_mode=WAL;")
             cur.execute("PRAGMA busy_timeout=5000;")  # 5 second timeout
+            if self._memory:
+                # Nothing to journal to or fsync for an in-memory database
+                cur.execute("PRAGMA synchronous=OFF;")
+            else:
+                cur.execute("PRAGMA journal_mode=WAL;")
+                # WAL keeps the database consistent without an fsync per
+                # commit
+                cur.execute("PRAGMA synchronous=NORMAL;")
+                cur.execute("PRAGMA mmap_size=268435456;")  # 256 MiB
+            cur.execute("PRAGMA cache_size=-65536;")  # 64 MiB
+            cur.execute("PRAGMA temp_store=MEMORY;")
+            # sqlite3 doesn't open a transaction for DDL on its own; without
+            # this a crash mid-migration could leave the rename committed
+            # and the copy not. IMMEDIATE keeps a second process from
+            # starting the same migration underneath us.
+            cur.execute("BEGIN IMMEDIATE")
+            # Migrate: events used to keep payload and provenance in two
+            # JSON columns (and, before that, TEXT ids and timestamps);
+            # move the old table aside so it can be rewritten
+            existing = {
+                col[1] for col in
+                cur.execute("PRAGMA table_info(events)").fetchall()
+            }
+            if "payload_json" in existing:
+                cur.execute("ALTER TABLE events RENAME TO events_legacy")
             cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS events (
-                    id TEXT PRIMARY KEY,
+                    id BLOB PRIMARY KEY,
                     node_id TEXT NOT NULL,
                     event_type TEXT NOT NULL,
-                    timestamp TEXT NOT NULL,
-                    ingested_at TEXT NOT NULL,
-                    payload_json TEXT NOT NULL,
-                    provenance_json TEXT NOT NULL
+                    timestamp INTEGER NOT NULL,
+                    ingested_at INTEGER NOT NULL,
+                    data_json TEXT NOT NULL
                 )
                 """
             )
+            # Also resumes a copy an older, non-atomic migration left behind
+            if cur.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' "
+                "AND name='events_legacy'"
+            ).fetchone():
+                _migrate_legacy_events(cur)
             cur.execute(
                 "CREATE INDEX IF NOT EXISTS idx_events_timestamp ON "
                 "events(timestamp)"
             )
+            # Matches the equality-then-range shape of query_by_type and
+            # get_telemetry_series, replacing the single-column indexes
+            has_composite = cur.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='index' "
+                "AND name='idx_events_type_node_ts'"
+            ).fetchone()
             cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_events_node ON events(node_id)"
-            )
-            cur.execute(
-                "CREATE INDEX IF NOT EXISTS idx_events_type ON "
-                "events(event_type)"
+                "CREATE INDEX IF NOT EXISTS idx_events_type_node_ts ON "
+                "events(event_type, node_id, timestamp)"
             )
+            cur.execute("DROP INDEX IF EXISTS idx_events_node")
+            cur.execute("DROP INDEX IF EXISTS idx_events_type")
+            _ensure_text_index(cur)
             conn.commit()
+            if not has_composite:
+                cur.execute("ANALYZE;")
+            else:
+                cur.execute("PRAGMA optimize;")
             return conn
 
+        def _init():
+            conn = sqlite3.connect(
+                self._path, uri=self._memory, check_same_thread=False
+            )
+            try:
+                return _setup(conn)
+            except BaseException:
+                # Closing inside the transaction rolls a migration back
+                conn.close()
+                raise
+
         self._conn = await asyncio.to_thread(_init)
+        self._readers = await asyncio.to_thread(
+            open_readers, self._path, self._reader_count, None, self._memory
+        )
         logger.info(f"Connected to event store at {self._path}")
 
     async def close(self) -> None:
         """Close database connection"""
         if self._conn and not self._closed:
             await asyncio.to_thread(self._conn.close)
+            if self._readers is not None:
+                await asyncio.to_thread(close_readers, self._readers)
             self._conn = None
+            self._readers = None
             self._closed = True
             logger.info("Event store connection closed")
 
+    async def _read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a read-only query on a pooled reader, without the write lock"""
+        return await asyncio.to_thread(read_with, self._readers, fn)
+
+    async def _read_point(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a single-row primary-key lookup on the loop thread if a reader is idle.
+
+        The hop to a worker thread costs more than an indexed point query,
+        so only fall back to _read when every reader is busy. Anything that
+        scans (counts, ranges, aggregates) must use _read instead.
+        """
+        try:
+            return read_nowait(self._readers, fn)
+        except queue.Empty:
+            return await self._read(fn)
+
     async def append(self, event: MeshEvent) -> bool:
         """Append a MeshEvent to the store
         
@@ -101,38 +469,56 @@ class SqliteEventStore:
         def _insert():
             try:
                 cursor = self._conn.execute(
-                    """
-                    INSERT OR IGNORE INTO events (
-                        id,
-                        node_id,
-                        event_type,
-                        timestamp,
-                        ingested_at,
-                        payload_json,
-                        provenance_json
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        str(event.event_id.value),
-                        event.node_id.value,
-                        event.event_type,
-                        event.timestamp.isoformat(),
-                        event.ingested_at.isoformat(),
-                        json.dumps(event.payload),
-                        json.dumps(event.provenance),
-                    ),
+                    _INSERT_OR_IGNORE_SQL, _event_row(event)
                 )
                 self._conn.commit()
                 # If rowcount is 0, the insert was ignored (duplicate)
                 return cursor.rowcount > 0
             except sqlite3.Error as e:
                 logger.error(f"Failed to append event "
-                             f"{event.event_id.value}: {e}")
+                             f"{event.event_id}: {e}")
                 raise
 
         async with self._lock:
             return await asyncio.to_thread(_insert)
 
+    async def append_many(self, events: Sequence[MeshEvent]) -> list[bool]:
+        """Append several events in a single transaction
+
+        Returns:
+            One flag per event, True if inserted, False if it was a duplicate
+        """
+        if not events:
+            return []
+        await self._ensure_connection()
+
+        def _insert_many():
+            rows = [_event_row(event) for event in events]
+            try:
+                try:
+                    # Fast path: no duplicates, one statement and one commit
+                    execute_rows(
+                        self._conn, _INSERT_SQL, _INSERT_MANY_SQL, rows
+                    )
+                    self._conn.commit()
+                    return [True] * len(rows)
+                except sqlite3.IntegrityError:
+                    self._conn.rollback()
+                inserted = []
+                for row in rows:
+                    cursor = self._conn.execute(_INSERT_OR_IGNORE_SQL, row)
+                    inserted.append(cursor.rowcount > 0)
+                self._conn.commit()
+                return inserted
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"Failed to append batch of {len(rows)} "
+                             f"event(s): {e}")
+                raise
+
+        async with self._lock:
+            return await asyncio.to_thread(_insert_many)
+
     async def replay(
         self,
         since: Optional[datetime] = None,
@@ -140,46 +526,43 @@ class SqliteEventStore:
     ) -> AsyncIterator[MeshEvent]:
         """Replay events from the store with optional time filtering"""
         await self._ensure_connection()
-
-        def _fetch_all():
-            query = "SELECT * FROM events WHERE 1=1"
-            params = []
-            if since:
-                query += " AND timestamp >= ?"
-                params.append(since.isoformat())
-            if until:
-                query += " AND timestamp <= ?"
-                params.append(until.isoformat())
-            query += " ORDER BY timestamp ASC"
-            cur = self._conn.execute(query, params)
-            return cur.fetchall()
-
-        async with self._lock:
-            rows = await asyncio.to_thread(_fetch_all)
-        for row in rows:
-            yield MeshEvent(
-                event_id=EventId(value=UUID(row["id"])),
-                node_id=NodeId(value=row["node_id"]),
-                event_type=row["event_type"],
-                timestamp=datetime.fromisoformat(row["timestamp"]),
-                ingested_at=datetime.fromisoformat(row["ingested_at"]),
-                payload=json.loads(row["payload_json"]),
-                provenance=json.loads(row["provenance_json"]),
-            )
+        query = _REPLAY_SQL[bool(since), bool(until)]
+        params = []
+        if since:
+            params.append(to_micros(since))
+        if until:
+            params.append(to_micros(until))
+
+        # Pull rows in chunks, so memory stays flat and the first event
+        # arrives without a full scan. The replay gets its own connection
+        # rather than a pooled reader: a slow or abandoned consumer could
+        # otherwise hold a pool slot indefinitely and starve other reads
+        conn = await asyncio.to_thread(
+            open_reader, self._path, None, self._memory
+        )
+        cur: Optional[sqlite3.Cursor] = None
+        try:
+            cur = await asyncio.to_thread(conn.execute, query, params)
+            while True:
+                events = await asyncio.to_thread(_fetch_events, cur)
+                if not events:
+                    break
+                for event in events:
+                    yield event
+        finally:
+            if cur is not None:
+                cur.close()
+            conn.close()
 
     async def event_exists(self, event_id: UUID) -> bool:
         """Check if an event already exists"""
         await self._ensure_connection()
 
-        def _check():
-            cur = self._conn.execute(
-                "SELECT 1 FROM events WHERE id = ? LIMIT 1",
-                (str(event_id),)
-            )
+        def _check(conn):
+            cur = conn.execute(_EVENT_EXISTS_SQL, (event_id.bytes,))
             return cur.fetchone() is not None
 
-        async with self._lock:
-            return await asyncio.to_thread(_check)
+        return await self._read_point(_check)
 
 
 class SqliteEventQuery:
@@ -204,38 +587,56 @@ class SqliteEventQuery:
         """Query events by type with optional filters"""
         await self._store._ensure_connection()
 
-        def _query():
-            query = "SELECT * FROM events WHERE event_type = ?"
+        def _query(conn):
             params = [event_type]
-
             if since:
-                query += " AND timestamp >= ?"
-                params.append(since.isoformat())
-
+                params.append(to_micros(since))
             if node_id:
-                query += " AND node_id = ?"
                 params.append(node_id)
-
-            query += " ORDER BY timestamp DESC LIMIT ?"
             params.append(limit)
 
-            cur = self._store._conn.execute(query, params)
-            return cur.fetchall()
-
-        async with self._store._lock:
-            rows = await asyncio.to_thread(_query)
-        return [
-            MeshEvent(
-                event_id=EventId(value=UUID(row["id"])),
-                node_id=NodeId(value=row["node_id"]),
-                event_type=row["event_type"],
-                timestamp=datetime.fromisoformat(row["timestamp"]),
-                ingested_at=datetime.fromisoformat(row["ingested_at"]),
-                payload=json.loads(row["payload_json"]),
-                provenance=json.loads(row["provenance_json"]),
+            cur = conn.execute(
+                _QUERY_BY_TYPE_SQL[bool(since), bool(node_id)], params
             )
-            for row in rows
-        ]
+            return list(map(_row_to_event, cur))
+
+        return await self._store._read(_query)
+
+    async def count_by_type(
+        self,
+        event_type: str,
+        since: Optional[datetime] = None,
+    ) -> int:
+        """Count events of a type without fetching their rows"""
+        await self._store._ensure_connection()
+        params = [event_type]
+        if since:
+            params.append(to_micros(since))
+
+        def _query(conn):
+            cur = conn.execute(_COUNT_BY_TYPE_SQL[(bool(since),)], params)
+            return cur.fetchone()[0]
+
+        return await self._store._read(_query)
+
+    async def top_nodes_by_type(
+        self,
+        event_type: str,
+        since: Optional[datetime] = None,
+        limit: int = 10,
+    ) -> list[tuple[str, int]]:
+        """Nodes with the most events of a type, as (node_id, count)"""
+        await self._store._ensure_connection()
+        params = [event_type]
+        if since:
+            params.append(to_micros(since))
+        params.append(limit)
+
+        def _query(conn):
+            cur = conn.execute(_TOP_NODES_BY_TYPE_SQL[(bool(since),)], params)
+            return [tuple(row) for row in cur.fetchall()]
+
+        return await self._store._read(_query)
 
     async def get_telemetry_series(
         self,
@@ -246,67 +647,107 @@ class SqliteEventQuery:
         """Get telemetry events for a node as time series"""
         await self._store._ensure_connection()
 
-        def _query():
-            query = """
-                SELECT * FROM events
-                WHERE event_type = 'telemetry'
-                AND node_id = ?
-                AND timestamp >= ?
-                ORDER BY timestamp ASC
-                LIMIT ?
-            """
-            cur = self._store._conn.execute(
-                query, (node_id, since.isoformat(), limit)
-            )
-            return cur.fetchall()
-
-        async with self._store._lock:
-            rows = await asyncio.to_thread(_query)
-        return [
-            MeshEvent(
-                event_id=EventId(value=UUID(row["id"])),
-                node_id=NodeId(value=row["node_id"]),
-                event_type=row["event_type"],
-                timestamp=datetime.fromisoformat(row["timestamp"]),
-                ingested_at=datetime.fromisoformat(row["ingested_at"]),
-                payload=json.loads(row["payload_json"]),
-                provenance=json.loads(row["provenance_json"]),
+        def _query(conn):
+            cur = conn.execute(
+                _TELEMETRY_SERIES_SQL, (node_id, to_micros(since), limit)
             )
-            for row in rows
-        ]
+            return list(map(_row_to_event, cur))
+
+        return await self._store._read(_query)
+
+    async def get_metric_series(
+        self,
+        node_id: str,
+        metric: str,
+        since: datetime,
+        limit: int = 1000,
+    ) -> list[tuple[datetime, float]]:
+        """(timestamp, value) points of one numeric telemetry metric"""
+        await self._store._ensure_connection()
+        params = (_metric_path(metric), node_id, to_micros(since), limit)
+
+        def _query(conn):
+            return [
+                (from_micros(ts), float(value)) for ts, value
+                in conn.execute(_METRIC_SERIES_SQL, params)
+            ]
+
+        return await self._store._read(_query)
+
+    async def get_all_metric_series(
+        self,
+        node_id: str,
+        since: datetime,
+        limit: int = 1000,
+    ) -> list[tuple[datetime, str, float]]:
+        """(timestamp, metric, value) for every numeric metric of the first
+        limit telemetry events"""
+        await self._store._ensure_connection()
+        params = (node_id, to_micros(since), limit)
+
+        def _query(conn):
+            return [
+                (from_micros(ts), key, float(value)) for ts, key, value
+                in conn.execute(_ALL_METRIC_SERIES_SQL, params)
+            ]
+
+        return await self._store._read(_query)
+
+    async def get_telemetry_stats(
+        self,
+        node_id: str,
+        metric: str,
+        since: datetime,
+    ) -> tuple[
+        Optional[float], Optional[float], Optional[float], Optional[float], int
+    ]:
+        """Min, max, mean, latest value and count of a numeric metric"""
+        await self._store._ensure_connection()
+        params = (_metric_path(metric), node_id, to_micros(since))
+
+        def _query(conn):
+            low, high, mean, count, latest = conn.execute(
+                _TELEMETRY_STATS_SQL, params
+            ).fetchone()
+            if not count:
+                return None, None, None, None, 0
+            return float(low), float(high), mean, float(latest), count
+
+        return await self._store._read(_query)
+
+    async def query_conversation(
+        self,
+        node_a: str,
+        node_b: str,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> list[MeshEvent]:
+        """Text messages sent by either node, newest first"""
+        await self._store._ensure_connection()
+        params = [node_a, node_b]
+        if since:
+            params.append(to_micros(since))
+        params.append(limit)
+
+        def _query(conn):
+            cur = conn.execute(_CONVERSATION_SQL[(bool(since),)], params)
+            return list(map(_row_to_event, cur))
+
+        return await self._store._read(_query)
 
     async def search_messages(
         self,
         search_term: str,
         limit: int = 100,
     ) -> list[MeshEvent]:
-        """Search text messages"""
+        """Search text messages by words in the message body"""
+        if not search_term.strip():
+            return []
         await self._store._ensure_connection()
+        params = (_fts_query(search_term), limit)
 
-        def _query():
-            query = """
-                SELECT * FROM events
-                WHERE event_type = 'text'
-                AND payload_json LIKE ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """
-            cur = self._store._conn.execute(
-                query, (f"%{search_term}%", limit)
-            )
-            return cur.fetchall()
-
-        async with self._store._lock:
-            rows = await asyncio.to_thread(_query)
-        return [
-            MeshEvent(
-                event_id=EventId(value=UUID(row["id"])),
-                node_id=NodeId(value=row["node_id"]),
-                event_type=row["event_type"],
-                timestamp=datetime.fromisoformat(row["timestamp"]),
-                ingested_at=datetime.fromisoformat(row["ingested_at"]),
-                payload=json.loads(row["payload_json"]),
-                provenance=json.loads(row["provenance_json"]),
-            )
-            for row in rows
-        ]
+        def _query(conn):
+            cur = conn.execute(_SEARCH_MESSAGES_SQL, params)
+            return list(map(_row_to_event, cur))
+
+        return await self._store._read(_query)
@@ -1,5 +1,8 @@
 """In-memory state storage"""
 
+from bisect import bisect_left, insort
+from typing import Optional, Sequence
+
 from meshcore.domain.models import NodeId, NodeState
 
 
@@ -8,16 +11,43 @@ class InMemoryStateStore:
 
     def __init__(self) -> None:
         self._states: dict[str, NodeState] = {}
+        # (last_seen epoch seconds, node_id) kept ascending, so list_nodes
+        # can walk it backwards for the SQLite store's last_seen DESC order.
+        # _keys remembers each node's entry, since a state may be mutated in
+        # place before it is upserted again
+        self._by_last_seen: list[tuple[float, str]] = []
+        self._keys: dict[str, tuple[float, str]] = {}
+
+    def _unindex(self, node_id: str) -> None:
+        key = self._keys.pop(node_id, None)
+        if key is not None:
+            del self._by_last_seen[bisect_left(self._by_last_seen, key)]
 
     async def upsert_node(self, state: NodeState) -> None:
-        self._states[state.node_id.value] = state
+        node_id = state.node_id
+        key = (state.last_seen.timestamp(), node_id)
+        if self._keys.get(node_id) != key:
+            self._unindex(node_id)
+            insort(self._by_last_seen, key)
+            self._keys[node_id] = key
+        self._states[node_id] = state
+
+    async def upsert_nodes(self, states: Sequence[NodeState]) -> None:
+        for state in states:
+            await self.upsert_node(state)
 
     async def get_node(self, node_id: NodeId) -> NodeState | None:
-        return self._states.get(node_id.value)
+        return self._states.get(node_id)
 
-    async def list_nodes(self) -> list[NodeState]:
-        return list(self._states.values())
+    async def list_nodes(self, limit: Optional[int] = None) -> list[NodeState]:
+        """List nodes most recently seen first, optionally only the top limit"""
+        count = len(self._by_last_seen)
+        stop = count - limit - 1 if limit is not None and limit < count else -1
+        return [
+            self._states[self._by_last_seen[i][1]]
+            for i in range(count - 1, stop, -1)
+        ]
 
     async def delete_node(self, node_id: NodeId) -> None:
-        self._states.pop(node_id.value, None)
-
+        self._unindex(node_id)
+        self._states.pop(node_id, None)
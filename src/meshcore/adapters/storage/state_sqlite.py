@@ -1,23 +1,210 @@
 """SQLite state storage with proper async safety"""
 
 import asyncio
-import json
 import logging
+import queue
 import sqlite3
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional, Sequence, TypeVar
+
+import orjson
 
 from meshcore.domain.models import NodeId, NodeState
+from ._sqlite_common import (
+    MIGRATE_CHUNK,
+    close_readers,
+    execute_rows,
+    from_micros,
+    memory_uri,
+    multi_row_sql,
+    open_readers,
+    read_nowait,
+    read_with,
+    to_micros,
+)
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+_NODE_STATE_COLUMNS = (
+    "node_id, long_name, short_name, last_seen, first_seen, event_count, "
+    "last_telemetry_json, last_position_json, last_text, last_snr, "
+    "last_rssi, last_hops_away"
+)
+
+# Built once so every call hits the prepared-statement cache
+_UPSERT_NODE_SQL = """
+    INSERT INTO node_states (
+        node_id,
+        long_name,
+        short_name,
+        last_seen,
+        first_seen,
+        event_count,
+        last_telemetry_json,
+        last_position_json,
+        last_text,
+        last_snr,
+        last_rssi,
+        last_hops_away
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(node_id) DO UPDATE SET
+        long_name=COALESCE(excluded.long_name, node_states.long_name),
+        short_name=COALESCE(excluded.short_name, node_states.short_name),
+        last_seen=excluded.last_seen,
+        event_count=excluded.event_count,
+        last_telemetry_json=excluded.last_telemetry_json,
+        last_position_json=excluded.last_position_json,
+        last_text=excluded.last_text,
+        last_snr=COALESCE(excluded.last_snr, node_states.last_snr),
+        last_rssi=COALESCE(excluded.last_rssi, node_states.last_rssi),
+        last_hops_away=COALESCE(excluded.last_hops_away, node_states.last_hops_away)
+"""
+_UPSERT_NODES_SQL = multi_row_sql(
+    _UPSERT_NODE_SQL, "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SELECT_NODE_SQL = (
+    f"SELECT {_NODE_STATE_COLUMNS} FROM node_states WHERE node_id = ?"
+)
+_LIST_NODES_SQL = (
+    f"SELECT {_NODE_STATE_COLUMNS} FROM node_states "
+    "ORDER BY last_seen DESC LIMIT ?"
+)
+_DELETE_NODE_SQL = "DELETE FROM node_states WHERE node_id = ?"
+_INSERT_SENT_SQL = """
+    INSERT INTO sent_messages
+        (packet_id, text, destination, channel, sent_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_MARK_ACKED_SQL = """
+    UPDATE sent_messages
+    SET ack_at = ?, ack_from = ?, error_reason = ?
+    WHERE packet_id = ?
+"""
+_SENT_MESSAGES_SQL = (
+    "SELECT packet_id, text, destination, channel, sent_at, ack_at, "
+    "ack_from, error_reason FROM sent_messages ORDER BY sent_at DESC LIMIT ?"
+)
+
+
+def _json_or_none(value: Optional[dict]) -> Optional[str]:
+    """JSON text for a column, or None when there is nothing to store"""
+    return orjson.dumps(value).decode() if value else None
+
+
+def _state_row(state: NodeState) -> tuple:
+    """Parameters for _UPSERT_NODE_SQL"""
+    return (
+        state.node_id,
+        state.long_name,
+        state.short_name,
+        to_micros(state.last_seen),
+        to_micros(state.first_seen),
+        state.event_count,
+        _json_or_none(state.last_telemetry),
+        _json_or_none(state.last_position),
+        state.last_text,
+        state.last_snr,
+        state.last_rssi,
+        state.last_hops_away,
+    )
+
+
+def _row_to_state(row: Sequence) -> NodeState:
+    """Build a NodeState from a row selected with _NODE_STATE_COLUMNS"""
+    (
+        node_id, long_name, short_name, last_seen, first_seen, event_count,
+        telemetry, position, last_text, last_snr, last_rssi, hops_away,
+    ) = row
+    return NodeState(
+        node_id=node_id,
+        long_name=long_name,
+        short_name=short_name,
+        last_seen=from_micros(last_seen),
+        first_seen=from_micros(first_seen),
+        event_count=event_count,
+        last_telemetry=orjson.loads(telemetry) if telemetry else None,
+        last_position=orjson.loads(position) if position else None,
+        last_text=last_text,
+        last_snr=last_snr,
+        last_rssi=last_rssi,
+        last_hops_away=hops_away,
+    )
+
+
+def _migrate_iso_timestamps(cur: sqlite3.Cursor, rename: bool = True) -> None:
+    """Rewrite node_states with INTEGER epoch-microsecond seen times.
+
+    With rename=False, node_states_legacy is already there from a copy an
+    older, non-transactional migration cut short; rows already copied are
+    skipped.
+    """
+    logger.info("Migrating node state timestamps to epoch microseconds")
+    if rename:
+        cur.execute("ALTER TABLE node_states RENAME TO node_states_legacy")
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS node_states (
+            node_id TEXT PRIMARY KEY,
+            long_name TEXT,
+            short_name TEXT,
+            last_seen INTEGER NOT NULL,
+            first_seen INTEGER NOT NULL,
+            event_count INTEGER NOT NULL,
+            last_telemetry_json TEXT,
+            last_position_json TEXT,
+            last_text TEXT,
+            last_snr REAL,
+            last_rssi REAL,
+            last_hops_away INTEGER
+        )
+        """
+    )
+    # A second cursor streams the old rows while cur writes the new ones
+    legacy = cur.connection.execute(
+        f"SELECT {_NODE_STATE_COLUMNS} FROM node_states_legacy"
+    )
+    while rows := legacy.fetchmany(MIGRATE_CHUNK):
+        cur.executemany(
+            f"INSERT OR IGNORE INTO node_states ({_NODE_STATE_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    *row[:3],
+                    to_micros(datetime.fromisoformat(row["last_seen"])),
+                    to_micros(datetime.fromisoformat(row["first_seen"])),
+                    *row[5:],
+                )
+                for row in rows
+            ),
+        )
+    legacy.close()
+    # Dropping the old table took its index with it
+    cur.execute("DROP TABLE node_states_legacy")
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_states_last_seen ON "
+        "node_states(last_seen)"
+    )
+
 
 class SqliteStateStore:
     """SQLite state storage with thread-safe async operations"""
 
-    def __init__(self, path: str = "state.db") -> None:
-        self._path = path
+    def __init__(
+        self,
+        path: str = "state.db",
+        readers: int = 4,
+        in_memory: bool = False,
+    ) -> None:
+        uri = memory_uri(path, in_memory)
+        self._path = uri or path
+        self._memory = uri is not None
+        self._reader_count = readers
+        # One writer behind _lock; reads check out a WAL reader instead
         self._conn: sqlite3.Connection | None = None
+        self._readers: queue.SimpleQueue[sqlite3.Connection] | None = None
         self._lock: asyncio.Lock | None = None
         self._lock_loop: asyncio.AbstractEventLoop | None = None
         self._closed = False
@@ -44,20 +231,37 @@ class SqliteStateStore:
 
     async def _connect(self) -> None:
         """Connect to database and initialize schema"""
-        def _init():
-            conn = sqlite3.connect(self._path, check_same_thread=False)
+        def _setup(conn: sqlite3.Connection) -> sqlite3.Connection:
             conn.row_factory = sqlite3.Row
             cur = conn.cursor()
-            cur.execute("PRAGMA journal_mode=WAL;")
             cur.execute("PRAGMA busy_timeout=5000;")
+            if self._memory:
+                # Nothing to journal to or fsync for an in-memory database
+                cur.execute("PRAGMA synchronous=OFF;")
+            else:
+                cur.execute("PRAGMA journal_mode=WAL;")
+                # WAL keeps the database consistent without an fsync per
+                # commit
+                cur.execute("PRAGMA synchronous=NORMAL;")
+                cur.execute("PRAGMA mmap_size=268435456;")  # 256 MiB
+            cur.execute("PRAGMA cache_size=-65536;")  # 64 MiB
+            cur.execute("PRAGMA temp_store=MEMORY;")
+            # One transaction for the whole schema setup: sqlite3 doesn't
+            # open one for DDL, so otherwise a crash between a rename and
+            # its copy would leave the rename committed
+            cur.execute("BEGIN IMMEDIATE")
+            resume = cur.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='table' "
+                "AND name='node_states_legacy'"
+            ).fetchone()
             cur.execute(
                 """
                 CREATE TABLE IF NOT EXISTS node_states (
                     node_id TEXT PRIMARY KEY,
                     long_name TEXT,
                     short_name TEXT,
-                    last_seen TEXT NOT NULL,
-                    first_seen TEXT NOT NULL,
+                    last_seen INTEGER NOT NULL,
+                    first_seen INTEGER NOT NULL,
                     event_count INTEGER NOT NULL,
                     last_telemetry_json TEXT,
                     last_position_json TEXT,
@@ -87,6 +291,16 @@ class SqliteStateStore:
                 cur.execute("ALTER TABLE node_states ADD COLUMN last_rssi REAL")
             if "last_hops_away" not in existing:
                 cur.execute("ALTER TABLE node_states ADD COLUMN last_hops_away INTEGER")
+            # Migrate: last_seen/first_seen used to be ISO-8601 TEXT
+            seen_type = next(
+                col[2] for col in
+                cur.execute("PRAGMA table_info(node_states)").fetchall()
+                if col[1] == "last_seen"
+            )
+            if seen_type.upper() == "TEXT":
+                _migrate_iso_timestamps(cur)
+            elif resume:
+                _migrate_iso_timestamps(cur, rename=False)
             # Migrate: if old schema had packet_id as PK (no auto-increment id),
             # rebuild the table before creating indexes.
             existing_sent = {
@@ -142,128 +356,110 @@ class SqliteStateStore:
             conn.commit()
             return conn
 
+        def _init():
+            conn = sqlite3.connect(
+                self._path, uri=self._memory, check_same_thread=False
+            )
+            try:
+                return _setup(conn)
+            except BaseException:
+                # Closing inside the transaction rolls a migration back
+                conn.close()
+                raise
+
         self._conn = await asyncio.to_thread(_init)
+        self._readers = await asyncio.to_thread(
+            open_readers, self._path, self._reader_count, sqlite3.Row,
+            self._memory
+        )
         logger.info(f"Connected to state store at {self._path}")
 
     async def close(self) -> None:
         """Close database connection"""
         if self._conn and not self._closed:
             await asyncio.to_thread(self._conn.close)
+            if self._readers is not None:
+                await asyncio.to_thread(close_readers, self._readers)
             self._conn = None
+            self._readers = None
             self._closed = True
             logger.info("State store connection closed")
 
+    async def _read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a read-only query on a pooled reader, without the write lock"""
+        return await asyncio.to_thread(read_with, self._readers, fn)
+
+    async def _read_point(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run a single-row lookup on the loop thread if a reader is idle.
+
+        The hop to a worker thread costs more than an indexed point query,
+        so only fall back to _read when every reader is busy.
+        """
+        try:
+            return read_nowait(self._readers, fn)
+        except queue.Empty:
+            return await self._read(fn)
+
     async def upsert_node(self, state: NodeState) -> None:
         """Insert or update node state"""
         await self._ensure_connection()
 
         def _upsert():
-            self._conn.execute(
-                """
-                INSERT INTO node_states (
-                    node_id,
-                    long_name,
-                    short_name,
-                    last_seen,
-                    first_seen,
-                    event_count,
-                    last_telemetry_json,
-                    last_position_json,
-                    last_text,
-                    last_snr,
-                    last_rssi,
-                    last_hops_away
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(node_id) DO UPDATE SET
-                    long_name=COALESCE(excluded.long_name, node_states.long_name),
-                    short_name=COALESCE(excluded.short_name, node_states.short_name),
-                    last_seen=excluded.last_seen,
-                    event_count=excluded.event_count,
-                    last_telemetry_json=excluded.last_telemetry_json,
-                    last_position_json=excluded.last_position_json,
-                    last_text=excluded.last_text,
-                    last_snr=COALESCE(excluded.last_snr, node_states.last_snr),
-                    last_rssi=COALESCE(excluded.last_rssi, node_states.last_rssi),
-                    last_hops_away=COALESCE(excluded.last_hops_away, node_states.last_hops_away)
-                """,
-                (
-                    state.node_id.value,
-                    state.long_name,
-                    state.short_name,
-                    state.last_seen.isoformat(),
-                    state.first_seen.isoformat(),
-                    state.event_count,
-                    json.dumps(state.last_telemetry) if state.last_telemetry else None,  # noqa: E501
-                    json.dumps(state.last_position) if state.last_position else None,  # noqa: E501
-                    state.last_text,
-                    state.last_snr,
-                    state.last_rssi,
-                    state.last_hops_away,
-                ),
-            )
+            self._conn.execute(_UPSERT_NODE_SQL, _state_row(state))
             self._conn.commit()
 
         async with self._lock:
             await asyncio.to_thread(_upsert)
 
+    async def upsert_nodes(self, states: Sequence[NodeState]) -> None:
+        """Insert or update several node states in a single transaction"""
+        if not states:
+            return
+        await self._ensure_connection()
+
+        def _upsert_many():
+            try:
+                execute_rows(
+                    self._conn, _UPSERT_NODE_SQL, _UPSERT_NODES_SQL,
+                    [_state_row(state) for state in states],
+                )
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
+
+        async with self._lock:
+            await asyncio.to_thread(_upsert_many)
+
     async def get_node(self, node_id: NodeId) -> NodeState | None:
         """Retrieve node state by ID"""
         await self._ensure_connection()
 
-        def _get():
-            cur = self._conn.execute(
-                "SELECT * FROM node_states WHERE node_id = ?",
-                (node_id.value,)
+        def _get(conn):
+            cur = conn.execute(
+                _SELECT_NODE_SQL,
+                (node_id,)
             )
             return cur.fetchone()
 
-        async with self._lock:
-            row = await asyncio.to_thread(_get)
+        row = await self._read_point(_get)
         if not row:
             return None
-        return NodeState(
-            node_id=NodeId(value=row["node_id"]),
-            long_name=row["long_name"],
-            short_name=row["short_name"],
-            last_seen=datetime.fromisoformat(row["last_seen"]),
-            first_seen=datetime.fromisoformat(row["first_seen"]),
-            event_count=row["event_count"],
-            last_telemetry=json.loads(row["last_telemetry_json"]) if row["last_telemetry_json"] else None,  # noqa: E501
-            last_position=json.loads(row["last_position_json"]) if row["last_position_json"] else None,  # noqa: E501
-            last_text=row["last_text"],
-            last_snr=row["last_snr"],
-            last_rssi=row["last_rssi"],
-            last_hops_away=row["last_hops_away"],
-        )
+        return _row_to_state(row)
 
-    async def list_nodes(self) -> list[NodeState]:
-        """List all nodes ordered by last seen"""
+    async def list_nodes(self, limit: Optional[int] = None) -> list[NodeState]:
+        """List nodes ordered by last seen, optionally only the top limit"""
         await self._ensure_connection()
 
-        def _list():
-            cur = self._conn.execute(
-                "SELECT * FROM node_states ORDER BY last_seen DESC"
+        def _list(conn):
+            # A negative LIMIT means no limit in SQLite
+            cur = conn.execute(
+                _LIST_NODES_SQL,
+                (-1 if limit is None else limit,)
             )
             return cur.fetchall()
-        async with self._lock:
-            rows = await asyncio.to_thread(_list)
-        return [
-            NodeState(
-                node_id=NodeId(value=row["node_id"]),
-                long_name=row["long_name"],
-                short_name=row["short_name"],
-                last_seen=datetime.fromisoformat(row["last_seen"]),
-                first_seen=datetime.fromisoformat(row["first_seen"]),
-                event_count=row["event_count"],
-                last_telemetry=json.loads(row["last_telemetry_json"]) if row["last_telemetry_json"] else None,  # noqa: E501
-                last_position=json.loads(row["last_position_json"]) if row["last_position_json"] else None,  # noqa: E501
-                last_text=row["last_text"],
-                last_snr=row["last_snr"],
-                last_rssi=row["last_rssi"],
-                last_hops_away=row["last_hops_away"],
-            )
-            for row in rows
-        ]
+        rows = await self._read(_list)
+        return list(map(_row_to_state, rows))
 
     async def delete_node(self, node_id: NodeId) -> None:
         """Delete a node from state"""
@@ -271,8 +467,8 @@ class SqliteStateStore:
 
         def _delete():
             self._conn.execute(
-                "DELETE FROM node_states WHERE node_id = ?",
-                (node_id.value,)
+                _DELETE_NODE_SQL,
+                (node_id,)
             )
             self._conn.commit()
 
@@ -292,11 +488,7 @@ class SqliteStateStore:
 
         def _insert():
             self._conn.execute(
-                """
-                INSERT INTO sent_messages
-                    (packet_id, text, destination, channel, sent_at)
-                VALUES (?, ?, ?, ?, ?)
-                """,
+                _INSERT_SENT_SQL,
                 (packet_id, text, destination, channel, sent_at.isoformat()),
             )
             self._conn.commit()
@@ -316,11 +508,7 @@ class SqliteStateStore:
 
         def _update():
             self._conn.execute(
-                """
-                UPDATE sent_messages
-                SET ack_at = ?, ack_from = ?, error_reason = ?
-                WHERE packet_id = ?
-                """,
+                _MARK_ACKED_SQL,
                 (ack_at.isoformat(), acking_node, error_reason, packet_id),
             )
             self._conn.commit()
@@ -334,7 +522,7 @@ class SqliteStateStore:
 
         def _query():
             cur = self._conn.execute(
-                "SELECT * FROM sent_messages ORDER BY sent_at DESC LIMIT ?",
+                _SENT_MESSAGES_SQL,
                 (limit,),
             )
             return cur.fetchall()
@@ -0,0 +1,88 @@
+"""Server-Sent Events fan-out for the web UI"""
+
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+
+import orjson
+
+from meshcore.application.ports import EventPublisher
+from meshcore.domain.models import MeshEvent
+
+logger = logging.getLogger(__name__)
+
+
+class SseHub:
+    """Fan messages out to one bounded queue per connected SSE client.
+
+    Queues live on the web app's event loop; publish() may be called from
+    any thread (the ingest pipeline runs on its own loop) and hands the
+    message over with call_soon_threadsafe.
+    """
+
+    __slots__ = ("_loop", "_clients", "_maxsize")
+
+    def __init__(
+        self, loop: asyncio.AbstractEventLoop, maxsize: int = 256
+    ) -> None:
+        self._loop = loop
+        self._clients: set[asyncio.Queue[str]] = set()
+        self._maxsize = maxsize
+
+    async def register(self) -> "asyncio.Queue[str]":
+        """Add a client queue; runs on the hub's loop"""
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self._maxsize)
+        self._clients.add(queue)
+        return queue
+
+    def unregister(self, queue: "asyncio.Queue[str]") -> None:
+        """Drop a client queue, from any thread"""
+        self._loop.call_soon_threadsafe(self._clients.discard, queue)
+
+    def publish(self, data: str) -> None:
+        """Send a JSON message to every client, from any thread"""
+        self._loop.call_soon_threadsafe(self._broadcast, data)
+
+    def _broadcast(self, data: str) -> None:
+        for queue in self._clients:
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                # A stalled browser shouldn't hold up everyone else
+                logger.debug("Dropping SSE message for a slow client")
+
+    async def keepalive(self, interval: float = 30.0) -> None:
+        """Publish a keepalive to every client each interval, forever"""
+        while True:
+            await asyncio.sleep(interval)
+            self._broadcast(orjson.dumps({
+                "type": "keepalive",
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            }).decode())
+
+
+class SsePublisher:
+    """EventPublisher that pushes events to an SseHub, then to inner"""
+
+    __slots__ = ("_hub", "_inner")
+
+    def __init__(
+        self, hub: SseHub, inner: Optional[EventPublisher] = None
+    ) -> None:
+        self._hub = hub
+        self._inner = inner
+
+    async def publish(self, event: MeshEvent) -> None:
+        # Splice the event's cached JSON instead of re-serializing it
+        self._hub.publish(
+            '{"type":"event","event":' + event.json_bytes().decode() + "}"
+        )
+        if self._inner is not None:
+            await self._inner.publish(event)
+
+    async def close(self) -> None:
+        """Close the inner publisher, if it needs closing"""
+        close = getattr(self._inner, "close", None)
+        if close is not None:
+            await close()
@@ -6,7 +6,11 @@ from datetime import datetime
 from textual.app import App, ComposeResult
 from textual.widgets import Footer, Header
 
-from meshcore.adapters.ui.widgets import NodeTable, StatusBar
+from meshcore.adapters.ui.widgets import (
+    NodeTable,
+    StatusBar,
+    nodes_for_display,
+)
 from meshcore.application.ports import StateStore
 
 
@@ -53,10 +57,12 @@ class MeshTUI(App):
 
     async def refresh_data(self) -> None:
         nodes = await self._state_store.list_nodes()
+        # Format rows on a worker thread so keypresses aren't held up
+        rows = await asyncio.to_thread(nodes_for_display, nodes)
         table = self.query_one(NodeTable)
         status = self.query_one(StatusBar)
-        table.update_nodes(nodes)
-        status.update_status(len(nodes), datetime.now())
+        table.update_nodes(rows)
+        status.update_status(len(rows), datetime.now())
 
     def action_refresh(self) -> None:
         asyncio.create_task(self.refresh_data())
@@ -2,10 +2,23 @@
 
 import asyncio
 import logging
+import threading
+from bisect import bisect_right
+from collections.abc import Coroutine
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-
-from flask import Flask, render_template, jsonify, request, Response
+from typing import Any, TypeVar
+
+import orjson
+from flask import (
+    Flask,
+    Response,
+    request,
+    stream_with_context,
+)
+from flask.json.provider import JSONProvider
+from jinja2 import pass_context
 
 from meshcore.adapters.storage.state_sqlite import SqliteStateStore
 from meshcore.adapters.storage.sqlite import (
@@ -13,11 +26,34 @@ from meshcore.adapters.storage.sqlite import (
     SqliteEventQuery,
 )
 from meshcore.adapters.meshtastic.commander import MockCommander
+from meshcore.adapters.ui.sse import SseHub
 from meshcore.application.message_service import MessageQueryService
 from meshcore.application.telemetry_service import TelemetryQueryService
+from meshcore.eventloop import new_event_loop
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Age buckets for the timeago and status_class filters: bisect_right on the
+# bounds (seconds) picks the index into the matching tuple
+_TIMEAGO_BOUNDS = (60, 3600, 86400)
+_TIMEAGO_UNITS = ((1, "s"), (60, "m"), (3600, "h"), (86400, "d"))
+# Ages are shown in 5 second steps, so each cache entry covers a window
+_TIMEAGO_BUCKET = 5
+_STATUS_BOUNDS = (60, 300, 3600)
+_STATUS_CLASSES = (
+    "status-active", "status-recent", "status-idle", "status-offline"
+)
+
+
+@lru_cache(maxsize=4096)
+def _timeago(bucket: int) -> str:
+    """Format an age given in _TIMEAGO_BUCKET steps"""
+    seconds = bucket * _TIMEAGO_BUCKET
+    divisor, unit = _TIMEAGO_UNITS[bisect_right(_TIMEAGO_BOUNDS, seconds)]
+    return f"{int(seconds / divisor)}{unit} ago"
+
 
 async def _initialize_stores(app: Flask) -> None:
     """Initialize database connections for stores"""
@@ -42,10 +78,105 @@ async def _cleanup_stores(app: Flask) -> None:
         logger.error(f"Error during database cleanup: {e}")
 
 
+class _OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, for jsonify and |tojson"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+def _json_response(obj: Any) -> Response:
+    """JSON response via orjson, which encodes datetimes, UUIDs and
+    dataclasses natively, so views needn't convert them first"""
+    return Response(orjson.dumps(obj), mimetype="application/json")
+
+
+def _node_stats(nodes: list, now: datetime) -> dict[str, int]:
+    """Summary counts for the dashboard stats cards"""
+    return {
+        "total_nodes": len(nodes),
+        "active_nodes": sum(
+            1 for n in nodes
+            if (now - n.last_seen).total_seconds() < 300
+        ),
+        "total_events": sum(n.event_count for n in nodes),
+    }
+
+
+async def _gather(*aws: Coroutine[Any, Any, Any]) -> list[Any]:
+    """asyncio.gather as a coroutine, so _run can schedule it on the loop"""
+    return await asyncio.gather(*aws)
+
+
+async def _refresh_stats(app: Flask) -> None:
+    """Recompute the dashboard aggregates once and publish the snapshot"""
+    msg_service = app.config['MESSAGE_SERVICE']
+    now = datetime.now(timezone.utc)
+    # Independent queries, each on its own pooled reader. Counted and
+    # grouped in SQL rather than over fetched messages
+    nodes, total_messages, messages_24h, top_senders = await asyncio.gather(
+        app.config['STATE_STORE'].list_nodes(),
+        msg_service.count_messages(),
+        msg_service.count_messages(since=now - timedelta(hours=24)),
+        msg_service.top_senders(10),
+    )
+    # Replaced wholesale so views never see a half-updated snapshot
+    app.config['STATS_CACHE'] = {
+        "nodes": nodes,
+        **_node_stats(nodes, now),
+        "total_messages": total_messages,
+        "messages_24h": messages_24h,
+        "top_senders": top_senders,
+    }
+
+
+async def _refresh_stats_forever(app: Flask, interval: float) -> None:
+    """Keep STATS_CACHE fresh so /stats and /analytics don't rescan"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await _refresh_stats(app)
+        except Exception as e:
+            logger.error(f"Failed to refresh dashboard stats: {e}")
+
+
+def _start_loop() -> tuple[asyncio.AbstractEventLoop, threading.Thread]:
+    """Start the event loop that every request's coroutines run on"""
+    loop = new_event_loop()
+    thread = threading.Thread(
+        target=loop.run_forever, daemon=True, name="WebEventLoop"
+    )
+    thread.start()
+    return loop, thread
+
+
+def shutdown_app(app: Flask) -> None:
+    """Run the shutdown hooks, close the stores and stop the event loop"""
+    loop: asyncio.AbstractEventLoop = app.config['LOOP']
+    if loop.is_closed():
+        return
+    # e.g. stopping the ingest thread, so its publishers flush and close
+    for hook in app.config['SHUTDOWN_HOOKS']:
+        try:
+            hook()
+        except Exception as e:
+            logger.error(f"Shutdown hook failed: {e}", exc_info=True)
+    app.config['STATS_TASK'].cancel()
+    app.config['SSE_KEEPALIVE_TASK'].cancel()
+    asyncio.run_coroutine_threadsafe(_cleanup_stores(app), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    app.config['LOOP_THREAD'].join()
+    loop.close()
+
+
 def create_app(
     state_db_path: str = "state.db",
     events_db_path: str = "events.db",
     commander=None,
+    stats_refresh_interval: float = 2.0,
 ) -> Flask:
     """Create and configure the Flask app"""
     app = Flask(
@@ -53,8 +184,9 @@ def create_app(
         template_folder=str(Path(__file__).parent / "templates"),
         static_folder=str(Path(__file__).parent / "static"),
     )
+    app.json = _OrjsonProvider(app)
 
-    # Initialize services (connections established on first use or via init)
+    # Services; the stores connect below, before the app serves a request
     app.config['STATE_STORE'] = SqliteStateStore(path=state_db_path)
     app.config['EVENT_STORE'] = SqliteEventStore(path=events_db_path)
     app.config['EVENT_QUERY'] = SqliteEventQuery(
@@ -67,23 +199,66 @@ def create_app(
         app.config['EVENT_QUERY']
     )
     app.config['COMMANDER'] = commander or MockCommander()
-
-    # Note: Stores will initialize lazily on first use within each request's
-    # event loop. This avoids event loop conflicts with asyncio.run() in views.
+    # Callables shutdown_app runs first, before the stores close
+    app.config['SHUTDOWN_HOOKS'] = []
+
+    # One long-lived loop on a background thread serves every request, so
+    # views don't build (and tear down) a loop and store locks per call
+    loop, loop_thread = _start_loop()
+    app.config['LOOP'] = loop
+    app.config['LOOP_THREAD'] = loop_thread
+
+    def _run(coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the app loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    def _template(name: str):
+        """Look up a preloaded template, skipping the loader's checks"""
+        template = app.config['TPL'].get(name)
+        if template is None or app.jinja_env.auto_reload:
+            template = app.jinja_env.get_template(name)
+        return template
+
+    def _render_template(name: str, **context: Any) -> str:
+        """Render a preloaded template with the app's context processors"""
+        app.update_template_context(context)
+        return _template(name).render(context)
+
+    def _stream_template(name: str, **context: Any) -> Response:
+        """Stream a rendered template so the first rows go out early.
+
+        Output is buffered into ~32-event chunks rather than flushed after
+        every template fragment.
+        """
+        app.update_template_context(context)
+        stream = _template(name).stream(context)
+        stream.enable_buffering(32)
+        return Response(stream_with_context(stream), mimetype="text/html")
+
+    _run(_initialize_stores(app))
+    _run(_refresh_stats(app))
+    app.config['STATS_TASK'] = asyncio.run_coroutine_threadsafe(
+        _refresh_stats_forever(app, stats_refresh_interval), loop
+    )
+    # SSE clients wait on hub queues; ingest feeds them via SsePublisher
+    app.config['SSE_HUB'] = hub = SseHub(loop)
+    app.config['SSE_KEEPALIVE_TASK'] = asyncio.run_coroutine_threadsafe(
+        hub.keepalive(30.0), loop
+    )
 
     # ==================== Dashboard Routes ====================
 
     @app.route("/")
     def index():
         """Main dashboard page"""
-        return render_template("index.html")
+        return _render_template("index.html")
 
     @app.route("/nodes")
     def nodes_table():
         """HTMX endpoint - returns just the nodes table HTML"""
         state_store = app.config['STATE_STORE']
-        nodes = asyncio.run(state_store.list_nodes())
-        return render_template(
+        nodes = _run(state_store.list_nodes())
+        return _stream_template(
             "nodes_table.html",
             nodes=nodes,
             now=datetime.now(timezone.utc)
@@ -92,22 +267,27 @@ def create_app(
     @app.route("/stats")
     def stats():
         """HTMX endpoint - returns stats summary"""
-        state_store = app.config['STATE_STORE']
-        nodes = asyncio.run(state_store.list_nodes())
-
-        total_nodes = len(nodes)
-        now = datetime.now(timezone.utc)
-        active_nodes = sum(
-            1 for n in nodes
-            if (now - n.last_seen).total_seconds() < 300
+        cache = app.config['STATS_CACHE']
+        return _render_template(
+            "stats.html",
+            total_nodes=cache["total_nodes"],
+            active_nodes=cache["active_nodes"],
+            total_events=cache["total_events"],
         )
-        total_events = sum(n.event_count for n in nodes)
 
-        return render_template(
-            "stats.html",
-            total_nodes=total_nodes,
-            active_nodes=active_nodes,
-            total_events=total_events,
+    @app.route("/api/dashboard")
+    def dashboard_refresh():
+        """HTMX endpoint - stats and nodes table as out-of-band swaps
+
+        One poll and one list_nodes() call refresh both dashboard panels.
+        """
+        nodes = _run(app.config['STATE_STORE'].list_nodes())
+        now = datetime.now(timezone.utc)
+        return _render_template(
+            "dashboard.html",
+            nodes=nodes,
+            now=now,
+            **_node_stats(nodes, now),
         )
 
     # ==================== Message Routes ====================
@@ -116,7 +296,7 @@ def create_app(
     def messages_page():
         """Message history page"""
         node_id = request.args.get('node_id')
-        return render_template("messages.html", node_id=node_id)
+        return _render_template("messages.html", node_id=node_id)
 
     @app.route("/messages/list")
     def messages_list():
@@ -129,31 +309,31 @@ def create_app(
         limit = int(request.args.get('limit', 100))
 
         if search:
-            messages = asyncio.run(
+            messages = _run(
                 msg_service.search_messages(search, limit)
             )
         elif node_id:
-            messages = asyncio.run(
+            messages = _run(
                 msg_service.get_messages_by_node(node_id, limit)
             )
         else:
-            messages = asyncio.run(msg_service.get_recent_messages(limit))
+            messages = _run(msg_service.get_recent_messages(limit))
 
-        return render_template("messages_list.html", messages=messages)
+        return _stream_template("messages_list.html", messages=messages)
 
     @app.route("/api/messages")
     def api_messages():
         """JSON API for messages"""
         msg_service = app.config['MESSAGE_SERVICE']
-        messages = asyncio.run(msg_service.get_recent_messages(limit=100))
+        messages = _run(msg_service.get_recent_messages(limit=100))
 
-        return jsonify([
+        return _json_response([
             {
-                "id": str(msg.id),
+                "id": msg.id,
                 "from": msg.from_node,
                 "to": msg.to_node,
                 "text": msg.text,
-                "timestamp": msg.timestamp.isoformat(),
+                "timestamp": msg.timestamp,
                 "channel": msg.channel,
                 "encrypted": msg.encrypted,
             }
@@ -166,8 +346,8 @@ def create_app(
     def compose_page():
         """Message composition page"""
         state_store = app.config['STATE_STORE']
-        nodes = asyncio.run(state_store.list_nodes())
-        return render_template("compose.html", nodes=nodes)
+        nodes = _run(state_store.list_nodes())
+        return _render_template("compose.html", nodes=nodes)
 
     @app.route("/api/send_message", methods=["POST"])
     def send_message():
@@ -180,7 +360,7 @@ def create_app(
         channel = int(request.form.get('channel', 0))
 
         if not text:
-            return render_template(
+            return _render_template(
                 "send_result.html",
                 success=False,
                 message="Message cannot be empty"
@@ -190,12 +370,12 @@ def create_app(
         if destination == 'broadcast':
             destination = None
 
-        result = asyncio.run(commander.send_text(text, destination, channel))
+        result = _run(commander.send_text(text, destination, channel))
 
         # Persist sent message so ACK status can be tracked.
         if result.success:
             try:
-                asyncio.run(state_store.store_sent_message(
+                _run(state_store.store_sent_message(
                     packet_id=result.packet_id,
                     text=text,
                     destination=destination or "broadcast",
@@ -207,7 +387,7 @@ def create_app(
                     f"Failed to store sent message: {store_err}", exc_info=True
                 )
 
-        return render_template(
+        return _render_template(
             "send_result.html",
             success=result.success,
             message=result.message,
@@ -218,22 +398,22 @@ def create_app(
     def sent_messages_page():
         """Sent messages with ACK status (HTMX partial)"""
         state_store = app.config['STATE_STORE']
-        messages = asyncio.run(state_store.get_sent_messages(limit=100))
-        return render_template("sent_messages.html", messages=messages)
+        messages = _run(state_store.get_sent_messages(limit=100))
+        return _render_template("sent_messages.html", messages=messages)
 
     @app.route("/api/messages/sent")
     def api_sent_messages():
         """JSON API for sent messages"""
         state_store = app.config['STATE_STORE']
-        messages = asyncio.run(state_store.get_sent_messages(limit=100))
-        return jsonify([
+        messages = _run(state_store.get_sent_messages(limit=100))
+        return _json_response([
             {
                 "packet_id": m["packet_id"],
                 "text": m["text"],
                 "destination": m["destination"],
                 "channel": m["channel"],
-                "sent_at": m["sent_at"].isoformat(),
-                "ack_at": m["ack_at"].isoformat() if m["ack_at"] else None,
+                "sent_at": m["sent_at"],
+                "ack_at": m["ack_at"],
                 "ack_from": m["ack_from"],
                 "error_reason": m["error_reason"],
             }
@@ -245,7 +425,7 @@ def create_app(
     @app.route("/telemetry/<node_id>")
     def telemetry_page(node_id: str):
         """Telemetry dashboard for a specific node"""
-        return render_template("telemetry.html", node_id=node_id)
+        return _render_template("telemetry.html", node_id=node_id)
 
     @app.route("/api/telemetry/<node_id>/<metric>")
     def api_telemetry_metric(node_id: str, metric: str):
@@ -255,20 +435,15 @@ def create_app(
         hours = int(request.args.get('hours', 24))
         since = datetime.now(timezone.utc) - timedelta(hours=hours)
 
-        data_points = asyncio.run(
+        data_points = _run(
             telemetry_service.get_time_series(node_id, metric, since)
         )
 
-        return jsonify({
+        # DataPoint dataclasses serialize as {"timestamp", "value"} as-is
+        return _json_response({
             "metric": metric,
             "node_id": node_id,
-            "data": [
-                {
-                    "timestamp": dp.timestamp.isoformat(),
-                    "value": dp.value,
-                }
-                for dp in data_points
-            ]
+            "data": data_points,
         })
 
     @app.route("/api/telemetry/<node_id>/all")
@@ -279,20 +454,11 @@ def create_app(
         hours = int(request.args.get('hours', 24))
         since = datetime.now(timezone.utc) - timedelta(hours=hours)
 
-        metrics = asyncio.run(
+        metrics = _run(
             telemetry_service.get_all_metrics(node_id, since)
         )
 
-        return jsonify({
-            metric_name: [
-                {
-                    "timestamp": dp.timestamp.isoformat(),
-                    "value": dp.value,
-                }
-                for dp in data_points
-            ]
-            for metric_name, data_points in metrics.items()
-        })
+        return _json_response(metrics)
 
     # ==================== Node Details Route ====================
 
@@ -302,18 +468,16 @@ def create_app(
         state_store = app.config['STATE_STORE']
         msg_service = app.config['MESSAGE_SERVICE']
 
-        from meshcore.domain.models import NodeId
-        node_state = asyncio.run(state_store.get_node(NodeId(value=node_id)))
+        # Fetch the node and its recent messages concurrently
+        node_state, messages = _run(_gather(
+            state_store.get_node(node_id),
+            msg_service.get_messages_by_node(node_id, limit=20),
+        ))
 
         if not node_state:
             return "Node not found", 404
 
-        # Get recent messages from this node
-        messages = asyncio.run(
-            msg_service.get_messages_by_node(node_id, limit=20)
-        )
-
-        return render_template(
+        return _render_template(
             "node_details.html",
             node=node_state,
             messages=messages
@@ -324,35 +488,13 @@ def create_app(
     @app.route("/analytics")
     def analytics_page():
         """Analytics dashboard"""
-        state_store = app.config['STATE_STORE']
-        msg_service = app.config['MESSAGE_SERVICE']
-
-        nodes = asyncio.run(state_store.list_nodes())
-        messages = asyncio.run(msg_service.get_recent_messages(limit=1000))
-
-        # Calculate statistics
-        total_messages = len(messages)
-        now = datetime.now(timezone.utc)
-        messages_24h = len([
-            m for m in messages
-            if (now - m.timestamp).total_seconds() < 86400
-        ])
-
-        # Messages per node
-        msg_counts = {}
-        for msg in messages:
-            msg_counts[msg.from_node] = msg_counts.get(msg.from_node, 0) + 1
-
-        top_senders = sorted(
-            msg_counts.items(), key=lambda x: x[1], reverse=True
-        )[:10]
-
-        return render_template(
+        cache = app.config['STATS_CACHE']
+        return _stream_template(
             "analytics.html",
-            nodes=nodes,
-            total_messages=total_messages,
-            messages_24h=messages_24h,
-            top_senders=top_senders
+            nodes=cache["nodes"],
+            total_messages=cache["total_messages"],
+            messages_24h=cache["messages_24h"],
+            top_senders=cache["top_senders"],
         )
 
     # ==================== SSE Route ====================
@@ -361,17 +503,17 @@ def create_app(
     def stream_events():
         """Server-Sent Events stream for real-time updates"""
         def event_stream():
-            # Send initial connection message
-            msg = "Connected to event stream"
-            yield f"data: {{'type': 'connected', 'message': '{msg}'}}\n\n"
-
-            # In a real implementation, subscribe to MQTT or events
-            # For now, we'll send periodic keepalives
-            import time
-            while True:
-                time.sleep(30)
-                ts = datetime.now(timezone.utc).isoformat()
-                yield f"data: {{'type': 'keepalive', 'timestamp': '{ts}'}}\n\n"
+            queue = _run(hub.register())
+            try:
+                msg = "Connected to event stream"
+                yield (
+                    f'data: {{"type": "connected", "message": "{msg}"}}\n\n'
+                )
+                # Events and the shared keepalive both arrive on the queue
+                while True:
+                    yield f"data: {_run(queue.get())}\n\n"
+            finally:
+                hub.unregister(queue)
 
         return Response(event_stream(), mimetype="text/event-stream")
 
@@ -381,14 +523,14 @@ def create_app(
     def api_nodes():
         """JSON API endpoint for nodes"""
         state_store = app.config['STATE_STORE']
-        nodes = asyncio.run(state_store.list_nodes())
-        return jsonify([
+        nodes = _run(state_store.list_nodes())
+        return _json_response([
             {
-                "node_id": node.node_id.value,
+                "node_id": node.node_id,
                 "long_name": node.long_name,
                 "short_name": node.short_name,
-                "last_seen": node.last_seen.isoformat(),
-                "first_seen": node.first_seen.isoformat(),
+                "last_seen": node.last_seen,
+                "first_seen": node.first_seen,
                 "event_count": node.event_count,
                 "last_telemetry": node.last_telemetry,
                 "last_position": node.last_position,
@@ -401,24 +543,22 @@ def create_app(
 
     # ==================== Template Filters ====================
 
+    @app.context_processor
+    def inject_now() -> dict:
+        """One 'now' per render, shared by every row's filters"""
+        return {"now": datetime.now(timezone.utc)}
+
+    def _render_now(context) -> datetime:
+        return context.get("now") or datetime.now(timezone.utc)
+
     @app.template_filter("timeago")
-    def timeago_filter(dt: datetime) -> str:
+    @pass_context
+    def timeago_filter(context, dt: datetime) -> str:
         """Convert datetime to relative time ago"""
         if not dt:
             return "Never"
-
-        now = datetime.now(timezone.utc)
-        diff = now - dt
-
-        seconds = diff.total_seconds()
-        if seconds < 60:
-            return f"{int(seconds)}s ago"
-        elif seconds < 3600:
-            return f"{int(seconds / 60)}m ago"
-        elif seconds < 86400:
-            return f"{int(seconds / 3600)}h ago"
-        else:
-            return f"{int(seconds / 86400)}d ago"
+        age = (_render_now(context) - dt).total_seconds()
+        return _timeago(int(age) // _TIMEAGO_BUCKET)
 
     @app.template_filter("format_datetime")
     def format_datetime(dt: datetime) -> str:
@@ -468,18 +608,16 @@ def create_app(
         return text[:length] + "..."
 
     @app.template_filter("status_class")
-    def status_class(last_seen: datetime) -> str:
+    @pass_context
+    def status_class(context, last_seen: datetime) -> str:
         """Return CSS class based on how recent the last seen time is"""
-        now = datetime.now(timezone.utc)
-        diff = (now - last_seen).total_seconds()
-
-        if diff < 60:
-            return "status-active"
-        elif diff < 300:
-            return "status-recent"
-        elif diff < 3600:
-            return "status-idle"
-        else:
-            return "status-offline"
+        diff = (_render_now(context) - last_seen).total_seconds()
+        return _STATUS_CLASSES[bisect_right(_STATUS_BOUNDS, diff)]
+
+    # Compile every template once now that all filters are registered
+    app.config['TPL'] = {
+        name: app.jinja_env.get_template(name)
+        for name in app.jinja_env.list_templates(extensions=["html"])
+    }
 
     return app
@@ -1,9 +1,66 @@
 """Custom widgets for the TUI"""
 
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import NamedTuple
 
 from textual.widgets import DataTable, Static
 
+from meshcore.domain.models import NodeState
+
+
+class NodeRow(NamedTuple):
+    """One node table row, formatted and ready to render"""
+
+    node_id: str
+    last_seen: str
+    events: str
+    battery: str
+    temp: str
+    position: str
+    last_text: str
+
+
+def format_time_ago(timestamp: datetime, now: datetime) -> str:
+    seconds = (now - timestamp).total_seconds()
+    if seconds < 60:
+        return f"{int(seconds)}s ago"
+    elif seconds < 3600:
+        return f"{int(seconds / 60)}m ago"
+    elif seconds < 86400:
+        return f"{int(seconds / 3600)}h ago"
+    else:
+        return f"{int(seconds / 86400)}d ago"
+
+
+def nodes_for_display(nodes: list[NodeState]) -> list[NodeRow]:
+    """Format node states into table rows.
+
+    Pure and thread-safe, so the TUI can run it off the UI loop.
+    """
+    now = datetime.now(timezone.utc)
+    rows = []
+    for node in nodes:
+        battery = ""
+        temp = ""
+        if node.last_telemetry:
+            battery = f"{node.last_telemetry.get('battery', 'N/A')}"
+            temp = f"{node.last_telemetry.get('temperature', 'N/A')}"
+        position = ""
+        if node.last_position:
+            lat = node.last_position.get('lat', 0)
+            lon = node.last_position.get('lon', 0)
+            position = f"{lat:.4f}, {lon:.4f}"
+        rows.append(NodeRow(
+            node.node_id,
+            format_time_ago(node.last_seen, now),
+            str(node.event_count),
+            battery,
+            temp,
+            position,
+            node.last_text or "",
+        ))
+    return rows
+
 
 class NodeTable(DataTable):
     """Data table showing node states"""
@@ -11,9 +68,13 @@ class NodeTable(DataTable):
     def __init__(self) -> None:
         super().__init__()
         self.cursor_type = "row"
+        # Rows last rendered per node, in row order, so refreshes only
+        # touch the cells that changed
+        self._rows: dict[str, NodeRow] = {}
+        self._column_keys: list = []
 
     def on_mount(self) -> None:
-        self.add_columns(
+        self._column_keys = self.add_columns(
             "Node ID",
             "Last Seen",
             "Events",
@@ -23,41 +84,35 @@ class NodeTable(DataTable):
             "Last Text",
         )
 
-    def update_nodes(self, nodes: list) -> None:
-        self.clear()
-        for node in nodes:
-            battery = ""
-            temp = ""
-            if node.last_telemetry:
-                battery = f"{node.last_telemetry.get('battery', 'N/A')}"
-                temp = f"{node.last_telemetry.get('temperature', 'N/A')}"
-            position = ""
-            if node.last_position:
-                lat = node.last_position.get('lat', 0)
-                lon = node.last_position.get('lon', 0)
-                position = f"{lat:.4f}, {lon:.4f}"
-            last_seen = self._format_time_ago(node.last_seen)
-            self.add_row(
-                node.node_id.value,
-                last_seen,
-                str(node.event_count),
-                battery,
-                temp,
-                position,
-                node.last_text or "",
-            )
-
-    def _format_time_ago(self, timestamp: datetime) -> str:
-        now = datetime.now(timestamp.tzinfo)
-        delta = now - timestamp
-        if delta.total_seconds() < 60:
-            return f"{int(delta.total_seconds())}s ago"
-        elif delta.total_seconds() < 3600:
-            return f"{int(delta.total_seconds() / 60)}m ago"
-        elif delta.total_seconds() < 86400:
-            return f"{int(delta.total_seconds() / 3600)}h ago"
-        else:
-            return f"{int(delta.total_seconds() / 86400)}d ago"
+    def update_nodes(self, rows: list[NodeRow]) -> None:
+        """Show rows built by nodes_for_display
+
+        Rows are keyed by node ID: changed cells are updated in place, new
+        nodes added and gone ones removed. Since rows come newest first,
+        any node's traffic reorders them; that is applied with one sort
+        of the existing rows rather than a rebuild.
+        """
+        by_node = {row.node_id: row for row in rows}
+        previous = self._rows
+        for node_id in previous.keys() - by_node.keys():
+            self.remove_row(node_id)
+        added = []
+        for node_id, row in by_node.items():
+            old = previous.get(node_id)
+            if old is None:
+                self.add_row(*row, key=node_id)
+                added.append(node_id)
+                continue
+            for column_key, value, before in zip(self._column_keys, row, old):
+                if value != before:
+                    self.update_cell(node_id, column_key, value)
+        # Kept rows hold their last order and new ones go at the end
+        shown = [node_id for node_id in previous if node_id in by_node]
+        if shown + added != list(by_node):
+            order = {node_id: i for i, node_id in enumerate(by_node)}
+            # The Node ID column holds each row's key
+            self.sort(self._column_keys[0], key=order.__getitem__)
+        self._rows = by_node
 
 
 class StatusBar(Static):
@@ -0,0 +1,44 @@
+"""Correlation IDs for log records, carried in a context variable"""
+
+import logging
+from contextvars import ContextVar
+from typing import Optional
+
+from meshcore.domain.models import MeshEvent
+
+# The event being handled; its ID string is only formatted when a record
+# is actually emitted, so setting this per event costs no str(UUID)
+current_event: ContextVar[Optional[MeshEvent]] = ContextVar(
+    "current_event", default=None
+)
+
+
+class CorrelationFilter(logging.Filter):
+    """Stamp records with the current event's ID as correlation_id"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "correlation_id"):
+            event = current_event.get()
+            record.correlation_id = (
+                event.event_id_str() if event is not None else "-"
+            )
+        return True
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Set up console logging with correlation IDs for an entry point"""
+    logging.basicConfig(
+        level=level,
+        format=(
+            "%(asctime)s - %(name)s - %(levelname)s - "
+            "[%(correlation_id)s] %(message)s"
+        ),
+    )
+    install_correlation_filter()
+
+
+def install_correlation_filter() -> None:
+    """Add a CorrelationFilter to every handler on the root logger"""
+    correlation_filter = CorrelationFilter()
+    for handler in logging.getLogger().handlers:
+        handler.addFilter(correlation_filter)
@@ -1,23 +1,39 @@
 """Message query service"""
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from uuid import UUID
 
 from meshcore.application.ports import EventQueryPort
 from meshcore.domain.models import MeshEvent
 
 
+@dataclass(slots=True)
 class Message:
     """Message view model"""
 
-    def __init__(self, event: MeshEvent):
-        self.id = event.event_id.value
-        self.from_node = event.node_id.value
-        self.text = event.payload.get("text", "")
-        self.timestamp = event.timestamp
-        self.to_node = event.payload.get("to", None)
-        self.channel = event.payload.get("channel", 0)
-        self.encrypted = event.payload.get("encrypted", False)
+    id: UUID
+    from_node: str
+    text: str
+    timestamp: datetime
+    to_node: Optional[str]
+    channel: int
+    encrypted: bool
+
+    @classmethod
+    def from_event(cls, event: MeshEvent) -> "Message":
+        """Build a message from a text event"""
+        get = event.payload.get
+        return cls(
+            event.event_id,
+            event.node_id,
+            get("text", ""),
+            event.timestamp,
+            get("to"),
+            get("channel", 0),
+            get("encrypted", False),
+        )
 
 
 class MessageQueryService:
@@ -40,7 +56,25 @@ class MessageQueryService:
             since=since,
             limit=limit,
         )
-        return [Message(event) for event in events]
+        return list(map(Message.from_event, events))
+
+    async def count_messages(self, since: Optional[datetime] = None) -> int:
+        """Count text messages, over the last 7 days by default"""
+        if since is None:
+            since = datetime.now(timezone.utc) - timedelta(days=7)
+        return await self._event_query.count_by_type("text", since=since)
+
+    async def top_senders(
+        self,
+        limit: int = 10,
+        since: Optional[datetime] = None,
+    ) -> list[tuple[str, int]]:
+        """Nodes that sent the most text messages, as (node_id, count)"""
+        if since is None:
+            since = datetime.now(timezone.utc) - timedelta(days=7)
+        return await self._event_query.top_nodes_by_type(
+            "text", since=since, limit=limit
+        )
 
     async def get_messages_by_node(
         self,
@@ -55,7 +89,7 @@ class MessageQueryService:
             since=since,
             limit=limit,
         )
-        return [Message(event) for event in events]
+        return list(map(Message.from_event, events))
 
     async def search_messages(
         self,
@@ -64,7 +98,7 @@ class MessageQueryService:
     ) -> list[Message]:
         """Search messages by text content"""
         events = await self._event_query.search_messages(query, limit)
-        return [Message(event) for event in events]
+        return list(map(Message.from_event, events))
 
     async def get_conversation(
         self,
@@ -73,23 +107,8 @@ class MessageQueryService:
         limit: int = 100,
     ) -> list[Message]:
         """Get messages between two nodes"""
-        # Get messages from both nodes
         since = datetime.now(timezone.utc) - timedelta(days=30)
-        events_a = await self._event_query.query_by_type(
-            event_type="text",
-            node_id=node_a,
-            since=since,
-            limit=limit,
-        )
-        events_b = await self._event_query.query_by_type(
-            event_type="text",
-            node_id=node_b,
-            since=since,
-            limit=limit,
+        events = await self._event_query.query_conversation(
+            node_a, node_b, since=since, limit=limit
         )
-
-        # Combine and sort by timestamp
-        all_events = events_a + events_b
-        all_events.sort(key=lambda e: e.timestamp, reverse=True)
-
-        return [Message(event) for event in all_events[:limit]]
+        return list(map(Message.from_event, events))
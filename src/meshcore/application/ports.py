@@ -2,7 +2,7 @@
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import AsyncIterator, Optional, Protocol
+from typing import AsyncIterator, Optional, Protocol, Sequence
 from uuid import UUID
 
 from meshcore.domain.models import MeshEvent, NodeId, NodeState
@@ -21,6 +21,8 @@ class CommandResult:
 class EventSource(Protocol):
     """Interface for an event source"""
 
+    __slots__ = ()
+
     async def events(self) -> AsyncIterator[MeshEvent]:
         """Produces MeshEvents from some external system"""
 
@@ -40,6 +42,12 @@ class EventStore(Protocol):
         Returns True if inserted, False if duplicate.
         """
 
+    async def append_many(self, events: Sequence[MeshEvent]) -> list[bool]:
+        """Append several events in one write.
+
+        Returns one flag per event, True if inserted, False if duplicate.
+        """
+
     async def replay(
         self, since: Optional[datetime], until: Optional[datetime]
     ) -> AsyncIterator[MeshEvent]: ...
@@ -71,6 +79,37 @@ class EventQueryPort(Protocol):
     ) -> list[MeshEvent]:
         """Get telemetry events for a node as time series"""
 
+    async def get_metric_series(
+        self,
+        node_id: str,
+        metric: str,
+        since: datetime,
+        limit: int = 1000,
+    ) -> list[tuple[datetime, float]]:
+        """(timestamp, value) points of one numeric telemetry metric"""
+
+    async def get_all_metric_series(
+        self,
+        node_id: str,
+        since: datetime,
+        limit: int = 1000,
+    ) -> list[tuple[datetime, str, float]]:
+        """(timestamp, metric, value) for every numeric metric of the first
+        limit telemetry events"""
+
+    async def get_telemetry_stats(
+        self,
+        node_id: str,
+        metric: str,
+        since: datetime,
+    ) -> tuple[
+        Optional[float], Optional[float], Optional[float], Optional[float], int
+    ]:
+        """Aggregate a numeric telemetry metric for a node.
+
+        Returns (min, max, mean, latest value, number of values).
+        """
+
     async def search_messages(
         self,
         search_term: str,
@@ -78,6 +117,30 @@ class EventQueryPort(Protocol):
     ) -> list[MeshEvent]:
         """Search text messages"""
 
+    async def query_conversation(
+        self,
+        node_a: str,
+        node_b: str,
+        since: Optional[datetime] = None,
+        limit: int = 100,
+    ) -> list[MeshEvent]:
+        """Text messages sent by either node, newest first"""
+
+    async def count_by_type(
+        self,
+        event_type: str,
+        since: Optional[datetime] = None,
+    ) -> int:
+        """Count events of a type without fetching them"""
+
+    async def top_nodes_by_type(
+        self,
+        event_type: str,
+        since: Optional[datetime] = None,
+        limit: int = 10,
+    ) -> list[tuple[str, int]]:
+        """Nodes with the most events of a type, as (node_id, count)"""
+
 
 class MeshInputPort(Protocol):
     """Interface for the mesh input port"""
@@ -88,6 +151,8 @@ class MeshInputPort(Protocol):
 class MeshCommandPort(Protocol):
     """Interface for sending commands to the mesh network"""
 
+    __slots__ = ()
+
     async def send_text(
         self,
         text: str,
@@ -110,7 +175,10 @@ class StateStore(Protocol):
     """Interface for storing and querying node state"""
 
     async def upsert_node(self, state: NodeState) -> None: ...
+    async def upsert_nodes(self, states: Sequence[NodeState]) -> None: ...
     async def get_node(self, node_id: NodeId) -> Optional[NodeState]: ...
-    async def list_nodes(self) -> list[NodeState]: ...
+    async def list_nodes(
+        self, limit: Optional[int] = None
+    ) -> list[NodeState]: ...
     async def delete_node(self, node_id: NodeId) -> None: ...
     async def close(self) -> None: ...
@@ -2,14 +2,31 @@
 
 import asyncio
 import logging
+import random
 from typing import Optional
 
+from meshcore.application.correlation import current_event
 from meshcore.application.ports import EventPublisher, EventSource, EventStore
 from meshcore.application.state_projection import StateProjection
 from meshcore.domain.models import MeshEvent
 
 logger = logging.getLogger(__name__)
 
+# Errors an event brings with it, e.g. a payload orjson can't encode.
+# Retrying the same batch can't fix them, so the batch is split instead
+# and only the offending event is dropped
+_EVENT_ERRORS = (TypeError, ValueError)
+
+
+def _drain(queue: "asyncio.Queue[Optional[MeshEvent]]") -> list:
+    """Everything currently waiting in the queue, without blocking"""
+    items = []
+    while True:
+        try:
+            items.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            return items
+
 
 class MeshEventService:
     """Service for handling mesh events with error recovery"""
@@ -22,6 +39,10 @@ class MeshEventService:
         state_projection: Optional[StateProjection] = None,
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        batch_size: int = 64,
+        batch_max_delay: float = 0.005,
+        max_retry_delay: float = 30.0,
+        max_pending: int = 1024,
     ) -> None:
         self._source = source
         self._store = store
@@ -29,44 +50,41 @@ class MeshEventService:
         self._state_projection = state_projection
         self._max_retries = max_retries
         self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._batch_size = max(1, batch_size)
+        self._batch_max_delay = batch_max_delay
+        self._max_pending = max(self._batch_size, max_pending)
         self._processed_count = 0
         self._error_count = 0
         self._duplicate_count = 0
 
     async def run(self) -> None:
-        """Main event processing loop with error handling"""
+        """Main event processing loop with error handling
+
+        A reader task drains the source into a queue; this loop takes up
+        to batch_size events at a time, waiting at most batch_max_delay
+        for a partial batch to fill, and writes each batch in one go.
+        The queue holds at most max_pending events, so while the store is
+        failing and being retried the source is paused rather than
+        buffered without limit.
+        """
         logger.info("MeshEventService starting...")
+        pending: asyncio.Queue[Optional[MeshEvent]] = asyncio.Queue(
+            maxsize=self._max_pending
+        )
+        reader = asyncio.create_task(self._read_source(pending))
         try:
-            event: MeshEvent
-            async for event in self._source.events():
-                correlation_id = str(event.event_id.value)
-                try:
-                    was_processed = await self._process_event_with_retry(event, correlation_id)
-                    if was_processed:
-                        self._processed_count += 1
-                        if self._processed_count % 100 == 0:
-                            logger.info(
-                                f"Processed {self._processed_count} events "
-                                f"(errors: {self._error_count}, "
-                                f"duplicates: {self._duplicate_count})"
-                            )
-                    else:
-                        self._duplicate_count += 1
-                        logger.debug(
-                            f"Skipping duplicate event from "
-                            f"{event.node_id.value}",
-                            extra={"correlation_id": correlation_id}
-                        )
-                except Exception as e:
-                    self._error_count += 1
-                    logger.error(
-                        f"Fatal error processing event "
-                        f"{event.event_id.value}: {e}",
-                        extra={"correlation_id": correlation_id},
-                        exc_info=True
-                    )
+            while (batch := await self._next_batch(pending)) is not None:
+                await self._handle_batch(batch)
+            # Surface any error that ended the source
+            await reader
         except asyncio.CancelledError:
             logger.info("MeshEventService shutdown requested")
+            reader.cancel()
+            # Events already taken off the source shouldn't be dropped
+            leftover = [e for e in _drain(pending) if e is not None]
+            if leftover:
+                await self._handle_batch(leftover)
             logger.info(
                 f"Final stats - Processed: {self._processed_count}, "
                 f"Errors: {self._error_count}, "
@@ -74,54 +92,166 @@ class MeshEventService:
             )
             raise
         except Exception as e:
+            reader.cancel()
             logger.error(
                 f"Fatal error in MeshEventService: {e}", exc_info=True
             )
             raise
 
-    async def _process_event_with_retry(
-        self, event: MeshEvent, correlation_id: str
-    ) -> bool:
-        """Process a single event with retry logic
+    async def _read_source(
+        self, pending: "asyncio.Queue[Optional[MeshEvent]]"
+    ) -> None:
+        """Feed source events into the queue, then None when it runs dry"""
+        try:
+            async for event in self._source.events():
+                await pending.put(event)
+        finally:
+            await pending.put(None)
+
+    async def _next_batch(
+        self, pending: "asyncio.Queue[Optional[MeshEvent]]"
+    ) -> Optional[list[MeshEvent]]:
+        """Up to batch_size events, or None once the source has ended"""
+        first = await pending.get()
+        if first is None:
+            return None
+        batch = [first]
+        for attempt in range(2):
+            while len(batch) < self._batch_size:
+                try:
+                    event = pending.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if event is None:
+                    # Put the end marker back for the next call
+                    pending.put_nowait(None)
+                    return batch
+                batch.append(event)
+            if len(batch) >= self._batch_size or attempt:
+                break
+            # Give a burst a moment to land in this batch
+            await asyncio.sleep(self._batch_max_delay)
+        return batch
+
+    async def _handle_batch(self, batch: list[MeshEvent]) -> None:
+        """Process a batch, keeping the counters and progress log"""
+        # Batch-level records correlate with the batch's first event
+        token = current_event.set(batch[0])
+        try:
+            inserted = await self._process_batch_with_retry(batch)
+        except Exception as e:
+            self._error_count += len(batch)
+            logger.error(
+                f"Fatal error processing batch of {len(batch)} event(s) "
+                f"starting at {batch[0].event_id}: {e}",
+                exc_info=True
+            )
+            return
+        finally:
+            current_event.reset(token)
+        before = self._processed_count
+        new_count = inserted.count(True)
+        duplicates = inserted.count(False)
+        self._processed_count += new_count
+        self._duplicate_count += duplicates
+        self._error_count += len(batch) - new_count - duplicates
+        if duplicates and logger.isEnabledFor(logging.DEBUG):
+            for event, was_processed in zip(batch, inserted):
+                if was_processed is False:
+                    token = current_event.set(event)
+                    logger.debug(
+                        "Skipping duplicate event from %s", event.node_id
+                    )
+                    current_event.reset(token)
+        if self._processed_count // 100 > before // 100:
+            logger.info(
+                "Processed %d events (errors: %d, duplicates: %d)",
+                self._processed_count, self._error_count,
+                self._duplicate_count
+            )
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential delay before retry attempt + 1, with +/-50% jitter"""
+        delay = min(self._max_retry_delay, self._retry_delay * 2 ** attempt)
+        return delay * (0.5 + random.random())
+
+    async def _process_batch_with_retry(
+        self, batch: list[MeshEvent]
+    ) -> list[Optional[bool]]:
+        """Store, project and publish a batch of events with retry logic
+
+        Failures are retried with backoff, except errors the events
+        themselves cause (see _EVENT_ERRORS): those split the batch so
+        the good events still go through.
 
         Returns:
-            True if event was processed (inserted), False if duplicate
+            One flag per event, True if it was processed (inserted), False
+            if it was a duplicate, None if it was dropped as bad
         """
         for attempt in range(self._max_retries):
             try:
-                was_inserted = await self._store.append(event)
+                inserted = await self._store.append_many(batch)
+                new_events = [
+                    event for event, ok in zip(batch, inserted) if ok
+                ]
 
-                # If it was a duplicate, return early
-                if not was_inserted:
-                    return False
-
-                # Process the new event
+                # Process the new events
                 if self._state_projection:
-                    await self._state_projection.project(event)
-                try:
-                    await self._publisher.publish(event)
-                except Exception as pub_error:
-                    logger.warning(
-                        f"Failed to publish event, continuing: {pub_error}",
-                        extra={"correlation_id": correlation_id}
-                    )
-                logger.debug(
-                    f"Successfully processed {event.event_type} from "
-                    f"{event.node_id.value}",
-                    extra={"correlation_id": correlation_id}
+                    await self._state_projection.project_many(new_events)
+                debug = logger.isEnabledFor(logging.DEBUG)
+                for event in new_events:
+                    token = current_event.set(event)
+                    try:
+                        await self._publisher.publish(event)
+                    except Exception as pub_error:
+                        logger.warning(
+                            "Failed to publish event, continuing: %s",
+                            pub_error
+                        )
+                    if debug:
+                        logger.debug(
+                            "Successfully processed %s from %s",
+                            event.event_type, event.node_id
+                        )
+                    current_event.reset(token)
+                return inserted
+            except _EVENT_ERRORS as e:
+                if len(batch) == 1:
+                    raise
+                logger.warning(
+                    "Batch of %d event(s) rejected, retrying one by one: %s",
+                    len(batch), e
                 )
-                return True
+                return await self._process_one_by_one(batch)
             except Exception as e:
                 if attempt < self._max_retries - 1:
                     logger.warning(
-                        f"Attempt {attempt + 1} failed, retrying: {e}",
-                        extra={"correlation_id": correlation_id}
+                        f"Attempt {attempt + 1} failed, retrying: {e}"
                     )
-                    await asyncio.sleep(self._retry_delay * (attempt + 1))
+                    await asyncio.sleep(self._backoff(attempt))
                 else:
                     logger.error(
-                        f"All retry attempts exhausted for event: {e}",
-                        extra={"correlation_id": correlation_id}
+                        f"All retry attempts exhausted for batch: {e}"
                     )
                     raise
-        return False
+        return [False] * len(batch)
+
+    async def _process_one_by_one(
+        self, batch: list[MeshEvent]
+    ) -> list[Optional[bool]]:
+        """Process each event on its own, dropping the ones that fail"""
+        inserted: list[Optional[bool]] = []
+        for event in batch:
+            token = current_event.set(event)
+            try:
+                inserted.extend(await self._process_batch_with_retry([event]))
+            except Exception as e:
+                logger.error(
+                    f"Dropping event {event.event_id} from {event.node_id}: "
+                    f"{e}",
+                    exc_info=True
+                )
+                inserted.append(None)
+            finally:
+                current_event.reset(token)
+        return inserted
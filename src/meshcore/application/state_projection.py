@@ -1,82 +1,166 @@
 """State projection service"""
 
+from collections import OrderedDict, defaultdict
 from datetime import datetime
+from typing import Callable, Optional, Sequence
 
 from meshcore.application.ports import StateStore
 from meshcore.domain.models import MeshEvent, NodeId, NodeState
 
 
+def _apply_telemetry(state: NodeState, payload: dict) -> None:
+    state.last_telemetry = payload
+
+
+def _apply_position(state: NodeState, payload: dict) -> None:
+    state.last_position = payload
+
+
+def _apply_text(state: NodeState, payload: dict) -> None:
+    state.last_text = payload.get("text")
+
+
+def _apply_node_info(state: NodeState, payload: dict) -> None:
+    if payload.get("long_name"):
+        state.long_name = payload["long_name"]
+    if payload.get("short_name"):
+        state.short_name = payload["short_name"]
+
+
+# What each event type's payload sets on a node; one dict lookup per event
+# instead of a chain of string comparisons
+_PAYLOAD_APPLIERS: dict[str, Callable[[NodeState, dict], None]] = {
+    "telemetry": _apply_telemetry,
+    "position": _apply_position,
+    "text": _apply_text,
+    "node_info": _apply_node_info,
+}
+
+
 class StateProjection:
-    """Projects events into current state"""
+    """Projects events into current state
+
+    Recently projected states are kept in a bounded LRU cache, so steady
+    traffic from a node doesn't read its state back before every write.
+    This process is assumed to be the only writer of node states.
+    """
 
-    def __init__(self, state_store: StateStore) -> None:
+    def __init__(
+        self, state_store: StateStore, cache_size: int = 10_000
+    ) -> None:
         self._state_store = state_store
+        self._cache: OrderedDict[str, NodeState] = OrderedDict()
+        self._cache_size = cache_size
+
+    async def project_many(self, events: Sequence[MeshEvent]) -> None:
+        """Project a batch of events, writing each touched node once
+
+        Events are folded, in order, into a copy of each node's state, and
+        all the states are written with a single upsert_nodes call. The
+        cache only takes the new states once that write succeeds.
+        """
+        by_node: defaultdict[str, list[MeshEvent]] = defaultdict(list)
+        for event in events:
+            if event.event_type == "ack":
+                await self._project_ack(event)
+            else:
+                by_node[event.node_id].append(event)
+        if not by_node:
+            return
+
+        states = []
+        for node_events in by_node.values():
+            first = node_events[0]
+            state = await self._known_state(first.node_id)
+            if state is None:
+                state = self._create_state(first)
+                node_events = node_events[1:]
+            for event in node_events:
+                self._fold(state, event)
+            states.append(state)
+        await self._state_store.upsert_nodes(states)
+        for state in states:
+            self._remember(state)
 
     async def project(self, event: MeshEvent) -> None:
         # ACK events update sent_message tracking, not node state.
         if event.event_type == "ack":
-            request_id = event.payload.get("request_id")
-            if request_id and hasattr(self._state_store, "mark_acked"):
-                await self._state_store.mark_acked(
-                    packet_id=request_id,
-                    acking_node=event.node_id.value,
-                    error_reason=event.payload.get("error_reason", "NONE"),
-                    ack_at=event.timestamp,
-                )
+            await self._project_ack(event)
             return
 
-        existing = await self._state_store.get_node(event.node_id)
+        existing = await self._known_state(event.node_id)
         if existing:
             state = self._update_state(existing, event)
         else:
             state = self._create_state(event)
         await self._state_store.upsert_node(state)
+        self._remember(state)
+
+    async def _project_ack(self, event: MeshEvent) -> None:
+        request_id = event.payload.get("request_id")
+        if request_id and hasattr(self._state_store, "mark_acked"):
+            await self._state_store.mark_acked(
+                packet_id=request_id,
+                acking_node=event.node_id,
+                error_reason=event.payload.get("error_reason", "NONE"),
+                ack_at=event.timestamp,
+            )
+
+    async def _known_state(self, node_id: NodeId) -> Optional[NodeState]:
+        """The node's current state, from the cache or else the store
+
+        A cached state comes back as a copy, so folding events into it
+        leaves the cache as it was if the write then fails.
+        """
+        state = self._cache.get(node_id)
+        if state is not None:
+            self._cache.move_to_end(node_id)
+            # Shallow is enough: folding reassigns fields, never mutates them
+            return state.model_copy()
+        return await self._state_store.get_node(node_id)
+
+    def _remember(self, state: NodeState) -> None:
+        if self._cache_size <= 0:
+            return
+        self._cache[state.node_id] = state
+        self._cache.move_to_end(state.node_id)
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
 
     def _create_state(self, event: MeshEvent) -> NodeState:
-        long_name = None
-        short_name = None
-        if event.event_type == "node_info":
-            long_name = event.payload.get("long_name")
-            short_name = event.payload.get("short_name")
-        return NodeState(
+        provenance = event.provenance
+        state = NodeState(
             node_id=event.node_id,
-            long_name=long_name,
-            short_name=short_name,
             last_seen=event.timestamp,
             first_seen=event.timestamp,
             event_count=1,
-            last_telemetry=event.payload if event.event_type == "telemetry" else None,
-            last_position=event.payload if event.event_type == "position" else None,
-            last_text=event.payload.get("text") if event.event_type == "text" else None,
-            last_snr=event.provenance.get("rx_snr"),
-            last_rssi=event.provenance.get("rx_rssi"),
-            last_hops_away=event.provenance.get("hops_away"),
+            last_snr=provenance.get("rx_snr"),
+            last_rssi=provenance.get("rx_rssi"),
+            last_hops_away=provenance.get("hops_away"),
         )
+        apply = _PAYLOAD_APPLIERS.get(event.event_type)
+        if apply is not None:
+            apply(state, event.payload)
+        return state
 
     def _update_state(self, state: NodeState, event: MeshEvent) -> NodeState:
-        updates = {
-            "last_seen": event.timestamp,
-            "event_count": state.event_count + 1,
-        }
-        snr = event.provenance.get("rx_snr")
-        rssi = event.provenance.get("rx_rssi")
-        hops_away = event.provenance.get("hops_away")
+        self._fold(state, event)
+        return state
+
+    def _fold(self, state: NodeState, event: MeshEvent) -> None:
+        """Apply one event to a node state in place"""
+        state.last_seen = event.timestamp
+        state.event_count += 1
+        provenance = event.provenance
+        snr = provenance.get("rx_snr")
+        rssi = provenance.get("rx_rssi")
+        hops_away = provenance.get("hops_away")
         if snr is not None:
-            updates["last_snr"] = snr
+            state.last_snr = snr
         if rssi is not None:
-            updates["last_rssi"] = rssi
+            state.last_rssi = rssi
         if hops_away is not None:
-            updates["last_hops_away"] = hops_away
-        if event.event_type == "telemetry":
-            updates["last_telemetry"] = event.payload
-        elif event.event_type == "position":
-            updates["last_position"] = event.payload
-        elif event.event_type == "text":
-            updates["last_text"] = event.payload.get("text")
-        elif event.event_type == "node_info":
-            if event.payload.get("long_name"):
-                updates["long_name"] = event.payload["long_name"]
-            if event.payload.get("short_name"):
-                updates["short_name"] = event.payload["short_name"]
-        return state.model_copy(update=updates)
-
+            state.last_hops_away = hops_away
+        apply = _PAYLOAD_APPLIERS.get(event.event_type)
+        if apply is not None:
+            apply(state, event.payload)
@@ -43,22 +43,14 @@ class TelemetryQueryService:
         if since is None:
             since = datetime.now(timezone.utc) - timedelta(hours=24)
 
-        events = await self._event_query.get_telemetry_series(
+        # Extracted in the query, so only (timestamp, value) pairs come back
+        points = await self._event_query.get_metric_series(
             node_id=node_id,
+            metric=metric,
             since=since,
             limit=limit,
         )
-
-        data_points = []
-        for event in events:
-            value = event.payload.get(metric)
-            if value is not None:
-                data_points.append(DataPoint(
-                    timestamp=event.timestamp,
-                    value=float(value)
-                ))
-
-        return data_points
+        return [DataPoint(timestamp, value) for timestamp, value in points]
 
     async def get_statistics(
         self,
@@ -67,24 +59,19 @@ class TelemetryQueryService:
         since: Optional[datetime] = None,
     ) -> TelemetryStats:
         """Get statistical summary for a metric"""
-        data_points = await self.get_time_series(node_id, metric, since)
-
-        if not data_points:
-            return TelemetryStats(
-                min_value=None,
-                max_value=None,
-                avg_value=None,
-                current_value=None,
-                data_points=0,
-            )
-
-        values = [dp.value for dp in data_points]
+        if since is None:
+            since = datetime.now(timezone.utc) - timedelta(hours=24)
+
+        # Reduced in the query, so no telemetry rows are decoded here
+        low, high, mean, latest, count = (
+            await self._event_query.get_telemetry_stats(node_id, metric, since)
+        )
         return TelemetryStats(
-            min_value=min(values),
-            max_value=max(values),
-            avg_value=sum(values) / len(values),
-            current_value=data_points[-1].value if data_points else None,
-            data_points=len(data_points),
+            min_value=low,
+            max_value=high,
+            avg_value=mean,
+            current_value=latest,
+            data_points=count,
         )
 
     async def get_all_metrics(
@@ -96,7 +83,7 @@ class TelemetryQueryService:
         if since is None:
             since = datetime.now(timezone.utc) - timedelta(hours=24)
 
-        events = await self._event_query.get_telemetry_series(
+        points = await self._event_query.get_all_metric_series(
             node_id=node_id,
             since=since,
             limit=1000,
@@ -104,15 +91,11 @@ class TelemetryQueryService:
 
         # Organize by metric type
         metrics: dict[str, list[DataPoint]] = {}
-        for event in events:
-            for key, value in event.payload.items():
-                if isinstance(value, (int, float)):
-                    if key not in metrics:
-                        metrics[key] = []
-                    metrics[key].append(DataPoint(
-                        timestamp=event.timestamp,
-                        value=float(value)
-                    ))
+        for timestamp, key, value in points:
+            series = metrics.get(key)
+            if series is None:
+                series = metrics[key] = []
+            series.append(DataPoint(timestamp, value))
 
         return metrics
 
@@ -1,8 +1,12 @@
 """Centralized configuration management with environment variable support"""
 
 import os
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Optional
+
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in ("1", "true", "yes")
 
 
 @dataclass
@@ -23,11 +27,20 @@ class MeshCoreConfig:
     mqtt_port: int = 1883
     mqtt_topic: str = "meshcore/events"
     mqtt_client_id: str = "meshcore"
+    # Most events handed to the MQTT client per outbox drain
+    mqtt_batch_size: int = 64
+    # Events the MQTT outbox holds before dropping the oldest
+    mqtt_max_outbox: int = 1024
+    # Connections to open to the broker; above 1, events are sharded by node
+    mqtt_pool_size: int = 1
 
     # Web UI Configuration
     web_host: str = "0.0.0.0"
     web_port: int = 5000
     web_debug: bool = False
+    web_server: str = "werkzeug"  # werkzeug or waitress
+    # Worker threads for waitress; each open SSE stream holds one
+    web_threads: int = 32
 
     # Meshtastic Configuration
     meshtastic_device: Optional[str] = None  # Auto-detect if None
@@ -38,46 +51,21 @@ class MeshCoreConfig:
     # Service Configuration
     max_retries: int = 3
     retry_delay: float = 1.0
+    batch_size: int = 64
+    batch_max_delay_ms: float = 5.0
+    # Events read ahead of the store before the source is paused
+    max_pending: int = 1024
 
     @classmethod
     def from_env(cls) -> "MeshCoreConfig":
         """Create configuration from environment variables"""
-        return cls(
-            event_db_path=os.getenv(
-                "MESHCORE_EVENT_DB_PATH", "events.db"
-            ),
-            state_db_path=os.getenv(
-                "MESHCORE_STATE_DB_PATH", "state.db"
-            ),
-            mqtt_enabled=(
-                os.getenv("MESHCORE_MQTT_ENABLED", "true").lower()
-                == "true"
-            ),
-            mqtt_host=os.getenv("MESHCORE_MQTT_HOST", "localhost"),
-            mqtt_port=int(os.getenv("MESHCORE_MQTT_PORT", "1883")),
-            mqtt_topic=os.getenv(
-                "MESHCORE_MQTT_TOPIC", "meshcore/events"
-            ),
-            mqtt_client_id=os.getenv(
-                "MESHCORE_MQTT_CLIENT_ID", "meshcore"
-            ),
-            web_host=os.getenv("MESHCORE_WEB_HOST", "0.0.0.0"),
-            web_port=int(os.getenv("MESHCORE_WEB_PORT", "5000")),
-            web_debug=(
-                os.getenv("MESHCORE_WEB_DEBUG", "false").lower()
-                == "true"
-            ),
-            meshtastic_device=os.getenv("MESHCORE_MESHTASTIC_DEVICE"),
-            meshtastic_tcp_host=os.getenv(
-                "MESHCORE_MESHTASTIC_TCP_HOST"
-            ),
-            meshtastic_source=os.getenv("MESHCORE_SOURCE", "mock"),
-            mock_interval=float(
-                os.getenv("MESHCORE_MOCK_INTERVAL", "1.5")
-            ),
-            max_retries=int(os.getenv("MESHCORE_MAX_RETRIES", "3")),
-            retry_delay=float(os.getenv("MESHCORE_RETRY_DELAY", "1.0")),
-        )
+        environ = os.environ
+        overrides = {}
+        for field in fields(cls):
+            var, parse = _ENV_SCHEMA[field.name]
+            if var in environ:
+                overrides[field.name] = parse(environ[var])
+        return cls(**overrides)
 
     def __repr__(self) -> str:
         """String representation hiding sensitive data"""
@@ -88,3 +76,33 @@ class MeshCoreConfig:
             f"mqtt={self.mqtt_host}:{self.mqtt_port}, "
             f"source={self.meshtastic_source})"
         )
+
+
+# field -> (environment variable, parser); unset variables keep the
+# dataclass default
+_ENV_SCHEMA: dict[str, tuple[str, Callable[[str], Any]]] = {
+    "event_db_path": ("MESHCORE_EVENT_DB_PATH", str),
+    "state_db_path": ("MESHCORE_STATE_DB_PATH", str),
+    "mqtt_enabled": ("MESHCORE_MQTT_ENABLED", _parse_bool),
+    "mqtt_host": ("MESHCORE_MQTT_HOST", str),
+    "mqtt_port": ("MESHCORE_MQTT_PORT", int),
+    "mqtt_topic": ("MESHCORE_MQTT_TOPIC", str),
+    "mqtt_client_id": ("MESHCORE_MQTT_CLIENT_ID", str),
+    "mqtt_batch_size": ("MESHCORE_MQTT_BATCH_SIZE", int),
+    "mqtt_max_outbox": ("MESHCORE_MQTT_MAX_OUTBOX", int),
+    "mqtt_pool_size": ("MESHCORE_MQTT_POOL_SIZE", int),
+    "web_host": ("MESHCORE_WEB_HOST", str),
+    "web_port": ("MESHCORE_WEB_PORT", int),
+    "web_debug": ("MESHCORE_WEB_DEBUG", _parse_bool),
+    "web_server": ("MESHCORE_WEB_SERVER", str),
+    "web_threads": ("MESHCORE_WEB_THREADS", int),
+    "meshtastic_device": ("MESHCORE_MESHTASTIC_DEVICE", str),
+    "meshtastic_tcp_host": ("MESHCORE_MESHTASTIC_TCP_HOST", str),
+    "meshtastic_source": ("MESHCORE_SOURCE", str),
+    "mock_interval": ("MESHCORE_MOCK_INTERVAL", float),
+    "max_retries": ("MESHCORE_MAX_RETRIES", int),
+    "retry_delay": ("MESHCORE_RETRY_DELAY", float),
+    "batch_size": ("MESHCORE_BATCH_SIZE", int),
+    "batch_max_delay_ms": ("MESHCORE_BATCH_MAX_DELAY_MS", float),
+    "max_pending": ("MESHCORE_MAX_PENDING", int),
+}
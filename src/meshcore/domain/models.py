@@ -1,40 +1,179 @@
 """Models for the app"""
 
+import os
+import sys
 from datetime import datetime
-from typing import Any
-from uuid import UUID, uuid4
+from collections.abc import Mapping
+from typing import Annotated, Any, NoReturn, Self
+from uuid import UUID
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, PrivateAttr
 
 
-class EventId(BaseModel):
-    """Model for an event ID"""
+# Event IDs are cut from os.urandom bytes fetched 64 KiB (4096 IDs) at a
+# time, so they stay unpredictable without a getrandom() syscall each.
+# list.pop() is atomic, so source threads creating events at the same time
+# never get the same ID; a forked child drops the parent's unused IDs
+_ID_POOL_SIZE = 65536
+_id_pool: list[UUID] = []
 
-    value: UUID = Field(default_factory=uuid4)
 
+def _reset_id_pool() -> None:
+    """Give a forked child its own IDs instead of replaying the parent's"""
+    global _id_pool
+    _id_pool = []
 
-class NodeId(BaseModel):
-    """Model for a node ID"""
 
-    value: str
+os.register_at_fork(after_in_child=_reset_id_pool)
+
+
+def _new_event_uuid() -> UUID:
+    """Random version 4 UUID taken from the buffered urandom pool"""
+    global _id_pool
+    try:
+        return _id_pool.pop()
+    except IndexError:
+        raw = os.urandom(_ID_POOL_SIZE)
+        _id_pool = [
+            UUID(bytes=raw[i:i + 16], version=4)
+            for i in range(0, _ID_POOL_SIZE, 16)
+        ]
+        return _id_pool.pop()
+
+
+# Identifiers are plain values: an event ID is its UUID and a node ID is
+# its Meshtastic ID string, so they hash and bind to SQL directly
+EventId = UUID
+NodeId = str
+
+# Node IDs are interned, so every event and state for a node shares one
+# string and dict lookups keyed on it usually short-circuit on identity
+_InternedNodeId = Annotated[str, AfterValidator(sys.intern)]
+
+
+def _read_only(*args: Any, **kwargs: Any) -> NoReturn:
+    raise TypeError("event payloads are read-only; use model_copy(update=...)")
+
+
+class _FrozenDict(dict):
+    """A dict that refuses changes, so an event's cached JSON can't go stale
+
+    Still a dict, so orjson, pydantic and isinstance checks treat it like
+    the plain dict it was validated from.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        # The default rebuilds a dict subclass item by item via __setitem__
+        return (type(self), (dict(self),))
+
+
+def _freeze(value: dict[str, Any]) -> dict[str, Any]:
+    """Read-only copy of a payload, nested mappings included"""
+    return _FrozenDict({
+        key: _freeze(item) if isinstance(item, dict) else item
+        for key, item in value.items()
+    })
+
+
+# Event payload and provenance; frozen, since their JSON is cached
+_FrozenMapping = Annotated[dict[str, Any], AfterValidator(_freeze)]
+_FROZEN_FIELDS = ("payload", "provenance")
 
 
 class MeshEvent(BaseModel):
-    """Model for a mesh event"""
+    """Model for a mesh event
+
+    Frozen, payload and provenance included, since the serialized forms
+    below are cached on first use; model_copy(update=...) is the way to
+    get a changed event.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
-    event_id: EventId
-    node_id: NodeId
+    event_id: EventId = Field(default_factory=_new_event_uuid)
+    node_id: _InternedNodeId
     event_type: str
     timestamp: datetime
     ingested_at: datetime
-    payload: dict[str, Any]
-    provenance: dict[str, Any]
+    payload: _FrozenMapping
+    provenance: _FrozenMapping
+    _json_cache: bytes | None = PrivateAttr(default=None)
+    _payload_cache: bytes | None = PrivateAttr(default=None)
+    _provenance_cache: bytes | None = PrivateAttr(default=None)
+    _id_cache: str | None = PrivateAttr(default=None)
+
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> Self:
+        """Copy the event, dropping cached serializations if fields change"""
+        if update and any(name in update for name in _FROZEN_FIELDS):
+            # update skips validation, so freeze replacements here
+            update = {
+                name: _freeze(value)
+                if name in _FROZEN_FIELDS and isinstance(value, dict)
+                else value
+                for name, value in update.items()
+            }
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied._json_cache = None
+            copied._payload_cache = None
+            copied._provenance_cache = None
+            copied._id_cache = None
+        return copied
+
+    def event_id_str(self) -> str:
+        """String form of the event ID, computed once and reused"""
+        if self._id_cache is None:
+            self._id_cache = str(self.event_id)
+        return self._id_cache
+
+    def payload_bytes(self) -> bytes:
+        """Serialized JSON for the payload, computed once and reused"""
+        if self._payload_cache is None:
+            self._payload_cache = orjson.dumps(self.payload)
+        return self._payload_cache
+
+    def provenance_bytes(self) -> bytes:
+        """Serialized JSON for the provenance, computed once and reused"""
+        if self._provenance_cache is None:
+            self._provenance_cache = orjson.dumps(self.provenance)
+        return self._provenance_cache
+
+    def json_bytes(self) -> bytes:
+        """Serialized JSON for the event, computed once and reused
+
+        Same document as orjson.dumps(model_dump()), but the payload and
+        provenance are spliced in from their own caches, so the event
+        store and the publishers share a single encode of each.
+        """
+        if self._json_cache is None:
+            envelope = orjson.dumps({
+                "event_id": self.event_id,
+                "node_id": self.node_id,
+                "event_type": self.event_type,
+                "timestamp": self.timestamp,
+                "ingested_at": self.ingested_at,
+            })
+            self._json_cache = b"".join((
+                envelope[:-1],
+                b',"payload":', self.payload_bytes(),
+                b',"provenance":', self.provenance_bytes(),
+                b"}",
+            ))
+        return self._json_cache
 
 
 class NodeState(BaseModel):
     """Aggregate state for a node"""
 
-    node_id: NodeId
+    node_id: _InternedNodeId
     long_name: str | None = None
     short_name: str | None = None
     last_seen: datetime
@@ -0,0 +1,25 @@
+"""Event loop selection shared by the entry points"""
+
+import asyncio
+import sys
+from typing import Callable, Optional
+
+try:
+    if sys.platform == "win32":
+        import winloop as uvloop
+    else:
+        import uvloop
+except ImportError:  # Optional; the stock asyncio loop is used without it
+    uvloop = None
+
+
+def loop_factory() -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """Factory for asyncio.run's loop_factory: uvloop's, else the default"""
+    return uvloop.new_event_loop if uvloop is not None else None
+
+
+def new_event_loop() -> asyncio.AbstractEventLoop:
+    """A new event loop, from uvloop when it is installed"""
+    if uvloop is not None:
+        return uvloop.new_event_loop()
+    return asyncio.new_event_loop()
@@ -6,35 +6,33 @@ import argparse
 import asyncio
 import logging
 import sys
+from contextlib import AbstractAsyncContextManager
+from functools import lru_cache
+from typing import TypeVar
 
-from meshcore.adapters.meshtastic.mock import MockMeshtasticEventSource
-from meshcore.adapters.meshtastic.source import MeshtasticSource
-from meshcore.adapters.meshtastic.tcp import MeshtasticTcpSource
-from meshcore.adapters.pubsub.logging import LoggingPublisher
-from meshcore.adapters.pubsub.mqtt import MqttEventPublisher
 from meshcore.adapters.storage.sqlite import SqliteEventStore
 from meshcore.adapters.storage.state_sqlite import SqliteStateStore
+from meshcore.application.correlation import configure_logging
 from meshcore.application.services import MeshEventService
 from meshcore.application.state_projection import StateProjection
 from meshcore.config import MeshCoreConfig
+from meshcore.eventloop import loop_factory
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+R = TypeVar("R", bound=AbstractAsyncContextManager)
 
-def parse_args() -> MeshCoreConfig | None:
-    """Parse command line arguments and return config"""
+
+@lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """The command line parser, built once per process"""
     parser = argparse.ArgumentParser(
         description="MeshCore Event Service",
         add_help=True
     )
     parser.add_argument(
         "--source",
-        choices=["mock", "serial", "tcp"],
+        choices=list(_SOURCE_FACTORIES),
         help="Event source type"
     )
     parser.add_argument("--device", help="Serial device path")
@@ -46,9 +44,15 @@ def parse_args() -> MeshCoreConfig | None:
     parser.add_argument(
         "--debug", action="store_true", help="Enable debug logging"
     )
+    return parser
+
+
+def parse_args() -> MeshCoreConfig | None:
+    """Parse command line arguments and return config"""
+    # No arguments means interactive setup; skip building the parser
     if len(sys.argv) == 1:
         return None
-    args = parser.parse_args()
+    args = _build_parser().parse_args()
     if args.debug:
         logging.getLogger().setLevel(logging.DEBUG)
     
@@ -115,54 +119,128 @@ def interactive_config() -> MeshCoreConfig:
     return config
 
 
+# Adapters are imported by the factory that needs them: the meshtastic
+# library behind the serial and TCP sources, and paho behind MQTT, are the
+# slowest imports in the program and a run only ever uses one of each
+
+
+def _mock_source(config: MeshCoreConfig):
+    from meshcore.adapters.meshtastic.mock import MockMeshtasticEventSource
+
+    logger.info(f"Using MOCK source (interval: {config.mock_interval}s)")
+    return MockMeshtasticEventSource(interval=config.mock_interval)
+
+
+def _serial_source(config: MeshCoreConfig):
+    from meshcore.adapters.meshtastic.source import MeshtasticSource
+
+    device_info = config.meshtastic_device or "auto-detect"
+    logger.info(f"Using SERIAL source: {device_info}")
+    return MeshtasticSource(device=config.meshtastic_device)
+
+
+def _tcp_source(config: MeshCoreConfig):
+    from meshcore.adapters.meshtastic.tcp import MeshtasticTcpSource
+
+    logger.info(f"Using TCP source: {config.meshtastic_tcp_host}")
+    return MeshtasticTcpSource(host=config.meshtastic_tcp_host)
+
+
+# Source factory for each meshtastic_source value accepted by --source
+_SOURCE_FACTORIES = {
+    "mock": _mock_source,
+    "serial": _serial_source,
+    "tcp": _tcp_source,
+}
+
+
 def create_source(config: MeshCoreConfig):
     """Create event source based on configuration"""
-    if config.meshtastic_source == "mock":
-        logger.info(f"Using MOCK source (interval: {config.mock_interval}s)")
-        return MockMeshtasticEventSource(interval=config.mock_interval)
-    elif config.meshtastic_source == "serial":
-        device_info = config.meshtastic_device or "auto-detect"
-        logger.info(f"Using SERIAL source: {device_info}")
-        return MeshtasticSource(device=config.meshtastic_device)
-    elif config.meshtastic_source == "tcp":
-        logger.info(f"Using TCP source: {config.meshtastic_tcp_host}")
-        return MeshtasticTcpSource(host=config.meshtastic_tcp_host)
-    else:
-        raise ValueError(f"Unknown source type: {config.meshtastic_source}")
+    try:
+        factory = _SOURCE_FACTORIES[config.meshtastic_source]
+    except KeyError:
+        raise ValueError(
+            f"Unknown source type: {config.meshtastic_source}"
+        ) from None
+    return factory(config)
 
 
 async def create_publisher(config: MeshCoreConfig):
     """Create and initialize publisher with proper lifecycle"""
     if config.mqtt_enabled:
+        from meshcore.adapters.pubsub.mqtt import (
+            MqttEventPublisher,
+            MqttPublisherPool,
+        )
+
         logger.info(
             f"MQTT publishing enabled: "
             f"{config.mqtt_host}:{config.mqtt_port}"
         )
-        publisher = MqttEventPublisher(
-            host=config.mqtt_host,
-            port=config.mqtt_port,
-            topic=config.mqtt_topic,
-            client_id=config.mqtt_client_id,
-        )
+        if config.mqtt_pool_size > 1:
+            publisher = MqttPublisherPool(
+                size=config.mqtt_pool_size,
+                host=config.mqtt_host,
+                port=config.mqtt_port,
+                topic=config.mqtt_topic,
+                client_id=config.mqtt_client_id,
+                batch_size=config.mqtt_batch_size,
+                max_outbox=config.mqtt_max_outbox,
+            )
+        else:
+            publisher = MqttEventPublisher(
+                host=config.mqtt_host,
+                port=config.mqtt_port,
+                topic=config.mqtt_topic,
+                client_id=config.mqtt_client_id,
+                batch_size=config.mqtt_batch_size,
+                max_outbox=config.mqtt_max_outbox,
+            )
         await publisher.__aenter__()
         return publisher
     else:
+        from meshcore.adapters.pubsub.logging import LoggingPublisher
+
         logger.info("MQTT disabled, using console logging")
-        return LoggingPublisher()
+        publisher = LoggingPublisher()
+        await publisher.__aenter__()
+        return publisher
+
+
+async def _open(resource: R) -> R:
+    """Enter an async context manager resource and return it"""
+    await resource.__aenter__()
+    return resource
 
 
 async def main_loop(config: MeshCoreConfig):
     """Main service loop with proper resource management"""
     source = create_source(config)
-    publisher = None
-    event_store = None
-    state_store = None
+    # (name, resource) for everything opened, so cleanup closes just those
+    opened: list[tuple[str, AbstractAsyncContextManager]] = []
     try:
-        publisher = await create_publisher(config)
-        event_store = SqliteEventStore(path=config.event_db_path)
-        await event_store.__aenter__()
-        state_store = SqliteStateStore(path=config.state_db_path)
-        await state_store.__aenter__()
+        # The broker handshake and the two schema setups don't depend on
+        # each other, so startup waits for the slowest rather than the sum
+        names = ("publisher", "event store", "state store")
+        results = await asyncio.gather(
+            create_publisher(config),
+            _open(SqliteEventStore(path=config.event_db_path)),
+            _open(SqliteStateStore(path=config.state_db_path)),
+            return_exceptions=True,
+        )
+        opened = [
+            (name, result) for name, result in zip(names, results)
+            if not isinstance(result, BaseException)
+        ]
+        # Raise the first failure; cleanup closes whatever did open.
+        # One check per name so each is narrowed from T | BaseException.
+        publisher, event_store, state_store = results
+        if isinstance(publisher, BaseException):
+            raise publisher
+        if isinstance(event_store, BaseException):
+            raise event_store
+        if isinstance(state_store, BaseException):
+            raise state_store
         state_projection = StateProjection(state_store)
         logger.info(f"Starting MeshCore service with config: {config}")
         logger.info("Press Ctrl+C to stop\n")
@@ -173,6 +251,9 @@ async def main_loop(config: MeshCoreConfig):
             state_projection=state_projection,
             max_retries=config.max_retries,
             retry_delay=config.retry_delay,
+            batch_size=config.batch_size,
+            batch_max_delay=config.batch_max_delay_ms / 1000,
+            max_pending=config.max_pending,
         )
         await service.run()
     except asyncio.CancelledError:
@@ -182,30 +263,37 @@ async def main_loop(config: MeshCoreConfig):
         raise
     finally:
         logger.info("Cleaning up resources...")
-        if publisher and config.mqtt_enabled:
-            try:
-                await publisher.__aexit__(None, None, None)
-            except Exception as e:
-                logger.error(f"Error closing publisher: {e}")
-        if event_store:
-            try:
-                await event_store.__aexit__(None, None, None)
-            except Exception as e:
-                logger.error(f"Error closing event store: {e}")
-        if state_store:
-            try:
-                await state_store.__aexit__(None, None, None)
-            except Exception as e:
-                logger.error(f"Error closing state store: {e}")
+        # Close concurrently; one failing close doesn't stop the others
+        results = await asyncio.gather(
+            *(resource.__aexit__(None, None, None) for _, resource in opened),
+            return_exceptions=True,
+        )
+        for (name, _), result in zip(opened, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error closing {name}: {result}")
         logger.info("Shutdown complete")
 
 
+async def _eager_main_loop(config: MeshCoreConfig):
+    """Run main_loop with eager task execution"""
+    # A task that finishes without suspending completes inside create_task
+    # rather than waiting a trip through the loop
+    asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    await main_loop(config)
+
+
 def main():
+    # Configured here rather than at import, so importing the module
+    # (in tests, say) leaves logging alone
+    configure_logging()
     try:
         config = parse_args()
         if config is None:
             config = interactive_config()
-        asyncio.run(main_loop(config))
+        asyncio.run(
+            _eager_main_loop(config),
+            loop_factory=loop_factory(),
+        )
     except KeyboardInterrupt:
         logger.info("\n\nShutdown requested. Goodbye!")
     except Exception as e:
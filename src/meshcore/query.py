@@ -4,46 +4,51 @@ import asyncio
 import sys
 
 from meshcore.adapters.storage.state_sqlite import SqliteStateStore
+from meshcore.eventloop import loop_factory
 
 
-async def list_nodes():
-    store = SqliteStateStore()
+def _format_node(node) -> str:
+    """The lines printed for one node, newline-terminated"""
+    lines = [
+        f"Node: {node.node_id}\n",
+        f"  First seen: {node.first_seen}\n",
+        f"  Last seen:  {node.last_seen}\n",
+        f"  Events:     {node.event_count}\n",
+    ]
+    if node.last_telemetry:
+        lines.append(f"  Telemetry:  {node.last_telemetry}\n")
+    if node.last_position:
+        lines.append(f"  Position:   {node.last_position}\n")
+    if node.last_text:
+        lines.append(f"  Last text:  {node.last_text}\n")
+    return "".join(lines)
+
+
+async def list_nodes(store: SqliteStateStore):
     nodes = await store.list_nodes()
     if not nodes:
         print("No nodes found in database.")
         return
     print(f"Found {len(nodes)} node(s):\n")
-    for node in nodes:
-        print(f"Node: {node.node_id.value}")
-        print(f"  First seen: {node.first_seen}")
-        print(f"  Last seen:  {node.last_seen}")
-        print(f"  Events:     {node.event_count}")
-        if node.last_telemetry:
-            print(f"  Telemetry:  {node.last_telemetry}")
-        if node.last_position:
-            print(f"  Position:   {node.last_position}")
-        if node.last_text:
-            print(f"  Last text:  {node.last_text}")
-        print()
+    # One write for the whole listing rather than several per node
+    sys.stdout.write("".join(_format_node(node) + "\n" for node in nodes))
 
 
-async def get_node(node_id: str):
-    store = SqliteStateStore()
-    from meshcore.domain.models import NodeId
-    node = await store.get_node(NodeId(value=node_id))
+async def get_node(store: SqliteStateStore, node_id: str):
+    node = await store.get_node(node_id)
     if not node:
         print(f"Node {node_id} not found.")
         return
-    print(f"Node: {node.node_id.value}")
-    print(f"  First seen: {node.first_seen}")
-    print(f"  Last seen:  {node.last_seen}")
-    print(f"  Events:     {node.event_count}")
-    if node.last_telemetry:
-        print(f"  Telemetry:  {node.last_telemetry}")
-    if node.last_position:
-        print(f"  Position:   {node.last_position}")
-    if node.last_text:
-        print(f"  Last text:  {node.last_text}")
+    sys.stdout.write(_format_node(node))
+
+
+async def _run(command: str, args: list[str]) -> None:
+    """Run one command against a state store opened and closed here"""
+    async with SqliteStateStore() as store:
+        if command == "list":
+            await list_nodes(store)
+        else:
+            await get_node(store, args[0])
 
 
 def main():
@@ -53,16 +58,13 @@ def main():
         print("  python -m meshcore.query get <node_id>")
         sys.exit(1)
     command = sys.argv[1]
-    if command == "list":
-        asyncio.run(list_nodes())
-    elif command == "get":
-        if len(sys.argv) < 3:
-            print("Error: node_id required")
-            sys.exit(1)
-        asyncio.run(get_node(sys.argv[2]))
-    else:
+    if command not in ("list", "get"):
         print(f"Unknown command: {command}")
         sys.exit(1)
+    if command == "get" and len(sys.argv) < 3:
+        print("Error: node_id required")
+        sys.exit(1)
+    asyncio.run(_run(command, sys.argv[2:]), loop_factory=loop_factory())
 
 
 if __name__ == "__main__":
@@ -3,24 +3,30 @@
 import asyncio
 import logging
 import threading
+from typing import Callable
+
+from flask import Flask
 
 from meshcore.adapters.meshtastic.commander import (
     MeshtasticCommander,
     MeshtasticTcpCommander,
     MockCommander,
 )
-from meshcore.adapters.ui.web import create_app
+from meshcore.adapters.ui.sse import SseHub, SsePublisher
+from meshcore.adapters.ui.web import create_app, shutdown_app
+from meshcore.application.correlation import configure_logging
 from meshcore.config import MeshCoreConfig
+from meshcore.eventloop import loop_factory
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Seconds shutdown waits for event collection to finish its teardown
+_STOP_TIMEOUT = 10.0
+
 
-async def _run_event_collection(config: MeshCoreConfig, interface) -> None:
+async def _run_event_collection(
+    config: MeshCoreConfig, interface, hub: SseHub
+) -> None:
     """Async loop that collects mesh events and writes them to the DBs."""
     from meshcore.adapters.meshtastic.tcp import MeshtasticTcpSource
     from meshcore.adapters.pubsub.logging import LoggingPublisher
@@ -34,36 +40,104 @@ async def _run_event_collection(config: MeshCoreConfig, interface) -> None:
     )
     event_store = SqliteEventStore(path=config.event_db_path)
     state_store = SqliteStateStore(path=config.state_db_path)
+    publisher = SsePublisher(hub, LoggingPublisher())
 
-    async with event_store, state_store:
-        projection = StateProjection(state_store)
-        service = MeshEventService(
-            source=source,
-            store=event_store,
-            publisher=LoggingPublisher(),
-            state_projection=projection,
-        )
-        await service.run()
-
+    try:
+        async with event_store, state_store:
+            projection = StateProjection(state_store)
+            service = MeshEventService(
+                source=source,
+                store=event_store,
+                publisher=publisher,
+                state_projection=projection,
+                batch_size=config.batch_size,
+                batch_max_delay=config.batch_max_delay_ms / 1000,
+                max_pending=config.max_pending,
+            )
+            await service.run()
+    finally:
+        # Writes out whatever the console publisher still has buffered
+        await publisher.close()
+
+
+def _start_event_collection(
+    config: MeshCoreConfig, interface, app: Flask
+) -> None:
+    """Spawn a daemon thread that runs the event collection asyncio loop.
+
+    Registers a shutdown hook that cancels the collection and waits for
+    its teardown, so the stores and publishers close cleanly.
+    """
+    hub: SseHub = app.config['SSE_HUB']
+    cancels: list[Callable[[], object]] = []
+    stopping = threading.Event()
+
+    async def _collect() -> None:
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        if task is not None:
+            cancels.append(lambda: loop.call_soon_threadsafe(task.cancel))
+        # Registered before checking, so a stop that came first is seen
+        # here and one that comes later sees the cancel
+        if stopping.is_set():
+            return
+        await _run_event_collection(config, interface, hub)
 
-def _start_event_collection(config: MeshCoreConfig, interface) -> None:
-    """Spawn a daemon thread that runs the event collection asyncio loop."""
     def _run():
         try:
-            asyncio.run(_run_event_collection(config, interface))
+            asyncio.run(_collect(), loop_factory=loop_factory())
+        except asyncio.CancelledError:
+            logger.info("Background event collection stopped")
         except Exception as e:
             logger.error(f"Event collection thread died: {e}", exc_info=True)
 
+    def _stop() -> None:
+        stopping.set()
+        for cancel in cancels:
+            try:
+                cancel()
+            except RuntimeError:
+                pass  # The loop already finished and closed
+        thread.join(timeout=_STOP_TIMEOUT)
+        if thread.is_alive():
+            logger.warning("Event collection did not stop in time")
+
     thread = threading.Thread(target=_run, daemon=True, name="EventCollector")
     thread.start()
+    app.config['SHUTDOWN_HOOKS'].append(_stop)
     logger.info("Background event collection started")
 
 
+def _serve(app, config: MeshCoreConfig) -> None:
+    """Serve app with the configured WSGI server until interrupted"""
+    if config.web_server == "waitress" and not config.web_debug:
+        try:
+            from waitress import serve
+        except ImportError:
+            logger.warning("waitress is not installed, using werkzeug")
+        else:
+            serve(
+                app,
+                host=config.web_host,
+                port=config.web_port,
+                threads=config.web_threads,
+            )
+            return
+    app.run(
+        host=config.web_host,
+        port=config.web_port,
+        debug=config.web_debug,
+        threaded=True,
+    )
+
+
 def main():
     """Run the web server"""
+    configure_logging()
     config = MeshCoreConfig.from_env()
 
     commander = None
+    interface = None
     if config.meshtastic_source == "tcp":
         import meshtastic.tcp_interface
         logger.info(f"Using TCP mode: {config.meshtastic_tcp_host}")
@@ -73,7 +147,6 @@ def main():
         interface = meshtastic.tcp_interface.TCPInterface(
             hostname=config.meshtastic_tcp_host
         )
-        _start_event_collection(config, interface)
         commander = MeshtasticTcpCommander(
             host=config.meshtastic_tcp_host, interface=interface
         )
@@ -82,25 +155,28 @@ def main():
         commander = MeshtasticCommander(device=config.meshtastic_device)
     else:
         logger.info("Using MOCK commander (no messages will be broadcast)")
-        commander = MockCommander()
+        commander = MockCommander(simulated_delay=0.1)
 
     app = create_app(
         state_db_path=config.state_db_path,
         events_db_path=config.event_db_path,
         commander=commander,
     )
+    if interface is not None:
+        _start_event_collection(config, interface, app)
     logger.info(f"MeshCore Web UI starting with config: {config}")
     logger.info("Dashboard: http://localhost:5000")
     logger.info("API: http://localhost:5000/api/nodes")
     logger.info("Press Ctrl+C to stop")
     try:
-        app.run(host=config.web_host, port=config.web_port, debug=config.web_debug)
+        _serve(app, config)
     except KeyboardInterrupt:
         logger.info("\nShutting down web server...")
     except Exception as e:
         logger.error(f"Web server error: {e}", exc_info=True)
         raise
     finally:
+        shutdown_app(app)
         if hasattr(commander, 'close'):
             commander.close()
 
@@ -1,15 +1,50 @@
+import asyncio
 import pytest
 import tempfile
 import os
+import shutil
 from datetime import datetime
 from unittest.mock import Mock
-from meshcore.domain.models import MeshEvent, NodeState, EventId, NodeId
+from uuid import uuid4
+from meshcore.adapters.storage.sqlite import SqliteEventStore
+from meshcore.adapters.storage.state_sqlite import SqliteStateStore
+from meshcore.domain.models import MeshEvent, NodeState
+from meshcore.eventloop import uvloop
+
+
+if uvloop is not None:
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests on uvloop, as the entry points do"""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest.fixture(scope="session")
+def temp_db_root():
+    root = tempfile.mkdtemp(prefix="meshcore-test-")
+    yield root
+    shutil.rmtree(root, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def template_db_path(temp_db_root):
+    """A database with both stores' schema, built once per session"""
+    path = os.path.join(temp_db_root, 'template.db')
+
+    async def _init():
+        async with SqliteEventStore(path), SqliteStateStore(path):
+            pass
+
+    asyncio.run(_init())
+    return path
 
 
 @pytest.fixture
-def temp_db_path():
-    fd, db_path = tempfile.mkstemp(suffix='.db')
+def temp_db_path(temp_db_root, template_db_path):
+    fd, db_path = tempfile.mkstemp(suffix='.db', dir=temp_db_root)
     os.close(fd)
+    # Copying the schema is cheaper than running the DDL for every test
+    shutil.copyfile(template_db_path, db_path)
     yield db_path
     try:
         os.unlink(db_path)
@@ -22,6 +57,24 @@ def temp_db_path():
             pass
 
 
+@pytest.fixture
+async def event_store(temp_db_path):
+    async with SqliteEventStore(temp_db_path) as store:
+        yield store
+
+
+@pytest.fixture
+async def state_store(temp_db_path):
+    async with SqliteStateStore(temp_db_path) as store:
+        yield store
+
+
+@pytest.fixture
+def memory_db_uri():
+    """A shared-cache in-memory database both stores can open"""
+    return f"file:meshcore-test-{uuid4().hex}?mode=memory&cache=shared"
+
+
 @pytest.fixture
 def sample_timestamp():
     return datetime(2026, 1, 24, 12, 0, 0)
@@ -29,13 +82,12 @@ def sample_timestamp():
 
 @pytest.fixture
 def node_id():
-    return NodeId(value="!abcd1234")
+    return "!abcd1234"
 
 
 @pytest.fixture
 def mesh_event_telemetry(node_id, sample_timestamp):
     return MeshEvent(
-        event_id=EventId(),
         node_id=node_id,
         event_type="telemetry",
         timestamp=sample_timestamp,
@@ -52,7 +104,6 @@ def mesh_event_telemetry(node_id, sample_timestamp):
 @pytest.fixture
 def mesh_event_message(node_id, sample_timestamp):
     return MeshEvent(
-        event_id=EventId(),
         node_id=node_id,
         event_type="text",
         timestamp=sample_timestamp,
@@ -69,7 +120,6 @@ def mesh_event_message(node_id, sample_timestamp):
 @pytest.fixture
 def mesh_event_position(node_id, sample_timestamp):
     return MeshEvent(
-        event_id=EventId(),
         node_id=node_id,
         event_type="position",
         timestamp=sample_timestamp,
@@ -107,6 +157,7 @@ def mock_state_store():
     from unittest.mock import AsyncMock
     mock = Mock()
     mock.upsert_node = AsyncMock(return_value=None)
+    mock.upsert_nodes = AsyncMock(return_value=None)
     mock.get_node = AsyncMock(return_value=None)
     mock.get_all_nodes = AsyncMock(return_value=[])
     return mock
@@ -1,6 +1,10 @@
 from datetime import datetime, timedelta
 from typing import Optional, Any
-from meshcore.domain.models import MeshEvent, NodeState, EventId, NodeId
+from meshcore.domain.models import MeshEvent, NodeState
+
+# MeshEvent validation copies these, so one shared instance is safe
+_EMPTY_PAYLOAD: dict[str, Any] = {}
+_TEST_PROVENANCE = {"source": "test"}
 
 
 class EventFactory:
@@ -11,14 +15,14 @@ class EventFactory:
         payload: Optional[dict[str, Any]] = None,
         timestamp: Optional[datetime] = None
     ) -> MeshEvent:
+        timestamp = timestamp or datetime.now()
         return MeshEvent(
-            event_id=EventId(),
-            node_id=NodeId(value=node_id),
+            node_id=node_id,
             event_type=event_type,
-            timestamp=timestamp or datetime.now(),
-            ingested_at=timestamp or datetime.now(),
-            payload=payload or {},
-            provenance={"source": "test"}
+            timestamp=timestamp,
+            ingested_at=timestamp,
+            payload=payload if payload is not None else _EMPTY_PAYLOAD,
+            provenance=_TEST_PROVENANCE
         )
     @staticmethod
     def telemetry_event(
@@ -95,7 +99,7 @@ class StateFactory:
     ) -> NodeState:
         now = datetime.now()
         return NodeState(
-            node_id=NodeId(value=node_id),
+            node_id=node_id,
             first_seen=first_seen or now,
             last_seen=last_seen or now,
             event_count=event_count,
@@ -107,13 +111,12 @@ class StateFactory:
 
 def create_event_sequence(node_id: str, count: int = 5):
     base_time = datetime.now()
-    events = []
-    for i in range(count):
-        timestamp = base_time + timedelta(minutes=i)
-        events.append(EventFactory.telemetry_event(
+    return [
+        EventFactory.telemetry_event(
             node_id=node_id,
             battery_level=85 - i,
-            timestamp=timestamp
-        ))
-    return events
+            timestamp=base_time + timedelta(minutes=i)
+        )
+        for i in range(count)
+    ]
 
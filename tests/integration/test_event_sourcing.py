@@ -3,14 +3,13 @@ from datetime import datetime
 from meshcore.adapters.storage.sqlite import SqliteEventStore
 from meshcore.adapters.storage.state_sqlite import SqliteStateStore
 from meshcore.application.state_projection import StateProjection
-from meshcore.domain.models import NodeId
 from tests.fixtures.factories import EventFactory, create_event_sequence
 
 
 @pytest.mark.asyncio
-async def test_event_sourcing_flow(temp_db_path):
-    event_store = SqliteEventStore(temp_db_path)
-    state_store = SqliteStateStore(temp_db_path)
+async def test_event_sourcing_flow(memory_db_uri):
+    event_store = SqliteEventStore(memory_db_uri)
+    state_store = SqliteStateStore(memory_db_uri)
     projection = StateProjection(state_store)
     node_id = "!test1234"
     telemetry_event = EventFactory.telemetry_event(
@@ -19,51 +18,48 @@ async def test_event_sourcing_flow(temp_db_path):
     )
     await event_store.append(telemetry_event)
     await projection.project(telemetry_event)
-    state = await state_store.get_node(NodeId(value=node_id))
+    state = await state_store.get_node(node_id)
     assert state is not None
-    assert state.node_id.value == node_id
+    assert state.node_id == node_id
     assert state.last_telemetry["battery_level"] == 85
     position_event = EventFactory.position_event(node_id=node_id)
     await event_store.append(position_event)
     await projection.project(position_event)
-    updated_state = await state_store.get_node(NodeId(value=node_id))
+    updated_state = await state_store.get_node(node_id)
     assert updated_state.last_position is not None
     events = []
     async for e in event_store.replay(since=None, until=None):
         events.append(e)
     assert len(events) == 2
-    event_store._conn.close()
-    state_store._conn.close()
+    await state_store.close()
+    await event_store.close()
 
 
 @pytest.mark.asyncio
-async def test_multiple_nodes_flow(temp_db_path):
-    event_store = SqliteEventStore(temp_db_path)
-    state_store = SqliteStateStore(temp_db_path)
+async def test_multiple_nodes_flow(memory_db_uri):
+    event_store = SqliteEventStore(memory_db_uri)
+    state_store = SqliteStateStore(memory_db_uri)
     projection = StateProjection(state_store)
-    for i in range(3):
-        node_id = f"!node{i}"
-        event = EventFactory.telemetry_event(node_id=node_id)
-        await event_store.append(event)
-        await projection.project(event)
+    events = [
+        EventFactory.telemetry_event(node_id=f"!node{i}") for i in range(3)
+    ]
+    assert await event_store.append_many(events) == [True] * 3
+    await projection.project_many(events)
     states = await state_store.list_nodes()
     assert len(states) == 3
-    event_store._conn.close()
-    state_store._conn.close()
+    await state_store.close()
+    await event_store.close()
 
 
 @pytest.mark.asyncio
-async def test_event_sequence(temp_db_path):
-    event_store = SqliteEventStore(temp_db_path)
+async def test_event_sequence(event_store):
     node_id = "!test"
     events = create_event_sequence(node_id, count=5)
-    for event in events:
-        await event_store.append(event)
+    assert await event_store.append_many(events) == [True] * 5
     all_events = []
     async for e in event_store.replay(since=None, until=None):
         all_events.append(e)
     assert len(all_events) == 5
-    event_store._conn.close()
 
 
 @pytest.mark.asyncio
@@ -72,10 +68,10 @@ async def test_state_persistence(temp_db_path):
     projection = StateProjection(state_store)
     event = EventFactory.telemetry_event(node_id="!persist")
     await projection.project(event)
-    state_store._conn.close()
+    await state_store.close()
     new_store = SqliteStateStore(temp_db_path)
-    retrieved = await new_store.get_node(NodeId(value="!persist"))
+    retrieved = await new_store.get_node("!persist")
     assert retrieved is not None
-    assert retrieved.node_id.value == "!persist"
-    new_store._conn.close()
+    assert retrieved.node_id == "!persist"
+    await new_store.close()
 
@@ -0,0 +1,73 @@
+import functools
+import io
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import Mock
+from pubsub import pub
+from meshcore.adapters.pubsub import logging as logging_publisher
+from meshcore.config import MeshCoreConfig
+from meshcore.web_main import _start_event_collection
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _is_subscribed():
+    topic = pub.getDefaultTopicMgr().getTopic(
+        "meshtastic.receive", okIfNone=True
+    )
+    return topic is not None and topic.hasListeners()
+
+
+def test_web_ingest_shutdown_hook_flushes_console_publisher(
+    tmp_path, monkeypatch
+):
+    stream = io.BytesIO()
+    monkeypatch.setattr(
+        logging_publisher,
+        "LoggingPublisher",
+        functools.partial(
+            logging_publisher.LoggingPublisher,
+            stream=stream,
+            flush_interval=60,
+        ),
+    )
+    published = threading.Event()
+    hub = Mock()
+    hub.publish.side_effect = lambda data: published.set()
+    app = SimpleNamespace(config={"SSE_HUB": hub, "SHUTDOWN_HOOKS": []})
+    config = MeshCoreConfig(
+        event_db_path=str(tmp_path / "events.db"),
+        state_db_path=str(tmp_path / "state.db"),
+        meshtastic_tcp_host="localhost",
+    )
+
+    _start_event_collection(config, Mock(), app)
+    (stop,) = app.config["SHUTDOWN_HOOKS"]
+    try:
+        _wait_for(_is_subscribed)
+        pub.sendMessage(
+            "meshtastic.receive.text",
+            packet={
+                "from": 1234,
+                "decoded": {"portnum": "TEXT_MESSAGE_APP", "text": "hi"},
+            },
+            interface=None,
+        )
+        # The console publisher buffers in the same step as the hub push
+        assert published.wait(5)
+        assert stream.getvalue() == b""
+    finally:
+        stop()
+        # The stopped source may outlive the thread until the next GC
+        pub.unsubAll("meshtastic.receive")
+        pub.unsubAll("meshtastic.node.updated")
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["payload"]["text"] for line in lines] == ["hi"]
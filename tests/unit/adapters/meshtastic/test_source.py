@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from unittest.mock import Mock, patch
+from pubsub import pub
+from meshcore.adapters.meshtastic.source import MeshtasticSource
+from meshcore.adapters.meshtastic.tcp import MeshtasticTcpSource
+from tests.fixtures.factories import EventFactory
+
+
+@pytest.mark.asyncio
+async def test_source_drop_oldest_keeps_newest_events():
+    source = MeshtasticTcpSource(host="localhost", max_queue=2)
+    events = [EventFactory.text_event(text=f"msg {i}") for i in range(3)]
+    for event in events:
+        source._enqueue(event)
+    assert source.dropped == 1
+    assert source.queue_depth == 2
+    assert source._queue.get_nowait() is events[1]
+    assert source._queue.get_nowait() is events[2]
+
+
+@pytest.mark.asyncio
+async def test_source_drop_newest_keeps_oldest_events():
+    source = MeshtasticTcpSource(
+        host="localhost", max_queue=2, overflow="drop_newest"
+    )
+    events = [EventFactory.text_event(text=f"msg {i}") for i in range(3)]
+    for event in events:
+        source._enqueue(event)
+    assert source.dropped == 1
+    assert source._queue.get_nowait() is events[0]
+    assert source._queue.get_nowait() is events[1]
+
+
+def test_source_rejects_unknown_overflow_policy():
+    with pytest.raises(ValueError):
+        MeshtasticTcpSource(host="localhost", overflow="block")
+
+
+def _unsubscribe(source):
+    for topic in source._PACKET_TOPICS:
+        pub.unsubscribe(source._on_receive, topic)
+    pub.unsubscribe(source._on_node_updated, "meshtastic.node.updated")
+
+
+async def _assert_receives_packets(source):
+    """Deliver a packet through pypubsub, as the meshtastic library does"""
+    pub.sendMessage(
+        "meshtastic.receive.text",
+        packet={
+            "from": 1234,
+            "decoded": {"portnum": "TEXT_MESSAGE_APP", "text": "over pubsub"},
+        },
+        interface=None,
+    )
+    # The listener hands the event to the loop with call_soon_threadsafe
+    await asyncio.sleep(0)
+    assert source.queue_depth == 1
+    assert source._queue.get_nowait().payload["text"] == "over pubsub"
+
+
+@pytest.mark.asyncio
+async def test_serial_source_connect_subscribes_listeners():
+    source = MeshtasticSource(device="/dev/null")
+    with patch("meshtastic.serial_interface.SerialInterface") as interface:
+        await source._connect()
+    try:
+        interface.assert_called_once_with(devPath="/dev/null")
+        await _assert_receives_packets(source)
+    finally:
+        _unsubscribe(source)
+
+
+@pytest.mark.asyncio
+async def test_tcp_source_connect_subscribes_listeners():
+    source = MeshtasticTcpSource(host="localhost", interface=Mock())
+    await source._connect()
+    try:
+        await _assert_receives_packets(source)
+    finally:
+        _unsubscribe(source)
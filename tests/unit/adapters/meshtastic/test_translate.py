@@ -0,0 +1,43 @@
+from meshcore.adapters.meshtastic.translate import translate_packet
+
+
+def test_translate_telemetry_renames_metric_keys():
+    event = translate_packet({
+        "from": 1234,
+        "decoded": {
+            "portnum": "TELEMETRY_APP",
+            "telemetry": {
+                "deviceMetrics": {"batteryLevel": 85, "airUtilTx": 1.5},
+                "environmentMetrics": {"relativeHumidity": 40.0},
+            },
+        },
+    })
+    assert event.event_type == "telemetry"
+    assert event.payload == {
+        "battery_level": 85, "air_util_tx": 1.5, "humidity": 40.0
+    }
+
+
+def test_translate_unknown_port_does_not_grow_lookup_table():
+    event = translate_packet({
+        "from": 1234,
+        "decoded": {"portnum": "SOME_NEW_APP", "payload": b"\x01"},
+    })
+    assert event.event_type == "unknown"
+    assert event.payload == {"raw": "01"}
+
+
+def test_translate_position_keeps_zero_float_coordinate():
+    event = translate_packet({
+        "from": 1234,
+        "decoded": {
+            "portnum": "POSITION_APP",
+            "position": {
+                "latitude": 0.0,
+                "latitudeI": 377749000,
+                "longitudeI": -1224194000,
+            },
+        },
+    })
+    assert event.payload["latitude"] == 0.0
+    assert abs(event.payload["longitude"] - -122.4194) < 1e-9
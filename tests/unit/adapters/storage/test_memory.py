@@ -0,0 +1,42 @@
+import pytest
+from datetime import datetime, timedelta
+from meshcore.adapters.storage.memory import InMemoryEventStore
+from meshcore.adapters.storage.state_memory import InMemoryStateStore
+from tests.fixtures.factories import EventFactory, StateFactory
+
+
+@pytest.mark.asyncio
+async def test_memory_store_replay_window_handles_out_of_order_appends():
+    store = InMemoryEventStore()
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    for minutes in [0, 10, 5, 20, 15]:
+        await store.append(
+            EventFactory.mesh_event(timestamp=base + timedelta(minutes=minutes))
+        )
+    events = [
+        e async for e in store.replay(
+            since=base + timedelta(minutes=5),
+            until=base + timedelta(minutes=15),
+        )
+    ]
+    assert [e.timestamp.minute for e in events] == [5, 10, 15]
+    everything = [e async for e in store.replay(since=None, until=None)]
+    assert len(everything) == 5
+
+
+@pytest.mark.asyncio
+async def test_memory_state_store_lists_most_recent_first():
+    store = InMemoryStateStore()
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    for node_id, minutes in [("!a", 0), ("!b", 20), ("!c", 10)]:
+        await store.upsert_node(StateFactory.node_state(
+            node_id=node_id, last_seen=base + timedelta(minutes=minutes)
+        ))
+    await store.upsert_node(StateFactory.node_state(
+        node_id="!a", last_seen=base + timedelta(minutes=30)
+    ))
+    await store.delete_node("!c")
+    nodes = await store.list_nodes()
+    assert [n.node_id for n in nodes] == ["!a", "!b"]
+    top = await store.list_nodes(limit=1)
+    assert [n.node_id for n in top] == ["!a"]
@@ -1,115 +1,439 @@
+import asyncio
+import sqlite3
 import pytest
-from datetime import datetime, timedelta
-from meshcore.adapters.storage.sqlite import SqliteEventStore
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from meshcore.adapters.storage.sqlite import SqliteEventQuery, SqliteEventStore
 from meshcore.adapters.storage.state_sqlite import SqliteStateStore
-from meshcore.domain.models import NodeId
 from tests.fixtures.factories import EventFactory, StateFactory
 
 
 @pytest.mark.asyncio
-async def test_event_store_initialization(temp_db_path):
-    store = SqliteEventStore(temp_db_path)
-    assert store is not None
-    store._conn.close()
+async def test_event_store_initialization(event_store):
+    assert event_store is not None
 
 
 @pytest.mark.asyncio
-async def test_event_store_append_and_replay(temp_db_path):
-    store = SqliteEventStore(temp_db_path)
+async def test_event_store_append_and_replay(event_store):
     event = EventFactory.telemetry_event(node_id="!test")
-    await store.append(event)
+    await event_store.append(event)
     events = []
-    async for e in store.replay(since=None, until=None):
+    async for e in event_store.replay(since=None, until=None):
         events.append(e)
     assert len(events) == 1
-    assert events[0].node_id.value == "!test"
-    store._conn.close()
+    assert events[0].node_id == "!test"
 
 
 @pytest.mark.asyncio
-async def test_event_store_multiple_events(temp_db_path):
-    store = SqliteEventStore(temp_db_path)
-    await store.append(EventFactory.telemetry_event(node_id="!node1"))
-    await store.append(EventFactory.text_event(node_id="!node1"))
-    await store.append(EventFactory.telemetry_event(node_id="!node2"))
+async def test_event_store_multiple_events(event_store):
+    await event_store.append(EventFactory.telemetry_event(node_id="!node1"))
+    await event_store.append(EventFactory.text_event(node_id="!node1"))
+    await event_store.append(EventFactory.telemetry_event(node_id="!node2"))
     events = []
-    async for e in store.replay(since=None, until=None):
+    async for e in event_store.replay(since=None, until=None):
         events.append(e)
     assert len(events) == 3
-    store._conn.close()
 
 
 @pytest.mark.asyncio
-async def test_event_store_time_filtering(temp_db_path):
-    store = SqliteEventStore(temp_db_path)
+async def test_event_store_append_many_flags_duplicates(event_store):
+    existing = EventFactory.telemetry_event(node_id="!node1")
+    await event_store.append(existing)
+    fresh = [EventFactory.text_event(node_id="!node1") for _ in range(3)]
+    assert await event_store.append_many(fresh) == [True, True, True]
+    inserted = await event_store.append_many([existing, EventFactory.text_event()])
+    assert inserted == [False, True]
+    events = [e async for e in event_store.replay(since=None, until=None)]
+    assert len(events) == 5
+
+
+@pytest.mark.asyncio
+async def test_event_store_time_filtering(event_store):
     now = datetime.now()
-    await store.append(EventFactory.telemetry_event(
+    await event_store.append(EventFactory.telemetry_event(
         node_id="!test",
         timestamp=now - timedelta(hours=2)
     ))
-    await store.append(EventFactory.telemetry_event(
+    await event_store.append(EventFactory.telemetry_event(
         node_id="!test",
         timestamp=now - timedelta(hours=1)
     ))
     since = now - timedelta(hours=1, minutes=30)
     events = []
-    async for e in store.replay(since=since, until=None):
+    async for e in event_store.replay(since=since, until=None):
         events.append(e)
     assert len(events) == 1
-    store._conn.close()
 
 
 @pytest.mark.asyncio
-async def test_state_store_initialization(temp_db_path):
-    store = SqliteStateStore(temp_db_path)
-    assert store is not None
-    store._conn.close()
+async def test_event_query_search_messages_matches_words(event_store):
+    await event_store.append(EventFactory.text_event(text="hello mesh world"))
+    await event_store.append(EventFactory.text_event(text='say "hi" there'))
+    await event_store.append(EventFactory.telemetry_event())
+    query = SqliteEventQuery(event_store)
+    results = await query.search_messages("mesh")
+    assert [e.payload["text"] for e in results] == ["hello mesh world"]
+    assert len(await query.search_messages('"hi"')) == 1
+    assert await query.search_messages("telemetry") == []
+
+
+@pytest.mark.asyncio
+async def test_event_query_count_and_top_nodes_by_type(event_store):
+    await event_store.append(EventFactory.text_event(node_id="!a"))
+    await event_store.append(EventFactory.text_event(node_id="!b"))
+    await event_store.append(EventFactory.text_event(node_id="!a"))
+    await event_store.append(EventFactory.telemetry_event())
+    query = SqliteEventQuery(event_store)
+    assert await query.count_by_type("text") == 3
+    assert await query.count_by_type("position") == 0
+    top = await query.top_nodes_by_type("text", limit=1)
+    assert top == [("!a", 2)]
+
+
+@pytest.mark.asyncio
+async def test_event_query_telemetry_stats(event_store):
+    now = datetime.now()
+    for minutes, battery in [(3, 80), (2, 90), (1, 85)]:
+        await event_store.append(EventFactory.telemetry_event(
+            node_id="!test",
+            battery_level=battery,
+            timestamp=now - timedelta(minutes=minutes)
+        ))
+    query = SqliteEventQuery(event_store)
+    since = now - timedelta(hours=1)
+    assert await query.get_telemetry_stats(
+        "!test", "battery_level", since
+    ) == (80.0, 90.0, 85.0, 85.0, 3)
+    assert await query.get_telemetry_stats(
+        "!test", "temperature", since
+    ) == (None, None, None, None, 0)
+
+
+@pytest.mark.asyncio
+async def test_event_query_metric_series(event_store):
+    now = datetime.now()
+    await event_store.append(EventFactory.telemetry_event(
+        node_id="!test", battery_level=80, voltage=None,
+        channel_utilization=None, timestamp=now - timedelta(minutes=2)
+    ))
+    await event_store.append(EventFactory.telemetry_event(
+        node_id="!test", battery_level=None, voltage=4.1,
+        channel_utilization=None, timestamp=now - timedelta(minutes=1)
+    ))
+    query = SqliteEventQuery(event_store)
+    since = now - timedelta(hours=1)
+    series = await query.get_metric_series("!test", "battery_level", since)
+    assert [value for _, value in series] == [80.0]
+    points = await query.get_all_metric_series("!test", since)
+    assert [(key, value) for _, key, value in points] == [
+        ("battery_level", 80.0), ("voltage", 4.1)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_event_query_conversation_merges_both_nodes(event_store):
+    now = datetime.now()
+    for minutes, node_id in [(4, "!a"), (3, "!b"), (2, "!c"), (1, "!a")]:
+        await event_store.append(EventFactory.text_event(
+            node_id=node_id, text=f"{node_id} {minutes}",
+            timestamp=now - timedelta(minutes=minutes)
+        ))
+    await event_store.append(EventFactory.telemetry_event(node_id="!a"))
+    query = SqliteEventQuery(event_store)
+    results = await query.query_conversation("!a", "!b")
+    assert [e.payload["text"] for e in results] == ["!a 1", "!b 3", "!a 4"]
+    limited = await query.query_conversation("!a", "!b", limit=2)
+    assert [e.payload["text"] for e in limited] == ["!a 1", "!b 3"]
+    recent = await query.query_conversation(
+        "!a", "!b", since=now - timedelta(minutes=3, seconds=30)
+    )
+    assert [e.payload["text"] for e in recent] == ["!a 1", "!b 3"]
+
+
+@pytest.mark.asyncio
+async def test_event_store_in_memory_shares_state_with_readers():
+    store = SqliteEventStore(in_memory=True)
+    event = EventFactory.text_event(text="ephemeral")
+    assert await store.append(event)
+    replayed = [e async for e in store.replay()]
+    assert [e.event_id for e in replayed] == [event.event_id]
+    assert await store.event_exists(event.event_id)
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_open_replays_do_not_hold_pooled_readers(temp_db_path):
+    store = SqliteEventStore(temp_db_path, readers=1)
+    events = [EventFactory.text_event() for _ in range(3)]
+    await store.append_many(events)
+    replays = [store.replay() for _ in range(3)]
+    firsts = await asyncio.wait_for(
+        asyncio.gather(*(anext(replay) for replay in replays)), timeout=5
+    )
+    assert [e.event_id for e in firsts] == [events[0].event_id] * 3
+    assert await asyncio.wait_for(
+        store.event_exists(events[1].event_id), timeout=5
+    )
+    for replay in replays:
+        await replay.aclose()
+    await store.close()
+
+
+_BASELINE_EVENTS_DDL = """
+    CREATE TABLE events (
+        id TEXT PRIMARY KEY,
+        node_id TEXT NOT NULL,
+        event_type TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        ingested_at TEXT NOT NULL,
+        payload_json TEXT NOT NULL,
+        provenance_json TEXT NOT NULL
+    )
+"""
+
+
+def _baseline_events_db(path, rows):
+    """An events database in the original TEXT-column schema"""
+    conn = sqlite3.connect(path)
+    conn.execute(_BASELINE_EVENTS_DDL)
+    conn.executemany(
+        "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                str(event_id), node_id, "text", ts.isoformat(),
+                ts.isoformat(), f'{{"text": "{text}"}}', '{"source": "test"}',
+            )
+            for event_id, node_id, ts, text in rows
+        ],
+    )
+    conn.commit()
+    return conn
+
+
+def _table_names(path):
+    conn = sqlite3.connect(path)
+    try:
+        return {
+            row[0] for row in
+            conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+    finally:
+        conn.close()
+
+
+def _baseline_rows(count):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        (uuid4(), f"!node{i}", start + timedelta(minutes=i), f"hello {i}")
+        for i in range(count)
+    ]
 
 
 @pytest.mark.asyncio
-async def test_state_store_upsert_and_get(temp_db_path):
-    store = SqliteStateStore(temp_db_path)
+async def test_event_store_migrates_baseline_schema(tmp_path):
+    path = str(tmp_path / "events.db")
+    rows = _baseline_rows(3)
+    _baseline_events_db(path, rows).close()
+
+    async with SqliteEventStore(path) as store:
+        events = [e async for e in store.replay(since=None, until=None)]
+        found = await SqliteEventQuery(store).search_messages("hello")
+
+    assert [(e.event_id, e.node_id, e.timestamp) for e in events] == [
+        (event_id, node_id, ts) for event_id, node_id, ts, _ in rows
+    ]
+    assert events[0].payload == {"text": "hello 0"}
+    assert events[0].provenance == {"source": "test"}
+    # The text index was rebuilt against the new ids
+    assert len(found) == 3
+    assert "events_legacy" not in _table_names(path)
+
+
+@pytest.mark.asyncio
+async def test_event_store_resumes_interrupted_migration(tmp_path):
+    path = str(tmp_path / "events.db")
+    rows = _baseline_rows(3)
+    conn = _baseline_events_db(path, rows)
+    # Where an older, non-transactional migration could stop: the rename
+    # committed, the new table never created
+    conn.execute("ALTER TABLE events RENAME TO events_legacy")
+    conn.commit()
+    conn.close()
+
+    async with SqliteEventStore(path) as store:
+        events = [e async for e in store.replay(since=None, until=None)]
+
+    assert [e.event_id for e in events] == [row[0] for row in rows]
+    assert "events_legacy" not in _table_names(path)
+
+
+@pytest.mark.asyncio
+async def test_event_store_rolls_back_a_failed_migration(tmp_path):
+    path = str(tmp_path / "events.db")
+    conn = _baseline_events_db(path, _baseline_rows(2))
+    # A row the copy can't convert fails the migration partway through
+    conn.execute(
+        "INSERT INTO events VALUES "
+        "('not-a-uuid', '!bad', 'text', 'x', 'x', '{}', '{}')"
+    )
+    conn.commit()
+    conn.close()
+
+    with pytest.raises(ValueError):
+        async with SqliteEventStore(path):
+            pass
+
+    # Nothing was renamed or half-copied; the original table is intact
+    assert "events_legacy" not in _table_names(path)
+    conn = sqlite3.connect(path)
+    try:
+        columns = {col[1] for col in conn.execute("PRAGMA table_info(events)")}
+        count = conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+    finally:
+        conn.close()
+    assert "payload_json" in columns
+    assert count == 3
+
+
+@pytest.mark.asyncio
+async def test_state_store_shares_in_memory_database(memory_db_uri):
+    event_store = SqliteEventStore(memory_db_uri)
+    state_store = SqliteStateStore(memory_db_uri)
+    await event_store.append(EventFactory.text_event(node_id="!shared"))
+    await state_store.upsert_node(StateFactory.node_state(node_id="!shared"))
+    assert (await state_store.get_node("!shared")).node_id == "!shared"
+    assert [e.node_id async for e in event_store.replay()] == ["!shared"]
+    await state_store.close()
+    await event_store.close()
+
+
+@pytest.mark.asyncio
+async def test_state_store_initialization(state_store):
+    assert state_store is not None
+
+
+@pytest.mark.asyncio
+async def test_state_store_upsert_and_get(state_store):
     state = StateFactory.node_state(node_id="!test")
-    await store.upsert_node(state)
-    retrieved = await store.get_node(NodeId(value="!test"))
+    await state_store.upsert_node(state)
+    retrieved = await state_store.get_node("!test")
     assert retrieved is not None
-    assert retrieved.node_id.value == "!test"
-    store._conn.close()
+    assert retrieved.node_id == "!test"
 
 
 @pytest.mark.asyncio
-async def test_state_store_list_nodes(temp_db_path):
-    store = SqliteStateStore(temp_db_path)
-    await store.upsert_node(StateFactory.node_state(node_id="!node1"))
-    await store.upsert_node(StateFactory.node_state(node_id="!node2"))
-    states = await store.list_nodes()
+async def test_state_store_list_nodes(state_store):
+    await state_store.upsert_nodes([
+        StateFactory.node_state(node_id="!node1"),
+        StateFactory.node_state(node_id="!node2"),
+    ])
+    states = await state_store.list_nodes()
     assert len(states) == 2
-    store._conn.close()
 
 
 @pytest.mark.asyncio
-async def test_state_store_update_existing(temp_db_path):
-    store = SqliteStateStore(temp_db_path)
+async def test_state_store_update_existing(state_store):
     state = StateFactory.node_state(
         node_id="!test",
         last_telemetry={"battery_level": 85}
     )
-    await store.upsert_node(state)
+    await state_store.upsert_node(state)
     state = state.model_copy(update={
         "last_telemetry": {"battery_level": 75}
     })
-    await store.upsert_node(state)
-    retrieved = await store.get_node(NodeId(value="!test"))
+    await state_store.upsert_node(state)
+    retrieved = await state_store.get_node("!test")
     assert retrieved.last_telemetry["battery_level"] == 75
-    store._conn.close()
 
 
 @pytest.mark.asyncio
-async def test_state_store_delete_node(temp_db_path):
-    store = SqliteStateStore(temp_db_path)
+async def test_state_store_delete_node(state_store):
     state = StateFactory.node_state(node_id="!test")
-    await store.upsert_node(state)
-    await store.delete_node(NodeId(value="!test"))
-    retrieved = await store.get_node(NodeId(value="!test"))
+    await state_store.upsert_node(state)
+    await state_store.delete_node("!test")
+    retrieved = await state_store.get_node("!test")
     assert retrieved is None
-    store._conn.close()
+
+
+_BASELINE_NODE_STATES_DDL = """
+    CREATE TABLE node_states (
+        node_id TEXT PRIMARY KEY,
+        long_name TEXT,
+        short_name TEXT,
+        last_seen TEXT NOT NULL,
+        first_seen TEXT NOT NULL,
+        event_count INTEGER NOT NULL,
+        last_telemetry_json TEXT,
+        last_position_json TEXT,
+        last_text TEXT,
+        last_snr REAL,
+        last_rssi REAL,
+        last_hops_away INTEGER
+    )
+"""
+
+
+def _baseline_state_db(path, first_seen, last_seen):
+    """A node_states database with ISO-8601 TEXT seen times"""
+    conn = sqlite3.connect(path)
+    conn.execute(_BASELINE_NODE_STATES_DDL)
+    conn.execute(
+        "INSERT INTO node_states VALUES "
+        "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            "!test", "Test Node", "TST", last_seen.isoformat(),
+            first_seen.isoformat(), 7, '{"battery_level": 85}', None,
+            "hi", 5.5, -90.0, 2,
+        ),
+    )
+    conn.commit()
+    return conn
+
+
+def _seen_column_type(path):
+    conn = sqlite3.connect(path)
+    try:
+        return next(
+            col[2] for col in conn.execute("PRAGMA table_info(node_states)")
+            if col[1] == "last_seen"
+        )
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_state_store_migrates_iso_timestamps(tmp_path):
+    path = str(tmp_path / "state.db")
+    first_seen = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    last_seen = first_seen + timedelta(hours=3)
+    _baseline_state_db(path, first_seen, last_seen).close()
+
+    async with SqliteStateStore(path) as store:
+        node = await store.get_node("!test")
+        nodes = await store.list_nodes()
+
+    assert node.first_seen == first_seen
+    assert node.last_seen == last_seen
+    assert node.event_count == 7
+    assert node.last_telemetry == {"battery_level": 85}
+    assert node.last_hops_away == 2
+    assert [n.node_id for n in nodes] == ["!test"]
+    assert _seen_column_type(path) == "INTEGER"
+    assert "node_states_legacy" not in _table_names(path)
+
+
+@pytest.mark.asyncio
+async def test_state_store_resumes_interrupted_timestamp_migration(tmp_path):
+    path = str(tmp_path / "state.db")
+    first_seen = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    conn = _baseline_state_db(path, first_seen, first_seen)
+    conn.execute("ALTER TABLE node_states RENAME TO node_states_legacy")
+    conn.commit()
+    conn.close()
+
+    async with SqliteStateStore(path) as store:
+        node = await store.get_node("!test")
+
+    assert node.last_seen == first_seen
+    assert _seen_column_type(path) == "INTEGER"
+    assert "node_states_legacy" not in _table_names(path)
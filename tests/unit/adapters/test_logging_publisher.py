@@ -0,0 +1,66 @@
+import asyncio
+import io
+import json
+import threading
+import pytest
+from meshcore.adapters.pubsub.logging import LoggingPublisher
+from tests.fixtures.factories import EventFactory
+
+
+@pytest.mark.asyncio
+async def test_logging_publisher_buffers_until_close():
+    stream = io.BytesIO()
+    events = [EventFactory.text_event(text=f"msg {i}") for i in range(3)]
+    async with LoggingPublisher(stream=stream, flush_interval=60) as publisher:
+        for event in events:
+            await publisher.publish(event)
+        assert stream.getvalue() == b""
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["payload"]["text"] for line in lines] == [
+        "msg 0", "msg 1", "msg 2"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_logging_publisher_flushes_every_n_events():
+    stream = io.BytesIO()
+    publisher = LoggingPublisher(stream=stream, flush_every=2, flush_interval=60)
+    for i in range(3):
+        await publisher.publish(EventFactory.text_event(text=f"msg {i}"))
+    assert len(stream.getvalue().splitlines()) == 2
+    await publisher.close()
+    assert len(stream.getvalue().splitlines()) == 3
+
+
+class _SlowFirstWriteStream(io.BytesIO):
+    """Stalls the first write, so a second flush overlaps it"""
+
+    def __init__(self):
+        super().__init__()
+        self._first = True
+        self.release = threading.Event()
+
+    def write(self, data):
+        if self._first:
+            self._first = False
+            self.release.wait(5)
+        return super().write(data)
+
+
+@pytest.mark.asyncio
+async def test_logging_publisher_overlapping_flushes_keep_order():
+    stream = _SlowFirstWriteStream()
+    publisher = LoggingPublisher(stream=stream, flush_interval=60)
+    await publisher.publish(EventFactory.text_event(text="first"))
+    first = asyncio.create_task(publisher.flush())
+    await asyncio.sleep(0.01)
+    await publisher.publish(EventFactory.text_event(text="second"))
+    second = asyncio.create_task(publisher.flush())
+    await asyncio.sleep(0.01)
+    stream.release.set()
+    await asyncio.gather(first, second)
+    await publisher.close()
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["payload"]["text"] for line in lines] == [
+        "first", "second"
+    ]
@@ -1,63 +1,153 @@
-import pytest
+import asyncio
 import json
+import pytest
 from unittest.mock import Mock, patch
-from meshcore.adapters.pubsub.mqtt import MQTTEventPublisher
+from meshcore.adapters.pubsub import mqtt
+from meshcore.adapters.pubsub.mqtt import MqttEventPublisher, MqttPublisherPool
 from tests.fixtures.factories import EventFactory
 
 
-def test_mqtt_publisher_initialization():
-    publisher = MQTTEventPublisher(broker="localhost", port=1883, topic="test/topic")
-    assert publisher.broker == "localhost"
-    assert publisher.port == 1883
-    assert publisher.topic == "test/topic"
-
-
-def test_mqtt_publisher_connect(mock_mqtt_client):
-    with patch('paho.mqtt.client.Client', return_value=mock_mqtt_client):
-        publisher = MQTTEventPublisher()
-        publisher.connect()
-        mock_mqtt_client.connect.assert_called_once()
-        mock_mqtt_client.loop_start.assert_called_once()
-
-
-def test_mqtt_publisher_publish_event(mock_mqtt_client):
-    with patch('paho.mqtt.client.Client', return_value=mock_mqtt_client):
-        publisher = MQTTEventPublisher()
-        publisher.connect()
-        event = EventFactory.node_discovered(node_id="!test")
-        publisher.publish(event)
-        mock_mqtt_client.publish.assert_called_once()
-        call_args = mock_mqtt_client.publish.call_args
-        assert call_args[0][0] == "meshcore/events"
-        payload = json.loads(call_args[0][1])
-        assert payload["node_id"] == "!test"
-
-
-def test_mqtt_publisher_disconnect(mock_mqtt_client):
-    with patch('paho.mqtt.client.Client', return_value=mock_mqtt_client):
-        publisher = MQTTEventPublisher()
-        publisher.connect()
-        publisher.disconnect()
-        mock_mqtt_client.loop_stop.assert_called_once()
-
-
-def test_mqtt_publisher_custom_topic(mock_mqtt_client):
-    with patch('paho.mqtt.client.Client', return_value=mock_mqtt_client):
-        publisher = MQTTEventPublisher(topic="custom/topic")
-        publisher.connect()
-        event = EventFactory.message_received()
-        publisher.publish(event)
-        call_args = mock_mqtt_client.publish.call_args
-        assert call_args[0][0] == "custom/topic"
-
-
-def test_mqtt_publisher_serializes_datetime(mock_mqtt_client):
-    with patch('paho.mqtt.client.Client', return_value=mock_mqtt_client):
-        publisher = MQTTEventPublisher()
-        publisher.connect()
-        event = EventFactory.telemetry_received()
-        publisher.publish(event)
-        call_args = mock_mqtt_client.publish.call_args
-        payload = json.loads(call_args[0][1])
-        assert "timestamp" in payload
+def _fake_client():
+    client = Mock()
+    client.publish.return_value = Mock(rc=0)
+    # The broker accepts straight away: loop_start fires on_connect
+    client.loop_start.side_effect = lambda: client.on_connect(
+        client, None, None, 0
+    )
+    return client
+
+
+@pytest.fixture
+def paho_clients():
+    clients = []
+
+    def make(*args, **kwargs):
+        clients.append(_fake_client())
+        return clients[-1]
+
+    with patch("paho.mqtt.client.Client", side_effect=make):
+        yield clients
+    mqtt._shared_clients.clear()
+
+
+def _published(client):
+    return [(c.args[0], json.loads(c.args[1])) for c in client.publish.call_args_list]
+
+
+@pytest.mark.asyncio
+async def test_publish_fans_event_out_to_every_topic(paho_clients):
+    event = EventFactory.text_event(node_id="!abc", text="hi")
+    async with MqttEventPublisher(topic="mesh") as publisher:
+        await publisher.publish(event)
+    [client] = paho_clients
+    published = _published(client)
+    assert [topic for topic, _ in published] == [
+        "mesh/all",
+        "mesh/type/text",
+        "mesh/node/!abc",
+        "mesh/node/!abc/type/text",
+    ]
+    assert all(payload["payload"]["text"] == "hi" for _, payload in published)
+    assert client.publish.call_args.args[1] == event.json_bytes()
+    client.disconnect.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_outbox_is_drained_in_batches(paho_clients):
+    sizes = []
+    original = MqttEventPublisher._publish_batch
+
+    def record(self, messages):
+        sizes.append(len(messages))
+        original(self, messages)
+
+    with patch.object(MqttEventPublisher, "_publish_batch", record):
+        async with MqttEventPublisher(batch_size=2) as publisher:
+            for i in range(5):
+                await publisher.publish(EventFactory.text_event(text=str(i)))
+    # Four topics per event
+    assert sizes == [8, 8, 4]
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_the_outbox(paho_clients):
+    publisher = MqttEventPublisher()
+    await publisher.__aenter__()
+    for i in range(3):
+        await publisher.publish(EventFactory.text_event(text=str(i)))
+    [client] = paho_clients
+    client.publish.assert_not_called()
+    await publisher.close()
+    texts = [payload["payload"]["text"] for _, payload in _published(client)]
+    assert texts[::4] == ["0", "1", "2"]
+    client.loop_stop.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_full_outbox_drops_oldest_and_counts(paho_clients):
+    publisher = MqttEventPublisher(max_outbox=2)
+    for i in range(4):
+        await publisher.publish(EventFactory.text_event(text=str(i)))
+    assert publisher.dropped == 2
+    await publisher.__aenter__()
+    await publisher.close()
+    texts = [p["payload"]["text"] for _, p in _published(paho_clients[0])]
+    assert texts[::4] == ["2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_publish_reconnects_after_disconnect(paho_clients):
+    async with MqttEventPublisher() as publisher:
+        [client] = paho_clients
+        client.on_disconnect(client, None, 1)
+        await publisher.publish(EventFactory.text_event(text="again"))
+        await asyncio.wait_for(publisher._outbox.join(), timeout=1)
+    assert client.connect.call_count == 2
+    assert _published(client)[0][1]["payload"]["text"] == "again"
+
+
+@pytest.mark.asyncio
+async def test_shared_client_reconnects_once_for_all_publishers(paho_clients):
+    first = MqttEventPublisher(topic="a")
+    second = MqttEventPublisher(topic="b")
+    await asyncio.gather(first.__aenter__(), second.__aenter__())
+    [client] = paho_clients
+    assert client.connect.call_count == 1
+    client.on_disconnect(client, None, 1)
+    await asyncio.gather(first._ensure_connected(), second._ensure_connected())
+    assert client.connect.call_count == 2
+    await first.close()
+    client.disconnect.assert_not_called()
+    await second.close()
+    client.disconnect.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_reconnect_drops_and_counts_the_batch(paho_clients):
+    publisher = MqttEventPublisher(max_retries=1, initial_retry_delay=0)
+    await publisher.__aenter__()
+    [client] = paho_clients
+    client.connect.side_effect = OSError("broker down")
+    client.on_disconnect(client, None, 1)
+    await publisher.publish(EventFactory.text_event())
+    await asyncio.wait_for(publisher._outbox.join(), timeout=1)
+    assert publisher.dropped == 1
+    client.publish.assert_not_called()
+    await publisher.close()
+
 
+@pytest.mark.asyncio
+async def test_pool_keeps_each_node_on_one_connection(paho_clients):
+    async with MqttPublisherPool(size=3, client_id="pool") as pool:
+        for node_id in ("!a", "!b", "!c", "!a", "!b", "!a"):
+            await pool.publish(EventFactory.text_event(node_id=node_id))
+    assert len(paho_clients) == 3
+    nodes_per_client = [
+        {payload["node_id"] for _, payload in _published(client)}
+        for client in paho_clients
+    ]
+    seen = [node for nodes in nodes_per_client for node in nodes]
+    assert sorted(seen) == ["!a", "!b", "!c"]
+    assert sum(client.publish.call_count for client in paho_clients) == 6 * 4
+    for client in paho_clients:
+        client.disconnect.assert_called_once()
@@ -0,0 +1,2 @@
+"""UI adapter tests"""
+
@@ -0,0 +1,43 @@
+import pytest
+from unittest.mock import patch
+from textual.app import App
+from meshcore.adapters.ui.widgets import NodeRow, NodeTable
+
+
+class _TableApp(App):
+    def compose(self):
+        yield NodeTable()
+
+
+def _row(node_id, last_seen="0s ago", events="1"):
+    return NodeRow(node_id, last_seen, events, "", "", "", "")
+
+
+def _shown(table):
+    return [table.get_row_at(i)[:3] for i in range(table.row_count)]
+
+
+@pytest.mark.asyncio
+async def test_node_table_reorders_rows_without_rebuilding():
+    app = _TableApp()
+    async with app.run_test():
+        table = app.query_one(NodeTable)
+        table.update_nodes([_row("!a", "1s ago"), _row("!b", "5s ago")])
+        with patch.object(table, "clear") as clear:
+            # !b's traffic moves it to the top; !c is new
+            table.update_nodes([
+                _row("!b", "0s ago", "2"),
+                _row("!a", "2s ago"),
+                _row("!c", "9s ago"),
+            ])
+            assert _shown(table) == [
+                ["!b", "0s ago", "2"],
+                ["!a", "2s ago", "1"],
+                ["!c", "9s ago", "1"],
+            ]
+            table.update_nodes([_row("!c", "0s ago"), _row("!b", "1s ago")])
+            assert _shown(table) == [
+                ["!c", "0s ago", "1"],
+                ["!b", "1s ago", "1"],
+            ]
+        clear.assert_not_called()
@@ -0,0 +1,22 @@
+import logging
+from meshcore.application.correlation import CorrelationFilter, current_event
+
+
+def _record():
+    return logging.LogRecord("test", logging.INFO, __file__, 1, "msg", None, None)
+
+
+def test_filter_stamps_current_event_id(mesh_event_telemetry):
+    token = current_event.set(mesh_event_telemetry)
+    try:
+        record = _record()
+        assert CorrelationFilter().filter(record)
+    finally:
+        current_event.reset(token)
+    assert record.correlation_id == str(mesh_event_telemetry.event_id)
+
+
+def test_filter_without_event_uses_placeholder():
+    record = _record()
+    CorrelationFilter().filter(record)
+    assert record.correlation_id == "-"
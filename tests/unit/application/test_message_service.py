@@ -1,73 +1,70 @@
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from meshcore.adapters.storage.sqlite import SqliteEventQuery
 from meshcore.application.message_service import MessageQueryService, Message
 from tests.fixtures.factories import EventFactory
 
 
-def test_message_query_service_initialization(mock_event_store):
-    service = MessageQueryService(mock_event_store)
-    assert service.event_store == mock_event_store
+@pytest.fixture
+async def sqlite_messages(event_store):
+    """A MessageQueryService over a real SQLite store, holding texts from
+    !a (3), !b (1) and !c (1, outside the default 7-day window)"""
+    now = datetime.now(timezone.utc)
+    for minutes, node_id, text in [
+        (4, "!a", "hello mesh"),
+        (3, "!b", "hi back"),
+        (2, "!a", "mesh check"),
+        (1, "!a", "bye"),
+    ]:
+        await event_store.append(EventFactory.text_event(
+            node_id=node_id, text=text,
+            timestamp=now - timedelta(minutes=minutes)
+        ))
+    await event_store.append(EventFactory.text_event(
+        node_id="!c", text="old mesh news", timestamp=now - timedelta(days=8)
+    ))
+    await event_store.append(EventFactory.telemetry_event(node_id="!a"))
+    return MessageQueryService(SqliteEventQuery(event_store))
 
 
-def test_get_recent_messages_returns_sorted_list(mock_event_store):
-    messages = [
-        EventFactory.message_received(text="First", timestamp=datetime.now() - timedelta(minutes=3)),
-        EventFactory.message_received(text="Second", timestamp=datetime.now() - timedelta(minutes=2)),
-        EventFactory.message_received(text="Third", timestamp=datetime.now() - timedelta(minutes=1))
-    ]
-    mock_event_store.query_by_type.return_value = messages
-    service = MessageQueryService(mock_event_store)
-    results = service.get_recent_messages(limit=10)
-    assert len(results) == 3
-    assert results[0].text == "Third"
-    assert results[-1].text == "First"
+@pytest.mark.asyncio
+async def test_sqlite_get_recent_messages_newest_first(sqlite_messages):
+    results = await sqlite_messages.get_recent_messages(limit=3)
+    assert [m.text for m in results] == ["bye", "mesh check", "hi back"]
+    assert all(isinstance(m, Message) for m in results)
+    assert results[0].from_node == "!a"
 
 
-def test_get_recent_messages_respects_limit(mock_event_store):
-    messages = [
-        EventFactory.message_received(text=f"Message {i}")
-        for i in range(10)
-    ]
-    mock_event_store.query_by_type.return_value = messages
-    service = MessageQueryService(mock_event_store)
-    results = service.get_recent_messages(limit=5)
-    assert len(results) == 5
+@pytest.mark.asyncio
+async def test_sqlite_count_messages_and_top_senders(sqlite_messages):
+    assert await sqlite_messages.count_messages() == 4
+    assert await sqlite_messages.count_messages(
+        since=datetime.now(timezone.utc) - timedelta(days=30)
+    ) == 5
+    assert await sqlite_messages.top_senders() == [("!a", 3), ("!b", 1)]
+    assert await sqlite_messages.top_senders(limit=1) == [("!a", 3)]
 
 
-def test_get_messages_by_node_filters_correctly(mock_event_store):
-    messages = [
-        EventFactory.message_received(from_id="!node1", text="From node1"),
-        EventFactory.message_received(to_id="!node1", text="To node1"),
-        EventFactory.message_received(from_id="!node2", text="From node2")
-    ]
-    mock_event_store.query_by_type.return_value = messages
-    service = MessageQueryService(mock_event_store)
-    results = service.get_messages_by_node("!node1")
-    assert len(results) == 2
+@pytest.mark.asyncio
+async def test_sqlite_get_messages_by_node(sqlite_messages):
+    results = await sqlite_messages.get_messages_by_node("!a", limit=2)
+    assert [m.text for m in results] == ["bye", "mesh check"]
+    assert await sqlite_messages.get_messages_by_node("!z") == []
 
 
-def test_search_messages_filters_text(mock_event_store):
-    messages = [
-        EventFactory.message_received(text="Hello world"),
-        EventFactory.message_received(text="Goodbye world"),
-        EventFactory.message_received(text="Random text")
+@pytest.mark.asyncio
+async def test_sqlite_search_messages(sqlite_messages):
+    results = await sqlite_messages.search_messages("mesh")
+    assert [m.text for m in results] == [
+        "mesh check", "hello mesh", "old mesh news"
     ]
-    mock_event_store.query_by_type.return_value = messages
-    service = MessageQueryService(mock_event_store)
-    results = service.search_messages("world")
-    assert len(results) == 2
+    assert await sqlite_messages.search_messages("   ") == []
 
 
-def test_get_conversation_returns_bidirectional_messages(mock_event_store):
-    node1 = "!node1"
-    node2 = "!node2"
-    messages = [
-        EventFactory.message_received(from_id=node1, to_id=node2, text="Hi"),
-        EventFactory.message_received(from_id=node2, to_id=node1, text="Hello"),
-        EventFactory.message_received(from_id="!node3", to_id=node1, text="Other")
+@pytest.mark.asyncio
+async def test_sqlite_get_conversation(sqlite_messages):
+    results = await sqlite_messages.get_conversation("!a", "!b", limit=3)
+    assert [(m.from_node, m.text) for m in results] == [
+        ("!a", "bye"), ("!a", "mesh check"), ("!b", "hi back")
     ]
-    mock_event_store.query_by_type.return_value = messages
-    service = MessageQueryService(mock_event_store)
-    results = service.get_conversation(node1, node2)
-    assert len(results) == 2
-
+    assert len(await sqlite_messages.get_conversation("!b", "!c")) == 2
@@ -1,6 +1,5 @@
 import pytest
-from datetime import datetime, timedelta
-from unittest.mock import AsyncMock
+from datetime import timedelta
 from meshcore.application.state_projection import StateProjection
 from tests.fixtures.factories import EventFactory, StateFactory
 
@@ -8,25 +7,22 @@ from tests.fixtures.factories import EventFactory, StateFactory
 @pytest.mark.asyncio
 async def test_projection_creates_state_from_event(mock_state_store):
     projection = StateProjection(mock_state_store)
-    mock_state_store.get_node = AsyncMock(return_value=None)
-    mock_state_store.upsert_node = AsyncMock()
     event = EventFactory.telemetry_event(node_id="!test")
     await projection.project(event)
     mock_state_store.upsert_node.assert_called_once()
-    saved_state = mock_state_store.upsert_node.call_args[0][0]
-    assert saved_state.node_id.value == "!test"
+    saved_state = mock_state_store.upsert_node.call_args.args[0]
+    assert saved_state.node_id == "!test"
 
 
 @pytest.mark.asyncio
 async def test_projection_updates_existing_state_with_telemetry(mock_state_store):
     projection = StateProjection(mock_state_store)
     existing_state = StateFactory.node_state(node_id="!test")
-    mock_state_store.get_node = AsyncMock(return_value=existing_state)
-    mock_state_store.upsert_node = AsyncMock()
+    mock_state_store.get_node.return_value = existing_state
     event = EventFactory.telemetry_event(node_id="!test", battery_level=75)
     await projection.project(event)
     mock_state_store.upsert_node.assert_called_once()
-    saved_state = mock_state_store.upsert_node.call_args[0][0]
+    saved_state = mock_state_store.upsert_node.call_args.args[0]
     assert saved_state.last_telemetry["battery_level"] == 75
 
 
@@ -34,8 +30,7 @@ async def test_projection_updates_existing_state_with_telemetry(mock_state_store
 async def test_projection_updates_position(mock_state_store):
     projection = StateProjection(mock_state_store)
     existing_state = StateFactory.node_state(node_id="!test")
-    mock_state_store.get_node = AsyncMock(return_value=existing_state)
-    mock_state_store.upsert_node = AsyncMock()
+    mock_state_store.get_node.return_value = existing_state
     event = EventFactory.position_event(
         node_id="!test",
         latitude=40.7128,
@@ -43,22 +38,21 @@ async def test_projection_updates_position(mock_state_store):
     )
     await projection.project(event)
     mock_state_store.upsert_node.assert_called_once()
-    saved_state = mock_state_store.upsert_node.call_args[0][0]
+    saved_state = mock_state_store.upsert_node.call_args.args[0]
     assert saved_state.last_position["latitude"] == 40.7128
     assert saved_state.last_position["longitude"] == -74.0060
 
 
 @pytest.mark.asyncio
-async def test_projection_updates_last_seen(mock_state_store):
+async def test_projection_updates_last_seen(mock_state_store, sample_timestamp):
     projection = StateProjection(mock_state_store)
-    old_time = datetime.now() - timedelta(hours=1)
+    old_time = sample_timestamp - timedelta(hours=1)
     existing_state = StateFactory.node_state(node_id="!test", last_seen=old_time)
-    mock_state_store.get_node = AsyncMock(return_value=existing_state)
-    mock_state_store.upsert_node = AsyncMock()
-    new_time = datetime.now()
+    mock_state_store.get_node.return_value = existing_state
+    new_time = sample_timestamp
     event = EventFactory.telemetry_event(node_id="!test", timestamp=new_time)
     await projection.project(event)
-    saved_state = mock_state_store.upsert_node.call_args[0][0]
+    saved_state = mock_state_store.upsert_node.call_args.args[0]
     assert saved_state.last_seen == new_time
 
 
@@ -66,10 +60,66 @@ async def test_projection_updates_last_seen(mock_state_store):
 async def test_projection_increments_event_count(mock_state_store):
     projection = StateProjection(mock_state_store)
     existing_state = StateFactory.node_state(node_id="!test", event_count=5)
-    mock_state_store.get_node = AsyncMock(return_value=existing_state)
-    mock_state_store.upsert_node = AsyncMock()
+    mock_state_store.get_node.return_value = existing_state
     event = EventFactory.telemetry_event(node_id="!test")
     await projection.project(event)
-    saved_state = mock_state_store.upsert_node.call_args[0][0]
+    saved_state = mock_state_store.upsert_node.call_args.args[0]
     assert saved_state.event_count == 6
 
+
+@pytest.mark.asyncio
+async def test_project_many_folds_events_per_node(mock_state_store):
+    projection = StateProjection(mock_state_store)
+    await projection.project_many([
+        EventFactory.telemetry_event(node_id="!a", battery_level=70),
+        EventFactory.text_event(node_id="!b", text="hi"),
+        EventFactory.text_event(node_id="!a", text="hello"),
+    ])
+    mock_state_store.upsert_nodes.assert_called_once()
+    states = {
+        s.node_id: s
+        for s in mock_state_store.upsert_nodes.call_args.args[0]
+    }
+    assert states["!a"].event_count == 2
+    assert states["!a"].last_telemetry["battery_level"] == 70
+    assert states["!a"].last_text == "hello"
+    assert states["!b"].event_count == 1
+    assert mock_state_store.get_node.await_count == 2
+    await projection.project_many([EventFactory.text_event(node_id="!a")])
+    assert mock_state_store.get_node.await_count == 2
+    assert mock_state_store.upsert_nodes.call_args.args[0][0].event_count == 3
+
+
+@pytest.mark.asyncio
+async def test_project_many_keeps_cache_when_upsert_fails(mock_state_store):
+    projection = StateProjection(mock_state_store)
+    await projection.project_many([
+        EventFactory.text_event(node_id="!a", text="first"),
+    ])
+    mock_state_store.upsert_nodes.side_effect = RuntimeError("disk full")
+    with pytest.raises(RuntimeError):
+        await projection.project_many([
+            EventFactory.text_event(node_id="!a", text="lost"),
+            EventFactory.text_event(node_id="!a", text="lost again"),
+        ])
+    mock_state_store.upsert_nodes.side_effect = None
+    await projection.project_many([
+        EventFactory.text_event(node_id="!a", text="second"),
+    ])
+    saved = mock_state_store.upsert_nodes.call_args.args[0][0]
+    # The failed batch never reached the store, so it isn't counted
+    assert saved.event_count == 2
+    assert saved.last_text == "second"
+    assert mock_state_store.get_node.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_project_keeps_cache_when_upsert_fails(mock_state_store):
+    projection = StateProjection(mock_state_store)
+    await projection.project(EventFactory.text_event(node_id="!a"))
+    mock_state_store.upsert_node.side_effect = RuntimeError("disk full")
+    with pytest.raises(RuntimeError):
+        await projection.project(EventFactory.text_event(node_id="!a"))
+    mock_state_store.upsert_node.side_effect = None
+    await projection.project(EventFactory.text_event(node_id="!a"))
+    assert mock_state_store.upsert_node.call_args.args[0].event_count == 2
@@ -0,0 +1,70 @@
+import pytest
+from meshcore.adapters.storage.memory import InMemoryEventStore
+from meshcore.adapters.storage.sqlite import SqliteEventStore
+from meshcore.adapters.storage.state_memory import InMemoryStateStore
+from meshcore.application.services import MeshEventService
+from meshcore.application.state_projection import StateProjection
+from tests.fixtures.factories import EventFactory
+
+
+class ListSource:
+    def __init__(self, events):
+        self._events = events
+
+    async def events(self):
+        for event in self._events:
+            yield event
+
+
+class ListPublisher:
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, event):
+        self.published.append(event)
+
+
+@pytest.mark.asyncio
+async def test_service_batches_events_and_skips_duplicates():
+    events = [EventFactory.telemetry_event(node_id="!test") for _ in range(5)]
+    event_store = InMemoryEventStore()
+    state_store = InMemoryStateStore()
+    publisher = ListPublisher()
+    service = MeshEventService(
+        source=ListSource(events + events[:2]),
+        store=event_store,
+        publisher=publisher,
+        state_projection=StateProjection(state_store),
+        batch_size=3,
+    )
+    await service.run()
+    assert publisher.published == events
+    state = await state_store.get_node("!test")
+    assert state.event_count == 5
+    assert service._processed_count == 5
+    assert service._duplicate_count == 2
+
+
+@pytest.mark.asyncio
+async def test_service_drops_only_the_event_that_fails_to_serialize():
+    good = [EventFactory.telemetry_event(node_id=f"!n{i}") for i in range(4)]
+    bad = EventFactory.mesh_event(node_id="!bad", payload={"big": 2 ** 70})
+    events = good[:2] + [bad] + good[2:]
+    store = SqliteEventStore(in_memory=True)
+    publisher = ListPublisher()
+    service = MeshEventService(
+        source=ListSource(events),
+        store=store,
+        publisher=publisher,
+        retry_delay=0,
+        batch_size=8,
+    )
+    await service.run()
+    assert publisher.published == good
+    assert [e.node_id async for e in store.replay()] == [
+        e.node_id for e in good
+    ]
+    assert service._processed_count == 4
+    assert service._error_count == 1
+    assert service._duplicate_count == 0
+    await store.close()
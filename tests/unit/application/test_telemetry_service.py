@@ -1,86 +1,70 @@
 import pytest
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from meshcore.adapters.storage.sqlite import SqliteEventQuery
 from meshcore.application.telemetry_service import TelemetryQueryService, DataPoint
 from tests.fixtures.factories import EventFactory
 
 
-def test_telemetry_query_service_initialization(mock_event_store):
-    service = TelemetryQueryService(mock_event_store)
-    assert service.event_store == mock_event_store
-
-
-def test_get_time_series_returns_data_points(mock_event_store):
-    telemetry_events = [
-        EventFactory.telemetry_received(
-            node_id="!test",
-            battery_level=85,
-            timestamp=datetime.now() - timedelta(hours=2)
-        ),
-        EventFactory.telemetry_received(
-            node_id="!test",
-            battery_level=80,
-            timestamp=datetime.now() - timedelta(hours=1)
-        )
+@pytest.fixture
+async def sqlite_telemetry(event_store):
+    """A TelemetryQueryService over a real SQLite store, holding three
+    readings from !test plus one outside the default 24-hour window"""
+    now = datetime.now(timezone.utc)
+    readings = [
+        (timedelta(days=2), 10, 3.0),
+        (timedelta(hours=3), 80, 4.0),
+        (timedelta(hours=2), 90, None),
+        (timedelta(hours=1), 85, 4.2),
     ]
-    mock_event_store.get_telemetry_series.return_value = telemetry_events
-    service = TelemetryQueryService(mock_event_store)
-    results = service.get_time_series("!test", "battery_level", hours=24)
-    assert len(results) == 2
-    assert results[0].value == 85
-    assert results[1].value == 80
-
+    for age, battery, voltage in readings:
+        await event_store.append(EventFactory.telemetry_event(
+            node_id="!test", battery_level=battery, voltage=voltage,
+            channel_utilization=None, timestamp=now - age
+        ))
+    await event_store.append(EventFactory.telemetry_event(node_id="!other"))
+    return TelemetryQueryService(SqliteEventQuery(event_store))
 
-def test_get_time_series_filters_none_values(mock_event_store):
-    telemetry_events = [
-        EventFactory.telemetry_received(node_id="!test", voltage=4.2),
-        EventFactory.telemetry_received(node_id="!test", voltage=None)
-    ]
-    mock_event_store.get_telemetry_series.return_value = telemetry_events
-    service = TelemetryQueryService(mock_event_store)
-    results = service.get_time_series("!test", "voltage", hours=24)
-    assert len(results) == 1
-    assert results[0].value == 4.2
 
+@pytest.mark.asyncio
+async def test_sqlite_get_time_series_oldest_first(sqlite_telemetry):
+    points = await sqlite_telemetry.get_time_series("!test", "battery_level")
+    assert [p.value for p in points] == [80, 90, 85]
+    assert all(isinstance(p, DataPoint) for p in points)
+    assert points[0].timestamp < points[-1].timestamp
+    # Readings without the metric are skipped, not returned as None
+    voltage = await sqlite_telemetry.get_time_series("!test", "voltage")
+    assert [p.value for p in voltage] == [4.0, 4.2]
+    week = await sqlite_telemetry.get_battery_history(
+        "!test", since=datetime.now(timezone.utc) - timedelta(days=7)
+    )
+    assert [p.value for p in week] == [10, 80, 90, 85]
 
-def test_get_statistics_calculates_correctly(mock_event_store):
-    telemetry_events = [
-        EventFactory.telemetry_received(node_id="!test", battery_level=80),
-        EventFactory.telemetry_received(node_id="!test", battery_level=85),
-        EventFactory.telemetry_received(node_id="!test", battery_level=90)
-    ]
-    mock_event_store.get_telemetry_series.return_value = telemetry_events
-    service = TelemetryQueryService(mock_event_store)
-    stats = service.get_statistics("!test", "battery_level", hours=24)
-    assert stats.min == 80
-    assert stats.max == 90
-    assert stats.avg == 85.0
-    assert stats.count == 3
 
+@pytest.mark.asyncio
+async def test_sqlite_get_statistics(sqlite_telemetry):
+    stats = await sqlite_telemetry.get_statistics("!test", "battery_level")
+    assert stats.min_value == 80
+    assert stats.max_value == 90
+    assert stats.avg_value == 85.0
+    assert stats.current_value == 85
+    assert stats.data_points == 3
 
-def test_get_statistics_returns_none_for_no_data(mock_event_store):
-    mock_event_store.get_telemetry_series.return_value = []
-    service = TelemetryQueryService(mock_event_store)
-    stats = service.get_statistics("!test", "battery_level", hours=24)
-    assert stats.min is None
-    assert stats.max is None
-    assert stats.avg is None
-    assert stats.count == 0
 
+@pytest.mark.asyncio
+async def test_sqlite_get_statistics_without_data(sqlite_telemetry):
+    stats = await sqlite_telemetry.get_statistics("!test", "temperature")
+    assert stats.min_value is None
+    assert stats.max_value is None
+    assert stats.avg_value is None
+    assert stats.current_value is None
+    assert stats.data_points == 0
 
-def test_get_all_metrics_returns_available_metrics(mock_event_store):
-    telemetry_events = [
-        EventFactory.telemetry_received(
-            node_id="!test",
-            battery_level=85,
-            voltage=4.2,
-            temperature=25.5
-        )
-    ]
-    mock_event_store.get_telemetry_series.return_value = telemetry_events
-    service = TelemetryQueryService(mock_event_store)
-    metrics = service.get_all_metrics("!test", hours=24)
-    assert "battery_level" in metrics
-    assert "voltage" in metrics
-    assert "temperature" in metrics
-    assert len(metrics["battery_level"]) == 1
 
+@pytest.mark.asyncio
+async def test_sqlite_get_all_metrics(sqlite_telemetry):
+    metrics = await sqlite_telemetry.get_all_metrics("!test")
+    assert {key: [p.value for p in points] for key, points in metrics.items()} == {
+        "battery_level": [80, 90, 85],
+        "voltage": [4.0, 4.2],
+    }
+    assert await sqlite_telemetry.get_all_metrics("!missing") == {}
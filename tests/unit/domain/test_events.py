@@ -1,30 +1,34 @@
+import copy
+import json
+import os
+import pickle
+import orjson
 import pytest
-from datetime import datetime
-from meshcore.domain.models import MeshEvent, EventId, NodeId
+from pydantic import ValidationError
+from meshcore.domain.models import MeshEvent, _ID_POOL_SIZE, _new_event_uuid
+from uuid import UUID
 
 
-def test_mesh_event_creation():
+def test_mesh_event_creation(sample_timestamp):
     event = MeshEvent(
-        event_id=EventId(),
-        node_id=NodeId(value="!test1234"),
+        node_id="!test1234",
         event_type="telemetry",
-        timestamp=datetime.now(),
-        ingested_at=datetime.now(),
+        timestamp=sample_timestamp,
+        ingested_at=sample_timestamp,
         payload={"battery_level": 85},
         provenance={"source": "test"}
     )
-    assert event.node_id.value == "!test1234"
+    assert event.node_id == "!test1234"
     assert event.event_type == "telemetry"
     assert event.payload["battery_level"] == 85
 
 
-def test_mesh_event_serialization():
+def test_mesh_event_serialization(sample_timestamp):
     event = MeshEvent(
-        event_id=EventId(),
-        node_id=NodeId(value="!test"),
+        node_id="!test",
         event_type="text",
-        timestamp=datetime.now(),
-        ingested_at=datetime.now(),
+        timestamp=sample_timestamp,
+        ingested_at=sample_timestamp,
         payload={"text": "Hello"},
         provenance={}
     )
@@ -50,14 +54,103 @@ def test_position_event(mesh_event_position):
     assert mesh_event_position.payload["longitude"] == -122.4194
 
 
-def test_event_id_uniqueness():
-    id1 = EventId()
-    id2 = EventId()
-    assert id1.value != id2.value
+def test_event_id_uniqueness(mesh_event_telemetry, mesh_event_message):
+    assert isinstance(mesh_event_telemetry.event_id, UUID)
+    assert mesh_event_telemetry.event_id != mesh_event_message.event_id
 
 
-def test_node_id_equality():
-    id1 = NodeId(value="!test")
-    id2 = NodeId(value="!test")
-    assert id1.value == id2.value
+def test_event_ids_stay_unique_across_pool_refills():
+    ids = {_new_event_uuid() for _ in range(3 * _ID_POOL_SIZE // 16 + 5)}
+    assert len(ids) == 3 * _ID_POOL_SIZE // 16 + 5
+    assert {event_id.version for event_id in ids} == {4}
 
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+# The child only writes to a pipe and exits, so store threads are harmless
+@pytest.mark.filterwarnings("ignore:This process .* fork:DeprecationWarning")
+def test_forked_child_does_not_replay_parent_event_ids():
+    _new_event_uuid()  # make sure the parent has a buffered pool
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.write(write_fd, _new_event_uuid().bytes)
+        os._exit(0)
+    os.close(write_fd)
+    child_id = UUID(bytes=os.read(read_fd, 16))
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    assert child_id != _new_event_uuid()
+
+
+def test_node_id_is_interned(mesh_event_telemetry, mesh_event_message):
+    node_id = "".join(["!abcd", "1234"])
+    rebuilt = MeshEvent(**{**mesh_event_message.model_dump(), "node_id": node_id})
+    assert rebuilt.node_id is mesh_event_telemetry.node_id
+
+
+
+def test_event_json_bytes_is_cached(mesh_event_message):
+    first = mesh_event_message.json_bytes()
+    assert json.loads(first) == json.loads(mesh_event_message.model_dump_json())
+    assert mesh_event_message.json_bytes() is first
+
+
+def test_event_json_bytes_matches_model_dump(mesh_event_telemetry):
+    expected = orjson.dumps(mesh_event_telemetry.model_dump())
+    assert mesh_event_telemetry.json_bytes() == expected
+    assert mesh_event_telemetry.payload_bytes() == orjson.dumps(
+        mesh_event_telemetry.payload
+    )
+
+
+def test_event_is_frozen(mesh_event_message):
+    with pytest.raises(ValidationError):
+        mesh_event_message.payload = {"text": "changed"}
+
+
+def test_event_payload_and_provenance_are_read_only(sample_timestamp):
+    event = MeshEvent(
+        node_id="!test1234",
+        event_type="position",
+        timestamp=sample_timestamp,
+        ingested_at=sample_timestamp,
+        payload={"latitude": 1.0, "extra": {"hdop": 2}},
+        provenance={"source": "test"},
+    )
+    cached = event.json_bytes()
+    with pytest.raises(TypeError):
+        event.payload["latitude"] = 2.0
+    with pytest.raises(TypeError):
+        event.payload["extra"]["hdop"] = 3
+    with pytest.raises(TypeError):
+        event.provenance.update(source="other")
+    with pytest.raises(TypeError):
+        del event.payload["latitude"]
+    assert event.json_bytes() == cached == orjson.dumps(event.model_dump())
+
+
+def test_event_round_trips_through_pickle_and_deepcopy(mesh_event_message):
+    for copied in (
+        pickle.loads(pickle.dumps(mesh_event_message)),
+        copy.deepcopy(mesh_event_message),
+        mesh_event_message.model_copy(deep=True),
+    ):
+        assert copied == mesh_event_message
+        with pytest.raises(TypeError):
+            copied.payload["text"] = "changed"
+
+
+def test_event_copy_with_update_reserializes(mesh_event_message):
+    original = mesh_event_message.json_bytes()
+    mesh_event_message.event_id_str()
+    changed = mesh_event_message.model_copy(update={
+        "node_id": "!other",
+        "payload": {"text": "changed"},
+    })
+    assert orjson.loads(changed.json_bytes())["payload"] == {"text": "changed"}
+    assert changed.json_bytes() == orjson.dumps(changed.model_dump())
+    assert changed.payload_bytes() == b'{"text":"changed"}'
+    assert mesh_event_message.json_bytes() == original
+    # model_copy doesn't validate updates, so the override freezes them
+    with pytest.raises(TypeError):
+        changed.payload["text"] = "again"
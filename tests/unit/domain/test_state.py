@@ -1,18 +1,17 @@
 import pytest
-from datetime import datetime, timedelta
-from meshcore.domain.models import NodeState, NodeId
+from meshcore.domain.models import NodeState
 
 
 def test_node_state_creation(sample_node_state):
-    assert sample_node_state.node_id.value == "!abcd1234"
+    assert sample_node_state.node_id == "!abcd1234"
     assert sample_node_state.event_count == 1
 
 
-def test_node_state_optional_fields():
+def test_node_state_optional_fields(sample_timestamp):
     state = NodeState(
-        node_id=NodeId(value="!test"),
-        first_seen=datetime.now(),
-        last_seen=datetime.now(),
+        node_id="!test",
+        first_seen=sample_timestamp,
+        last_seen=sample_timestamp,
         event_count=0
     )
     assert state.last_telemetry is None
@@ -20,11 +19,11 @@ def test_node_state_optional_fields():
     assert state.last_text is None
 
 
-def test_node_state_with_telemetry():
+def test_node_state_with_telemetry(sample_timestamp):
     state = NodeState(
-        node_id=NodeId(value="!test"),
-        first_seen=datetime.now(),
-        last_seen=datetime.now(),
+        node_id="!test",
+        first_seen=sample_timestamp,
+        last_seen=sample_timestamp,
         event_count=1,
         last_telemetry={
             "battery_level": 85,
@@ -35,11 +34,11 @@ def test_node_state_with_telemetry():
     assert state.last_telemetry["voltage"] == 4.2
 
 
-def test_node_state_with_position():
+def test_node_state_with_position(sample_timestamp):
     state = NodeState(
-        node_id=NodeId(value="!test"),
-        first_seen=datetime.now(),
-        last_seen=datetime.now(),
+        node_id="!test",
+        first_seen=sample_timestamp,
+        last_seen=sample_timestamp,
         event_count=1,
         last_position={
             "latitude": 37.7749,
@@ -51,11 +50,11 @@ def test_node_state_with_position():
     assert state.last_position["longitude"] == -122.4194
 
 
-def test_node_state_with_text():
+def test_node_state_with_text(sample_timestamp):
     state = NodeState(
-        node_id=NodeId(value="!test"),
-        first_seen=datetime.now(),
-        last_seen=datetime.now(),
+        node_id="!test",
+        first_seen=sample_timestamp,
+        last_seen=sample_timestamp,
         event_count=1,
         last_text="Hello World"
     )
@@ -64,7 +63,7 @@ def test_node_state_with_text():
 
 def test_node_state_serialization(sample_node_state):
     data = sample_node_state.model_dump()
-    assert data["node_id"]["value"] == "!abcd1234"
-    reconstructed = NodeState(**data)
-    assert reconstructed.node_id.value == sample_node_state.node_id.value
+    assert data["node_id"] == "!abcd1234"
+    reconstructed = NodeState.model_validate(data)
+    assert reconstructed.node_id == sample_node_state.node_id
 
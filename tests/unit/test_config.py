@@ -0,0 +1,24 @@
+from dataclasses import fields
+from meshcore.config import MeshCoreConfig, _ENV_SCHEMA
+
+
+def test_from_env_keeps_dataclass_defaults(monkeypatch):
+    for var, _ in _ENV_SCHEMA.values():
+        monkeypatch.delenv(var, raising=False)
+    assert MeshCoreConfig.from_env() == MeshCoreConfig()
+
+
+def test_from_env_parses_set_variables(monkeypatch):
+    monkeypatch.setenv("MESHCORE_MQTT_PORT", "8883")
+    monkeypatch.setenv("MESHCORE_MQTT_ENABLED", "no")
+    monkeypatch.setenv("MESHCORE_MOCK_INTERVAL", "0.25")
+    monkeypatch.setenv("MESHCORE_MESHTASTIC_DEVICE", "/dev/ttyUSB0")
+    config = MeshCoreConfig.from_env()
+    assert config.mqtt_port == 8883
+    assert config.mqtt_enabled is False
+    assert config.mock_interval == 0.25
+    assert config.meshtastic_device == "/dev/ttyUSB0"
+
+
+def test_env_schema_covers_every_field():
+    assert set(_ENV_SCHEMA) == {field.name for field in fields(MeshCoreConfig)}